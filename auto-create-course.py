@@ -4,15 +4,2515 @@
 Creates complete courses with one command!
 """
 
+import argparse
+import ctypes
+import ctypes.util
+import errno
+import fcntl
+import gzip
+import hashlib
+import io
 import os
 import sys
 import json
+import math
+import cProfile
+import pstats
 import re
+import resource
+import select
 import shutil
+import struct
+import subprocess
+import threading
+import time
+import tomllib
+from datetime import datetime, timezone
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from contextlib import ExitStack, contextmanager, nullcontext
 from pathlib import Path
 
+try:
+    import pdfplumber
+except ImportError:
+    pdfplumber = None
+
+try:
+    from PyPDF2 import PdfReader, PdfWriter
+except ImportError:
+    PdfReader = PdfWriter = None
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+EXTRACTED_SUFFIX = "_extracted.txt"
+
+# Bump when extract_pdf_text changes output so cached text is not reused
+EXTRACTOR_VERSION = "1"
+CACHE_DIR = Path(".course-cache")
+EXTRACTION_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Bump when a generate_* template changes so every output is rebuilt once
+GENERATOR_VERSION = "8"
+
+# First line of every page the generator writes; pages without it were made by hand and are never overwritten
+GENERATED_PAGE_MARKER = "// Generated by auto-create-course.py - edits are overwritten by the next build"
+
+
+def extracted_text_path(pdf_path):
+    """Return the *_extracted.txt file that sits next to a PDF"""
+    pdf_path = Path(pdf_path)
+    return pdf_path.with_name(pdf_path.stem + EXTRACTED_SUFFIX)
+
+
+def extract_pdf_text(pdf_path):
+    """Extract the text of a PDF with pdfplumber, falling back to PyPDF2"""
+    if pdfplumber is None and PdfReader is None:
+        raise RuntimeError("pdfplumber or PyPDF2 is required (see pyproject.toml)")
+    
+    if pdfplumber is not None:
+        try:
+            with pdfplumber.open(pdf_path) as pdf:
+                return '\n'.join(page.extract_text() or '' for page in pdf.pages)
+        except Exception:
+            if PdfReader is None:
+                raise
+    
+    reader = PdfReader(str(pdf_path))
+    return '\n'.join(page.extract_text() or '' for page in reader.pages)
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """Hash a file's contents without reading it into memory at once"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def io_counters(thread=True):
+    """Bytes passed to read()/write() calls so far by this thread (or process), zeros without /proc"""
+    try:
+        with open("/proc/thread-self/io" if thread else "/proc/self/io", 'rb') as f:
+            fields = dict(line.split(b':', 1) for line in f.read().splitlines() if b':' in line)
+    except OSError:
+        return 0, 0
+    return int(fields[b"rchar"]), int(fields[b"wchar"])
+
+
+def peak_rss(who=resource.RUSAGE_SELF):
+    """Peak resident set size in bytes (of this process, or of its largest finished child)"""
+    maxrss = resource.getrusage(who).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def usage_start(thread=True):
+    """Counters for usage_since(): per thread for build tasks, per process in pool workers"""
+    read, written = io_counters(thread)
+    return time.perf_counter(), time.thread_time() if thread else time.process_time(), read, written, thread
+
+
+def usage_since(start):
+    """Wall time, CPU time, bytes read/written and peak RSS since usage_start()"""
+    wall, cpu, read, written, thread = start
+    now_read, now_written = io_counters(thread)
+    return {
+        "seconds": time.perf_counter() - wall,
+        "cpu": (time.thread_time() if thread else time.process_time()) - cpu,
+        "read_bytes": now_read - read,
+        "written_bytes": now_written - written,
+        "peak_rss": peak_rss(),
+    }
+
+
+def is_curated_page(path):
+    """Whether path exists without GENERATED_PAGE_MARKER, i.e. is a hand-made page"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.readline().rstrip('\n') != GENERATED_PAGE_MARKER
+    except FileNotFoundError:
+        return False
+
+
+def write_if_changed(path, data):
+    """Write bytes to path unless it already holds exactly them; returns True if written"""
+    path = Path(path)
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+    return True
+
+
+MP3_BITRATES = {  # kbps by (MPEG-1?, layer), indexed by the header's bitrate index
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+MP3_SCANNER_VERSION = "2"
+MP3_READ_BYTES = 256 * 1024
+SEEK_TABLE_MAX_ENTRIES = 256
+SEEK_INTERVAL_MIN = 5  # seconds
+PREFETCH_MANIFEST_VERSION = 1
+PREFETCH_MAX_BYTES = 512 * 1024  # warmed per chapter; players lower it on slow or Save-Data connections
+
+
+def mp3_frame_header(data, pos):
+    """Decode the MPEG audio frame header at pos: (length, samples, sample_rate, bitrate) or None"""
+    if pos + 4 > len(data) or data[pos] != 0xFF or data[pos + 1] & 0xE0 != 0xE0:
+        return None
+    version = (data[pos + 1] >> 3) & 3
+    layer = 4 - ((data[pos + 1] >> 1) & 3)
+    bitrate_index = data[pos + 2] >> 4
+    rate_index = (data[pos + 2] >> 2) & 3
+    if version == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+        return None  # reserved values, or free-format bitrate
+    mpeg1 = version == 3
+    bitrate = MP3_BITRATES[(mpeg1, layer)][bitrate_index] * 1000
+    sample_rate = MP3_SAMPLE_RATES[version][rate_index]
+    padding = (data[pos + 2] >> 1) & 1
+    if layer == 1:
+        return (12 * bitrate // sample_rate + padding) * 4, 384, sample_rate, bitrate
+    samples = 1152 if layer == 2 or mpeg1 else 576
+    return samples // 8 * bitrate // sample_rate + padding, samples, sample_rate, bitrate
+
+
+def id3v2_size(data):
+    """Bytes taken by a leading ID3v2 tag (0 when there is none)"""
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def info_tag_offset(data, pos):
+    """Where a Xing/Info tag would start in the frame at pos (after its side information)"""
+    mpeg1 = (data[pos + 1] >> 3) & 3 == 3
+    mono = data[pos + 3] >> 6 == 3
+    return pos + 4 + ((17 if mono else 32) if mpeg1 else (9 if mono else 17))
+
+
+def is_info_frame(data, pos):
+    """Whether the frame at pos is a Xing/Info or VBRI header rather than audio"""
+    tag = info_tag_offset(data, pos)
+    return data[tag:tag + 4] in (b"Xing", b"Info") or data[pos + 36:pos + 40] == b"VBRI"
+
+
+def xing_header(data, pos):
+    """Frame count, stream bytes and 100-entry TOC of the Xing/Info frame at pos, or None
+
+    Each field is None when the encoder left it out. TOC entry i is the byte
+    position (in 256ths of the stream, counted from this frame) at i% of
+    the duration.
+    """
+    tag = info_tag_offset(data, pos)
+    if data[tag:tag + 4] not in (b"Xing", b"Info"):
+        return None
+    flags = int.from_bytes(data[tag + 4:tag + 8], 'big')
+    header = {"frames": None, "bytes": None, "toc": None}
+    field = tag + 8
+    for name, flag, size in (("frames", 1, 4), ("bytes", 2, 4), ("toc", 4, 100)):
+        if flags & flag:
+            value = data[field:field + size]
+            if len(value) == size:
+                header[name] = list(value) if name == "toc" else int.from_bytes(value, 'big')
+            field += size
+    return header
+
+
+class Mp3Reader:
+    """Forward reads over an open MP3 in MP3_READ_BYTES chunks, addressed by file offset"""
+    
+    def __init__(self, f, end):
+        self.f = f
+        self.end = end  # where the audio stops (before an ID3v1 tag)
+        self.base = 0  # file offset of buf[0]
+        self.buf = b""
+        f.seek(0)
+    
+    def view(self, pos, n):
+        """(buf, index) with buf[index:index + n] holding the file's bytes at pos (fewer near end)"""
+        if self.base <= pos and pos + n <= self.base + len(self.buf):
+            return self.buf, pos - self.base
+        if self.base <= pos <= self.base + len(self.buf):
+            self.buf = self.buf[pos - self.base:]
+        else:
+            self.f.seek(pos)
+            self.buf = b""
+        self.base = pos
+        wanted = min(max(n, MP3_READ_BYTES), self.end - pos) - len(self.buf)
+        if wanted > 0:
+            self.buf += self.f.read(wanted)
+        return self.buf, 0
+    
+    def header(self, pos):
+        return mp3_frame_header(*self.view(pos, 4))
+    
+    def find_sync(self, pos):
+        """Offset of the next 0xFF byte at or after pos, or -1"""
+        while pos < self.end:
+            buf, index = self.view(pos, MP3_READ_BYTES)
+            found = buf.find(b"\xff", index)
+            if found >= 0:
+                return self.base + found
+            pos = self.base + len(buf)
+        return -1
+    
+    def sync(self, pos):
+        """The first frame at or after pos followed by another valid frame (or the end): (pos, header)"""
+        pos = self.find_sync(pos)
+        while pos >= 0:
+            header = self.header(pos)
+            if header and (pos + header[0] == self.end or self.header(pos + header[0])):
+                return pos, header
+            pos = self.find_sync(pos + 1)
+        return -1, None
+
+
+def scan_mp3(path):
+    """Summarize an MP3's MPEG audio frames for the players, reading it in chunks
+
+    Returns duration (s), average bitrate (bit/s), the byte offset where the
+    audio ends and a seek table: the byte offset of a frame at (or just
+    before) each multiple of seekInterval seconds, with seekTimes giving
+    when each of those frames starts. A leading Xing/Info header with a
+    frame count and TOC is used as is; otherwise every frame is walked,
+    which handles CBR and VBR files alike. Pure Python; skips ID3v2/ID3v1
+    tags and VBRI header frames. Returns None when no MPEG audio stream is
+    found.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        f.seek(max(0, size - 128))
+        end = size - 128 if size >= 128 and f.read(3) == b"TAG" else size
+        reader = Mp3Reader(f, end)
+        pos, header = reader.sync(id3v2_size(reader.view(0, 10)[0]))
+        if header is None:
+            return None
+        buf, index = reader.view(pos, header[0])
+        if is_info_frame(buf, index):
+            xing = xing_header(buf, index)
+            if xing and xing["frames"] and xing["toc"]:
+                return scan_xing_toc(reader, pos, header, xing)
+            pos += header[0]
+        return scan_mp3_frames(reader, pos)
+
+
+def seek_interval(duration):
+    return max(SEEK_INTERVAL_MIN, math.ceil(duration / SEEK_TABLE_MAX_ENTRIES))
+
+
+def mp3_summary(audio_start, audio_end, duration, interval, seek_table, seek_times):
+    return {
+        "duration": round(duration, 3),
+        "bitrate": round((audio_end - audio_start) * 8 / duration) if duration else 0,
+        "bytes": audio_end,
+        "seekInterval": interval,
+        "seekTable": seek_table,
+        "seekTimes": [round(time, 4) for time in seek_times],
+    }
+
+
+def scan_xing_toc(reader, pos, header, xing):
+    """scan_mp3 from a Xing/Info header: duration from its frame count, seek offsets from its TOC
+
+    TOC positions are snapped forward to the next frame; their times are
+    the TOC's, so they are as exact as the encoder made them.
+    """
+    length, frame_samples, sample_rate, _ = header
+    duration = xing["frames"] * frame_samples / sample_rate
+    stream_bytes = xing["bytes"] or reader.end - pos
+    audio_start = pos + length
+    audio_end = min(reader.end, pos + stream_bytes)
+    interval = seek_interval(duration)
+    seek_table = []
+    seek_times = []
+    toc = xing["toc"] + [256]
+    for k in range(int(duration // interval) + 1):
+        time = k * interval
+        percent = min(time / duration * 100, 100) if duration else 0
+        i = min(int(percent), 99)
+        position = toc[i] + (toc[i + 1] - toc[i]) * (percent - i)
+        offset = max(audio_start, pos + int(position / 256 * stream_bytes))
+        offset = audio_start if k == 0 else reader.sync(offset)[0]
+        if offset < 0 or offset >= audio_end:
+            break
+        if seek_table and offset <= seek_table[-1]:
+            continue  # the TOC is coarser than the seek interval here
+        seek_table.append(offset)
+        seek_times.append(time)
+    return mp3_summary(audio_start, audio_end, duration, interval, seek_table, seek_times)
+
+
+def scan_mp3_frames(reader, pos):
+    """scan_mp3 by walking every frame from pos, resyncing after junk"""
+    offsets = []
+    starts = []
+    samples = 0
+    sample_rate = None
+    audio_start = pos
+    while pos < reader.end:
+        header = reader.header(pos)
+        if header is None or pos + header[0] > reader.end:
+            # Lost sync (junk or a trailing tag): resume at the next valid frame pair
+            pos, header = reader.sync(pos + 1)
+            if header is None or pos + header[0] > reader.end:
+                break
+        length, frame_samples, sample_rate, _ = header
+        offsets.append(pos)
+        starts.append(samples / sample_rate)
+        samples += frame_samples
+        pos += length
+    if not offsets:
+        return None
+    
+    duration = samples / sample_rate
+    interval = seek_interval(duration)
+    frames = []
+    frame = 0
+    for k in range(int(duration // interval) + 1):
+        while frame + 1 < len(starts) and starts[frame + 1] <= k * interval:
+            frame += 1
+        frames.append(frame)
+    return mp3_summary(audio_start, pos, duration, interval, [offsets[frame] for frame in frames],
+                       [starts[frame] for frame in frames])
+
+
+def cached_scan_mp3(path, digest, root=CACHE_DIR / "audio"):
+    """scan_mp3 memoized by the file's content hash under .course-cache/audio/"""
+    entry = Path(root) / f"{digest}-v{MP3_SCANNER_VERSION}.json"
+    try:
+        with open(entry, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        pass
+    meta = scan_mp3(path)
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    write_if_changed(entry, json.dumps(meta, separators=(',', ':')).encode('utf-8'))
+    return meta
+
+
+FICLONE = 0x40049409  # Linux ioctl: share the source file's extents (reflink)
+ASSET_HASH_LENGTH = 12
+
+
+def link_or_copy(src, dest):
+    """Publish src at dest without copying bytes when the filesystem allows it
+
+    Tries a reflink (copy-on-write clone, so later edits to the source can't
+    leak into the published file), then a hardlink, then a plain copy.
+    Returns the method used.
+    """
+    dest = Path(dest)
+    tmp_path = dest.with_name(dest.name + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+    try:
+        with open(src, 'rb') as source, open(tmp_path, 'wb') as target:
+            fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+        method = "reflink"
+    except OSError as e:
+        if e.errno not in (errno.EOPNOTSUPP, errno.EXDEV, errno.EINVAL, errno.ENOTTY, errno.EPERM):
+            raise
+        tmp_path.unlink(missing_ok=True)
+        try:
+            os.link(src, tmp_path)
+            method = "hardlink"
+        except OSError:
+            shutil.copyfile(src, tmp_path)
+            method = "copy"
+    os.replace(tmp_path, dest)
+    return method
+
+
+def publish_asset(src, digest, dest_dir, stem):
+    """Publish src as <dest_dir>/<stem>.<hash><suffix>, dropping older versions of it
+
+    Returns (path, method) where method is None when that version was already published.
+    """
+    src = Path(src)
+    dest_dir = Path(dest_dir)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    dest = dest_dir / f"{stem}.{digest[:ASSET_HASH_LENGTH]}{src.suffix}"
+    method = None
+    if not (dest.exists() and dest.stat().st_size == src.stat().st_size):
+        method = link_or_copy(src, dest)
+    for stale in dest_dir.glob(f"{stem}.*{src.suffix}"):
+        if stale != dest and re.fullmatch(rf'{re.escape(stem)}\.[0-9a-f]{{{ASSET_HASH_LENGTH}}}', stale.stem):
+            stale.unlink()
+    return dest, method
+
+
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".webp"}
+IMAGE_WIDTHS = (160, 320, 640, 1280)
+IMAGE_PIPELINE_VERSION = "1"
+WEBP_QUALITY = 80
+IMAGE_VARIANTS_PATH = Path("client/src/image-variants.json")
+
+
+def image_stem(path):
+    """URL-safe stem for an image's variants, from its whole file name ("IMG 3701 (1).jpeg" -> "img-3701-1-jpeg")"""
+    return re.sub(r'[^a-z0-9]+', '-', Path(path).name.lower()).strip('-') or "image"
+
+
+def image_variant_widths(width, widths=IMAGE_WIDTHS):
+    """Target widths for an image: each preset below its own width, plus its own width capped at the largest"""
+    return sorted({w for w in widths if w < width} | {min(width, max(widths))})
+
+
+def image_variant_path(dest_dir, stem, digest, width):
+    return Path(dest_dir) / f"{stem}-{width}w.{digest[:ASSET_HASH_LENGTH]}.webp"
+
+
+def variant_stem(path):
+    """The image stem of a published WebP variant ("cover-320w.<hash>.webp" -> "cover"), else None"""
+    match = re.fullmatch(rf'(.+)-\d+w\.[0-9a-f]{{{ASSET_HASH_LENGTH}}}', Path(path).stem)
+    return match.group(1) if match else None
+
+
+def referenced_variants(images):
+    """File names of the WebP variants a {key: responsive image} mapping refers to"""
+    names = set()
+    for image in images.values():
+        names.add(Path(image["src"]).name)
+        names.update(Path(part.split()[0]).name for part in image.get("srcSet", "").split(",") if part.strip())
+    return names
+
+
+def prune_image_variants(dest_dir, images, stems=None):
+    """Delete WebP variants in dest_dir that images doesn't refer to (only those of stems, if given)"""
+    keep = referenced_variants(images)
+    removed = 0
+    for variant in Path(dest_dir).glob("*.webp"):
+        stem = variant_stem(variant)
+        if stem is not None and (stems is None or stem in stems) and variant.name not in keep:
+            variant.unlink()
+            removed += 1
+    return removed
+
+
+def image_variant_job(src, digest, dest_dir, stem):
+    """Write the WebP variants of one image (runs in a worker process)"""
+    usage = usage_start(thread=False)
+    started = time.perf_counter()
+    try:
+        with Image.open(src) as opened:
+            image = ImageOps.exif_transpose(opened)
+            image = image.convert("RGBA" if "A" in image.getbands() or "transparency" in image.info else "RGB")
+        widths = image_variant_widths(image.width)
+        for width in widths:
+            height = max(1, round(image.height * width / image.width))
+            resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+            data = io.BytesIO()
+            resized.save(data, "WEBP", quality=WEBP_QUALITY)
+            write_if_changed(image_variant_path(dest_dir, stem, digest, width), data.getvalue())
+        return {"src": str(src), "ok": True, "width": image.width, "height": image.height,
+                "widths": widths, "seconds": time.perf_counter() - started, "usage": usage_since(usage)}
+    except Exception as e:
+        return {"src": str(src), "ok": False, "error": f"{type(e).__name__}: {e}"}
+
+
+def responsive_image(dest_dir, stem, digest, scan):
+    """<img> data for an image's variants: largest WebP as src plus a srcset of all of them"""
+    urls = {w: "/" + image_variant_path(dest_dir, stem, digest, w).relative_to("public").as_posix()
+            for w in scan["widths"]}
+    return {
+        "src": urls[max(urls)],
+        "srcSet": ", ".join(f"{url} {w}w" for w, url in urls.items()),
+        "width": scan["width"],
+        "height": scan["height"],
+    }
+
+
+def optimize_images(sources, dest_dir, pool=None, max_workers=None, cache_root=CACHE_DIR / "images",
+                    usage=None):
+    """Publish WebP variants of images in dest_dir (under public/), skipping unchanged ones
+
+    Sizes are cached by content hash in .course-cache/images/, so an image whose
+    variants already exist is not even decoded. Byte-identical images share
+    one set of variants; an image whose stem another one already took is
+    skipped with a warning. Returns {source path: responsive image data} for
+    the images that could be processed; when a usage list is given, a
+    {"path", **usage} record is appended to it per converted image.
+    """
+    if Image is None:
+        print("  ⚠️ Pillow is not installed; images are shipped as-is (pip install Pillow)")
+        return {}
+    dest_dir = Path(dest_dir)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    cache_root = Path(cache_root)
+    results = {}
+    pending = []
+    jobs = {}  # source -> (stem, digest) of the variants it is published as
+    owners = {}  # stem -> the source publishing under it
+    originals = {}  # digest -> the first source with that content
+    for src in sources:
+        src = Path(src)
+        stem = image_stem(src)
+        digest = file_sha256(src)
+        if digest in originals:
+            jobs[str(src)] = jobs[originals[digest]]
+            continue
+        if stem in owners:
+            print(f"  ⚠️ {src.name}: its variants would replace those of {Path(owners[stem]).name} ({stem}), skipped")
+            continue
+        owners[stem] = originals[digest] = str(src)
+        jobs[str(src)] = (stem, digest)
+        entry = cache_root / f"{digest}-v{IMAGE_PIPELINE_VERSION}.json"
+        try:
+            with open(entry, 'r', encoding='utf-8') as f:
+                scan = json.load(f)
+        except FileNotFoundError:
+            scan = None
+        if scan and all(image_variant_path(dest_dir, stem, digest, w).exists() for w in scan["widths"]):
+            results[str(src)] = scan
+        else:
+            pending.append(src)
+    
+    if pending:
+        workers = max(1, min(len(pending), max_workers or os.cpu_count() or 1))
+        pool_context = nullcontext(pool) if pool else ProcessPoolExecutor(max_workers=workers)
+        with pool_context as executor:
+            futures = []
+            for src in pending:
+                stem, digest = jobs[str(src)]
+                futures.append(executor.submit(image_variant_job, str(src), digest, str(dest_dir), stem))
+            for future in as_completed(futures):
+                result = future.result()
+                name = Path(result["src"]).name
+                if not result["ok"]:
+                    print(f"  ❌ {name}: {result['error']}")
+                    continue
+                print(f"  ✅ {name}: {len(result['widths'])} WebP variants in {result['seconds']:.1f}s")
+                if usage is not None:
+                    usage.append({"path": result["src"], **result["usage"]})
+                scan = {key: result[key] for key in ("width", "height", "widths")}
+                digest = jobs[result["src"]][1]
+                cache_root.mkdir(parents=True, exist_ok=True)
+                write_if_changed(cache_root / f"{digest}-v{IMAGE_PIPELINE_VERSION}.json",
+                                 json.dumps(scan).encode('utf-8'))
+                results[result["src"]] = scan
+    
+    published = {}
+    current = set()
+    for src, (stem, digest) in jobs.items():
+        scan = results.get(originals[digest])
+        if scan is None:
+            continue
+        current.update(image_variant_path(dest_dir, stem, digest, w) for w in scan["widths"])
+        published[src] = responsive_image(dest_dir, stem, digest, scan)
+    stems = {image_stem(src) for src in sources}
+    for stale in dest_dir.glob("*.webp"):
+        if variant_stem(stale) in stems and stale not in current:
+            stale.unlink()
+    skipped = len(owners) - len(pending)
+    if skipped:
+        print(f"  ⏭️ {skipped} image(s) unchanged")
+    return published
+
+
+def find_cover_images(public_dir=Path("public"), prefix=""):
+    """Cover images shipped in public/ (optionally only those starting with prefix)"""
+    return sorted(p for p in Path(public_dir).iterdir()
+                  if p.is_file() and p.suffix.lower() in IMAGE_SUFFIXES
+                  and "cover" in p.stem.lower() and p.name.startswith(prefix))
+
+
+def optimize_cover_images(public_dir=Path("public"), prefix="", pool=None, max_workers=None, usage=None):
+    """Publish WebP variants of cover images to public/img/covers/
+
+    Returns {original URL: responsive image data} for the image registry.
+    """
+    covers = find_cover_images(public_dir, prefix)
+    published = optimize_images(covers, Path(public_dir) / "img" / "covers", pool=pool, max_workers=max_workers,
+                                usage=usage)
+    return {"/" + Path(src).relative_to(public_dir).as_posix(): image for src, image in published.items()}
+
+
+def register_images(images, registry_path=IMAGE_VARIANTS_PATH, public_dir=Path("public")):
+    """Merge {original URL: responsive image} into the image registry read by client/src/image-variants.ts
+
+    Entries whose original image is gone from public_dir are dropped, and the
+    cover variants of the registered and dropped images that the registry no
+    longer refers to are deleted. Variants of other images are left alone, as
+    another course may not have registered its new ones yet.
+    """
+    try:
+        with open(registry_path, 'r', encoding='utf-8') as f:
+            registry = json.load(f)["images"]
+    except FileNotFoundError:
+        registry = {}
+    registry.update(images)
+    dropped = [url for url in registry if not (Path(public_dir) / url.lstrip("/")).exists()]
+    for url in dropped:
+        del registry[url]
+    registry = dict(sorted(registry.items()))
+    stems = {image_stem(url) for url in [*images, *dropped]}
+    removed = prune_image_variants(Path(public_dir) / "img" / "covers", registry, stems)
+    if dropped or removed:
+        print(f"  🧹 Dropped {len(dropped)} missing image(s) from the registry, removed {removed} stale variant(s)")
+    return write_if_changed(registry_path, (json.dumps({"images": registry}, indent=2) + '\n').encode('utf-8'))
+
+
+PRECOMPRESS_SUFFIXES = {".json", ".txt", ".html", ".js", ".css", ".svg", ".xml"}
+# public/ folders nginx.conf serves itself with gzip_static; anything else goes through Node
+GZIP_STATIC_DIRS = {"content", "audio", "img", "prefetch", "search", "quizzes"}
+PRECOMPRESS_MIN_BYTES = 1024  # smaller responses fit in a packet or two either way
+PRECOMPRESS_MAX_RATIO = 0.9  # keep a sibling only when it saves at least 10%
+
+
+def precompress_encodings():
+    """Sibling extensions written by precompress_job ("br" only with the brotli package)"""
+    return ["gz", "br"] if brotli is not None else ["gz"]
+
+
+def precompress_job(path):
+    """Write the .gz/.br siblings of one file that pay off, removing the rest (worker process)"""
+    usage = usage_start(thread=False)
+    data = Path(path).read_bytes()
+    sizes = {}
+    for encoding in precompress_encodings():
+        if encoding == "gz":
+            packed = gzip.compress(data, compresslevel=9, mtime=0)
+        else:
+            packed = brotli.compress(data, quality=11)
+        sibling = Path(f"{path}.{encoding}")
+        if len(packed) <= len(data) * PRECOMPRESS_MAX_RATIO:
+            write_if_changed(sibling, packed)
+            sizes[encoding] = len(packed)
+        else:
+            sibling.unlink(missing_ok=True)
+            sizes[encoding] = None
+    return {"path": str(path), "bytes": len(data), "sizes": sizes, "usage": usage_since(usage)}
+
+
+def precompressible_files(paths):
+    """Files (searched recursively in directories) worth offering precompressed"""
+    files = []
+    for path in paths:
+        path = Path(path)
+        candidates = sorted(path.rglob("*")) if path.is_dir() else [path]
+        for candidate in candidates:
+            if (candidate.suffix.lower() in PRECOMPRESS_SUFFIXES and candidate.is_file()
+                    and candidate.stat().st_size >= PRECOMPRESS_MIN_BYTES):
+                files.append(candidate)
+    return files
+
+
+def remove_orphan_siblings(manifest, paths):
+    """Delete the .gz/.br siblings precompress_files wrote for files no longer compressed under paths
+
+    That is files that were removed, or that precompressible_files(paths)
+    no longer picks (a suffix or folder nginx doesn't serve precompressed).
+    Only siblings recorded in manifest.compressed are touched, so other .gz
+    or .br files next to the outputs (an uploaded archive, say) are kept.
+    Returns how many were deleted.
+    """
+    current = {str(path) for path in precompressible_files(paths)}
+    removed = 0
+    for path, known in list(manifest.compressed.items()):
+        if path in current:
+            continue
+        for encoding, size in known["sizes"].items():
+            sibling = Path(f"{path}.{encoding}")
+            if size and sibling.exists():
+                sibling.unlink()
+                removed += 1
+        del manifest.compressed[path]
+    return removed
+
+
+def precompress_files(paths, manifest, pool=None, max_workers=None):
+    """Write .gz/.br siblings for changed compressible files under paths, in parallel
+
+    manifest (a BuildManifest) remembers each file's size, mtime and the
+    sibling sizes, so untouched files - including ones whose compression
+    did not pay off - are not compressed again. Returns per-file results.
+    """
+    encodings = precompress_encodings()
+    pending = []
+    for path in precompressible_files(paths):
+        stat = path.stat()
+        known = manifest.compressed.get(str(path))
+        if (known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns
+                and sorted(known["sizes"]) == sorted(encodings)
+                and all(Path(f"{path}.{e}").exists() for e, size in known["sizes"].items() if size)):
+            continue
+        pending.append((path, stat))
+    
+    results = []
+    if pending:
+        workers = max(1, min(len(pending), max_workers or os.cpu_count() or 1))
+        pool_context = nullcontext(pool) if pool else ProcessPoolExecutor(max_workers=workers)
+        with pool_context as executor:
+            futures = {executor.submit(precompress_job, str(path)): (path, stat) for path, stat in pending}
+            for future in as_completed(futures):
+                path, stat = futures[future]
+                result = future.result()
+                manifest.compressed[str(path)] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                                                  "sizes": result["sizes"]}
+                results.append(result)
+    return results
+
+
+BUNDLE_REPORT_VERSION = 1
+BUNDLE_REPORT_DIR = CACHE_DIR / "bundle-reports"  # build artifacts, kept out of the repo with the cache
+BUNDLE_BUDGETS_PATH = Path("bundle-budgets.json")
+BUNDLE_COMPRESS_SUFFIXES = PRECOMPRESS_SUFFIXES | {".tsx", ".ts"}
+BUNDLE_MARKUP_SUFFIXES = {".tsx", ".json", ".html"}
+MARKUP_NODE_RE = re.compile(rb'(?<![\w$])<[A-Za-z]')  # an opening tag, not a TypeScript generic
+BUNDLE_METRICS = ("bytes", "gzip", "brotli", "nodes")
+# Per kind of generated file; bundle-budgets.json (or --budgets) overrides single limits
+DEFAULT_BUNDLE_BUDGETS = {
+    "chapter page": {"gzip": 24_000, "nodes": 800},
+    "chapter data": {"gzip": 24_000, "nodes": 800},
+    "ebook page": {"gzip": 100_000, "nodes": 3_000},
+}
+
+
+def bundle_weight_job(path):
+    """Raw, gzip and brotli size of a generated file and the markup nodes it inlines (worker process)"""
+    usage = usage_start(thread=False)
+    path = Path(path)
+    data = path.read_bytes()
+    weight = {"bytes": len(data), "gzip": None, "brotli": None, "nodes": None}
+    suffix = path.suffix.lower()
+    if suffix in BUNDLE_COMPRESS_SUFFIXES:
+        weight["gzip"] = len(gzip.compress(data, compresslevel=9, mtime=0))
+        if brotli is not None:
+            weight["brotli"] = len(brotli.compress(data, quality=11))
+    if suffix in BUNDLE_MARKUP_SUFFIXES:
+        weight["nodes"] = len(MARKUP_NODE_RE.findall(data))
+    return {"path": str(path), "weight": weight, "usage": usage_since(usage)}
+
+
+def load_bundle_budgets(path=None, overrides=None):
+    """DEFAULT_BUNDLE_BUDGETS with the limits of a budgets file and then overrides applied
+
+    Both map a kind of file ("chapter page", "ebook page", ...) to limits on
+    any of BUNDLE_METRICS; a limit of null removes the default one.
+    """
+    budgets = {kind: dict(limits) for kind, limits in DEFAULT_BUNDLE_BUDGETS.items()}
+    layers = []
+    if path is not None or BUNDLE_BUDGETS_PATH.exists():
+        with open(path or BUNDLE_BUDGETS_PATH, 'r', encoding='utf-8') as f:
+            layers.append(json.load(f))
+    if overrides:
+        layers.append(overrides)
+    for layer in layers:
+        for kind, limits in layer.items():
+            unknown = set(limits) - set(BUNDLE_METRICS)
+            if unknown:
+                raise ValueError(f"Unknown bundle budget metric(s) for {kind!r}: {', '.join(sorted(unknown))}")
+            budgets.setdefault(kind, {}).update(limits)
+    return {kind: {metric: limit for metric, limit in limits.items() if limit is not None}
+            for kind, limits in budgets.items()}
+
+
+def bundle_weights(files, manifest, pool=None, max_workers=None):
+    """Weigh (kind, path) pairs, re-measuring only files whose size or mtime changed
+
+    Returns the per-file entries and the worker usage of the files measured.
+    """
+    entries = {}
+    pending = []
+    for kind, path in files:
+        stat = path.stat()
+        known = manifest.weights.get(str(path))
+        if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+            # the manifest saves keys sorted: restore BUNDLE_METRICS order so the report is stable
+            entries[str(path)] = {"kind": kind, **{metric: known["weight"][metric] for metric in BUNDLE_METRICS}}
+        else:
+            pending.append((kind, path, stat))
+    
+    measured = []
+    if pending:
+        workers = max(1, min(len(pending), max_workers or os.cpu_count() or 1))
+        pool_context = nullcontext(pool) if pool else ProcessPoolExecutor(max_workers=workers)
+        with pool_context as executor:
+            futures = {executor.submit(bundle_weight_job, str(path)): (kind, path, stat)
+                       for kind, path, stat in pending}
+            for future in as_completed(futures):
+                kind, path, stat = futures[future]
+                result = future.result()
+                manifest.weights[str(path)] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                                               "weight": result["weight"]}
+                entries[str(path)] = {"kind": kind, **result["weight"]}
+                measured.append({"path": str(path), **result["usage"]})
+    return dict(sorted(entries.items())), measured
+
+
+def over_bundle_budget(entries, budgets):
+    """Every (path, metric, value, limit) where a file exceeds its kind's budget"""
+    over = []
+    for path, entry in entries.items():
+        for metric, limit in budgets.get(entry["kind"], {}).items():
+            value = entry.get(metric)
+            if value is not None and value > limit:
+                over.append({"path": path, "kind": entry["kind"], "metric": metric, "value": value, "limit": limit})
+    return over
+
+
+def bundle_report(slug, entries, budgets):
+    """Per-course bundle weight report: every file, totals per kind and what is over budget"""
+    kinds = {}
+    for entry in entries.values():
+        totals = kinds.setdefault(entry["kind"], {"files": 0, **{metric: None for metric in BUNDLE_METRICS}})
+        totals["files"] += 1
+        for metric in BUNDLE_METRICS:
+            if entry[metric] is not None:
+                totals[metric] = (totals[metric] or 0) + entry[metric]
+    return {
+        "version": BUNDLE_REPORT_VERSION,
+        "course": slug,
+        "budgets": budgets,
+        "kinds": dict(sorted(kinds.items())),
+        "files": entries,
+        "over_budget": over_bundle_budget(entries, budgets),
+    }
+
+
+class ExtractionCache:
+    """Content-addressed store of extracted PDF text, shared by every course tree
+
+    Entries are keyed by the PDF's SHA-256 and EXTRACTOR_VERSION, so the same
+    textbook stored under several course folders is only extracted once.
+    Entry mtimes are bumped on every hit and the least recently used entries
+    are evicted once the store grows past max_bytes.
+    """
+    
+    def __init__(self, root=CACHE_DIR / "extracted", max_bytes=EXTRACTION_CACHE_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+    
+    def entry_path(self, pdf_hash):
+        return self.root / f"{pdf_hash}-v{EXTRACTOR_VERSION}.txt"
+    
+    def get(self, pdf_hash):
+        """Return the cached text path for a PDF hash, or None on a miss"""
+        path = self.entry_path(pdf_hash)
+        if not path.exists():
+            return None
+        os.utime(path)
+        return path
+    
+    def put(self, pdf_hash, text_path):
+        """Store an extracted text file under the PDF's hash"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.entry_path(pdf_hash)
+        tmp_path = path.with_name(path.name + f".{os.getpid()}-{threading.get_ident()}.tmp")
+        shutil.copyfile(text_path, tmp_path)
+        os.replace(tmp_path, path)
+    
+    def put_data(self, key, data):
+        """Store raw bytes (e.g. a split textbook) under a cache key"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.entry_path(key)
+        tmp_path = path.with_name(path.name + f".{os.getpid()}-{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    
+    def materialize(self, pdf_hash, pdf_path):
+        """Write cached text next to the PDF; returns the output path or None on a miss"""
+        cached = self.get(pdf_hash)
+        if cached is None:
+            return None
+        output_path = extracted_text_path(pdf_path)
+        write_if_changed(output_path, cached.read_bytes())
+        return output_path
+    
+    def evict(self):
+        """Drop least recently used entries until the store fits in max_bytes"""
+        if not self.root.exists():
+            return 0
+        entries = []
+        total = 0
+        for entry in os.scandir(self.root):
+            if entry.is_file() and entry.name.endswith(".txt"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+            removed += 1
+        return removed
+
+
+CHAPTER_HEADING_RE = re.compile(r'^\s*chapter\s+(\d+|[ivxlc]+)\b', re.IGNORECASE)
+TEXTBOOK_NAME_RE = re.compile(r'text[\s-]*book|complete', re.IGNORECASE)
+LARGE_HEADING_RATIO = 1.4
+
+
+def pdf_page_count(pdf_path):
+    if PdfReader is not None:
+        return len(PdfReader(str(pdf_path)).pages)
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
+
+def pdf_outline_chapters(pdf_path):
+    """Top-level bookmarks of a PDF as (title, first page index) pairs"""
+    if PdfReader is None:
+        return []
+    reader = PdfReader(str(pdf_path))
+    chapters = []
+    try:
+        for item in reader.outline:
+            if isinstance(item, list):
+                continue  # nested bookmarks belong to the previous chapter
+            chapters.append((item.title.strip(), reader.get_destination_page_number(item)))
+    except Exception:
+        return []
+    return sorted(chapters, key=lambda chapter: chapter[1])
+
+
+def page_headings(page):
+    """Lines of a pdfplumber page with their font size relative to the page's body text"""
+    words = page.extract_words(extra_attrs=["size"])
+    if not words:
+        return []
+    sizes = sorted(word["size"] for word in words)
+    body_size = sizes[len(sizes) // 2] or 1
+    
+    lines = {}
+    for word in words:
+        lines.setdefault(round(word["top"]), []).append(word)
+    
+    headings = []
+    for index, top in enumerate(sorted(lines)):
+        line_words = lines[top]
+        headings.append({
+            "text": ' '.join(word["text"] for word in line_words),
+            "ratio": max(word["size"] for word in line_words) / body_size,
+            "line": index,
+        })
+    return headings
+
+
+def extract_page_range_job(pdf_path, start, end):
+    """Worker: text and heading lines for pages [start, end) of one PDF"""
+    pages = []
+    if pdfplumber is not None:
+        with pdfplumber.open(pdf_path, pages=list(range(start + 1, end + 1))) as pdf:
+            for offset, page in enumerate(pdf.pages):
+                pages.append({
+                    "page": start + offset,
+                    "text": page.extract_text() or '',
+                    "headings": page_headings(page),
+                })
+    else:
+        reader = PdfReader(str(pdf_path))
+        for index in range(start, end):
+            text = reader.pages[index].extract_text() or ''
+            lines = [line for line in text.split('\n') if line.strip()]
+            pages.append({
+                "page": index,
+                "text": text,
+                "headings": [{"text": line, "ratio": 1.0, "line": i} for i, line in enumerate(lines[:3])],
+            })
+    return pages
+
+
+def chapter_number(heading):
+    """Number of a "Chapter N" heading (arabic or roman numerals)"""
+    token = CHAPTER_HEADING_RE.match(heading).group(1).lower()
+    if token.isdigit():
+        return int(token)
+    values = {"i": 1, "v": 5, "x": 10, "l": 50, "c": 100}
+    total = 0
+    for index, char in enumerate(token):
+        value = values[char]
+        if index + 1 < len(token) and values[token[index + 1]] > value:
+            total -= value
+        else:
+            total += value
+    return total
+
+
+def find_chapter_starts(pages, outline=None):
+    """Pick chapter boundaries for a textbook as (title, page index, heading) tuples
+
+    Bookmarks win when the PDF has them (heading is None: the chapter starts
+    at the top of the page). Otherwise a chapter starts at a "Chapter N" line
+    that is set in a large font, sits at the top of a page or is all caps,
+    with N following on from the previous chapter; failing that, at any line
+    in a much larger font than the body text.
+    """
+    if outline and len(outline) > 1:
+        return [(title, page, None) for title, page in outline]
+    
+    starts = []
+    expected = None
+    for page in pages:
+        for heading in page["headings"]:
+            text = heading["text"].strip()
+            if not CHAPTER_HEADING_RE.match(text):
+                continue
+            if not (heading["ratio"] >= LARGE_HEADING_RATIO or heading["line"] < 3 or text.isupper()):
+                continue
+            number = chapter_number(text)
+            if expected is not None and number != expected:
+                continue
+            starts.append((text, page["page"], text))
+            expected = number + 1
+    if starts:
+        return starts
+    
+    for page in pages:
+        for heading in page["headings"]:
+            if heading["ratio"] >= LARGE_HEADING_RATIO + 0.4:
+                starts.append((heading["text"].strip(), page["page"], heading["text"].strip()))
+                break
+    return starts
+
+
+def split_pages_at(pages, page_index, heading):
+    """Split the text of pages at a chapter heading into (before, from heading on)"""
+    text = pages[page_index]["text"]
+    offset = text.find(heading) if heading else 0
+    if offset < 0:
+        offset = 0
+    return text[:offset], text[offset:]
+
+
+def split_textbook(pdf_path, output_dir, pool=None, max_workers=None, cache=None):
+    """Extract a single-file textbook across worker processes and split it into chapters
+
+    Pages are extracted in page-range jobs, chapter boundaries are taken from
+    the outline or detected headings, and each chapter's text is written to
+    output_dir/<n>/Chapter <n>_extracted.txt so the chapter steps can read it
+    like any other chapter folder. Returns a list of chapter dicts.
+    """
+    pdf_path = Path(pdf_path)
+    output_dir = Path(output_dir)
+    cache_key = None
+    chapters = None
+    
+    if cache is not None:
+        cache_key = f"{file_sha256(pdf_path)}-split"
+        cached = cache.get(cache_key)
+        if cached is not None:
+            chapters = json.loads(cached.read_text(encoding='utf-8'))
+    
+    if chapters is None:
+        page_count = pdf_page_count(pdf_path)
+        workers = max_workers or os.cpu_count() or 1
+        pages_per_job = max(2, -(-page_count // (workers * 4)))
+        ranges = [(start, min(start + pages_per_job, page_count))
+                  for start in range(0, page_count, pages_per_job)]
+        
+        pages = []
+        pool_context = nullcontext(pool) if pool else ProcessPoolExecutor(max_workers=min(workers, len(ranges)))
+        with pool_context as executor:
+            futures = [executor.submit(extract_page_range_job, str(pdf_path), start, end) for start, end in ranges]
+            for future in as_completed(futures):
+                pages.extend(future.result())
+        pages.sort(key=lambda page: page["page"])
+        
+        starts = find_chapter_starts(pages, pdf_outline_chapters(pdf_path))
+        chapters = []
+        for index, (title, start, heading) in enumerate(starts):
+            _, first_page = split_pages_at(pages, start, heading)
+            parts = [first_page]
+            if index + 1 < len(starts):
+                _, end, next_heading = starts[index + 1]
+                parts.extend(page["text"] for page in pages[start + 1:end])
+                if end > start:
+                    tail = split_pages_at(pages, end, next_heading)[0]
+                    parts.append(tail)
+                    if not tail.strip():
+                        end -= 1
+                else:
+                    # Next chapter starts on the same page
+                    parts = [first_page[:first_page.find(next_heading)] if next_heading else first_page]
+            else:
+                end = page_count - 1
+                parts.extend(page["text"] for page in pages[start + 1:])
+            chapters.append({
+                "number": index + 1,
+                "title": title,
+                "start": start,
+                "end": end + 1,
+                "text": '\n'.join(part for part in parts if part),
+            })
+        if cache is not None and chapters:
+            cache.put_data(cache_key, json.dumps(chapters).encode('utf-8'))
+    
+    for chapter in chapters:
+        chapter_dir = output_dir / str(chapter["number"])
+        chapter_dir.mkdir(parents=True, exist_ok=True)
+        output_path = chapter_dir / f"Chapter {chapter['number']}{EXTRACTED_SUFFIX}"
+        write_if_changed(output_path, chapter["text"].encode('utf-8'))
+        chapter["output"] = str(output_path)
+    return chapters
+
+
+def chapter_pdf_title(chapter_num, pdf_path):
+    """Bookmark title for a chapter PDF: its file name, prefixed with the chapter when that's missing"""
+    title = ' '.join(Path(pdf_path).stem.split())
+    if not re.search(r'\bchapter\b', title, re.IGNORECASE):
+        title = f"Chapter {chapter_num}: {title}"
+    return title
+
+
+def merge_pdfs(chapters, output_path, title=None):
+    """Merge (bookmark title, PDF path) pairs into one PDF with a bookmark per chapter
+
+    Readers stay file-backed, but the writer keeps every copied page in memory
+    until write(), so memory grows with the whole book. Objects are not
+    deduplicated: fonts and images shared by chapters are stored once per
+    chapter. Returns the page count.
+    """
+    if PdfWriter is None:
+        raise RuntimeError("PyPDF2 is required to merge PDFs (pip install PyPDF2)")
+    writer = PdfWriter()
+    with ExitStack() as stack:
+        for bookmark, pdf_path in chapters:
+            reader = PdfReader(stack.enter_context(open(pdf_path, 'rb')))
+            first_page = len(writer.pages)
+            for page in reader.pages:
+                writer.add_page(page)
+            writer.add_outline_item(bookmark, first_page)
+        if title:
+            writer.add_metadata({"/Title": title})
+        writer.page_mode = "/UseOutlines"
+        with open(output_path, 'wb') as f:
+            writer.write(f)
+    return len(writer.pages)
+
+
+def linearize_pdf(pdf_path):
+    """Best effort: rewrite a PDF linearized ("fast web view") in place with qpdf
+
+    qpdf is an optional system tool, not a dependency of the build; returns
+    False, leaving the file as is, when it isn't on the PATH.
+    """
+    qpdf = shutil.which("qpdf")
+    if qpdf is None:
+        return False
+    pdf_path = Path(pdf_path)
+    tmp_path = pdf_path.with_name(pdf_path.name + ".lin")
+    result = subprocess.run([qpdf, "--linearize", "--deterministic-id", str(pdf_path), str(tmp_path)],
+                            capture_output=True, text=True)
+    if result.returncode not in (0, 3):  # 3: succeeded with warnings
+        tmp_path.unlink(missing_ok=True)
+        raise RuntimeError(f"qpdf failed on {pdf_path}: {result.stderr.strip()}")
+    os.replace(tmp_path, pdf_path)
+    return True
+
+
+def complete_pdf_job(chapters, textbook, output_path, title):
+    """Worker: write the complete book PDF, from chapter PDFs or a copy of the single textbook"""
+    usage = usage_start(thread=False)
+    if chapters:
+        pages = merge_pdfs(chapters, output_path, title)
+    else:
+        shutil.copyfile(textbook, output_path)
+        pages = pdf_page_count(output_path)
+    return {"pages": pages, "linearized": linearize_pdf(output_path), "usage": usage_since(usage)}
+
+
+def jsx_attr(value):
+    """Quote a string for use as a JSX attribute value"""
+    if '"' not in value and '{' not in value:
+        return f'"{value}"'
+    return '{' + json.dumps(value, ensure_ascii=False) + '}'
+
+
+HEADING_MAX_LENGTH = 50  # shorter lines ending in ":" are headings
+WRAPPED_LINE_MIN_LENGTH = 60  # a line this long that stops mid-sentence ran into the page margin
+SCRIPTURE_START_RE = re.compile(r'"|\d+:')
+SENTENCE_END_CHARS = frozenset('.!?:;"\u201d\u2019)]')
+TEXT_ESCAPES = {'&': '&amp;', '<': '&lt;', '>': '&gt;', '{': '&#123;', '}': '&#125;'}
+HTML_SPECIAL_RE = re.compile(r'[&<>]')
+JSX_SPECIAL_RE = re.compile(r'[&<>{}]')  # braces would open a JSX expression
+
+
+def escape_text(text, special_re):
+    """Entity-escape the characters special_re matches (most lines have none, so check first)"""
+    if special_re.search(text) is None:
+        return text
+    return special_re.sub(lambda m: TEXT_ESCAPES[m.group()], text)
+
+
+def chapter_blocks(lines):
+    """Group extracted text lines into (kind, text) blocks in a single pass
+
+    kind is "heading", "scripture" or "paragraph". PDF extraction keeps a
+    trailing space on lines that wrapped, so such a line continues the current
+    block, even across the blank lines left by page breaks; so does one that
+    stops mid-sentence when it is full-width or the next line is lowercase.
+    lines can be any iterable, e.g. an open file, so the text is never held in
+    memory as a whole.
+    """
+    kind = None
+    parts = []
+    continues = False  # the previous line wrapped into this one
+    for raw in lines:
+        line = raw.strip()
+        if not line:
+            continue
+        if continues or (parts and kind != "heading" and parts[-1][-1] not in SENTENCE_END_CHARS
+                         and (line[0].islower() or len(parts[-1]) >= WRAPPED_LINE_MIN_LENGTH)):
+            parts.append(line)
+        else:
+            if parts:
+                yield kind, ' '.join(parts)
+            if line.isupper() or (len(line) < HEADING_MAX_LENGTH and line.endswith(':')):
+                kind = "heading"
+            elif SCRIPTURE_START_RE.match(line):
+                kind = "scripture"
+            else:
+                kind = "paragraph"
+            parts = [line]
+        # rstrip() keeps the newline off: "...of \n" wrapped, "...end.\n" did not
+        continues = kind != "heading" and raw.rstrip('\r\n')[-1:].isspace()
+    if parts:
+        yield kind, ' '.join(parts)
+
+
+def format_chapter_blocks(lines, html_output=False):
+    """Format extracted text lines into color-coded HTML blocks, one string per block
+
+    Produces JSX (className) for inlining into a page, or plain escaped
+    HTML (class) for the data files fetched by ChapterContent.
+    """
+    attr = "class" if html_output else "className"
+    special_re = HTML_SPECIAL_RE if html_output else JSX_SPECIAL_RE
+    heading = f'<h2 {attr}="text-2xl font-bold mb-4 mt-6">'
+    scripture = (f'<div {attr}="bg-purple-50 border-l-4 border-purple-500 p-4 mb-4">\n'
+                 f'                    <blockquote {attr}="text-purple-900 italic">')
+    paragraph = f'<p {attr}="mb-4">'
+    for kind, text in chapter_blocks(lines):
+        text = escape_text(text, special_re)
+        if kind == "heading":
+            yield f'{heading}{text}</h2>'
+        elif kind == "scripture":
+            yield f'{scripture}{text}</blockquote>\n                </div>'
+        else:
+            yield f'{paragraph}{text}</p>'
+
+
+def write_joined(out, blocks, separator='\n'):
+    """Stream blocks to out() with separator between them (a streaming str.join)"""
+    first = True
+    for block in blocks:
+        out(block if first else separator + block)
+        first = False
+
+
+def write_chapter_json(out, chapter_num, blocks):
+    """Stream a chapter data file ({"chapter", "title", "html"}) to out() without building the HTML string"""
+    out(f'{{"chapter":{chapter_num},"title":"Chapter {chapter_num}","html":"')
+    write_joined(out, (json.dumps(block, ensure_ascii=False)[1:-1] for block in blocks), separator='\\n')
+    out('"}')
+
+
+QUIZ_QUESTION_RE = re.compile(r'^(?:question\s+(\d+)\s*[:.)]|(\d+)\s*[.)])\s*(.*)$', re.IGNORECASE)
+QUIZ_OPTION_RE = re.compile(r'^([A-Ea-e])\s*[.)]\s*(.*)$')
+QUIZ_ANSWER_RE = re.compile(r'^(?:correct\s+)?answer\s*:\s*([A-Ea-e])\b\s*[.)]?\s*(.*)$', re.IGNORECASE)
+QUIZ_SECTION_RE = re.compile(r'^questions\s+\d+\s*[-–]\s*\d+|^multiple choice quiz', re.IGNORECASE)
+QUIZ_ANSWER_SPLIT_RE = re.compile(r'\s*((?:correct\s+)?answer\s*:)', re.IGNORECASE)
+QUIZ_RUN_TOGETHER_MIN = 400  # longer lines holding several answers lost their line breaks
+
+
+def split_quiz_lines(text):
+    """Lines of an extracted quiz, re-breaking text the PDF extractor ran together"""
+    lines = []
+    for line in text.split('\n'):
+        if len(line) > QUIZ_RUN_TOGETHER_MIN and len(QUIZ_ANSWER_SPLIT_RE.findall(line)) > 1:
+            line = QUIZ_ANSWER_SPLIT_RE.sub(r'\n\1', line)
+            line = re.sub(r'\s*(?<![\d:–-])(\d+\s*[.)]\s*(?=[A-Z"“]))', r'\n\1', line)
+            line = re.sub(r'(?<=\S)(?=[A-E][.)] )', '\n', line)
+        lines.extend(line.split('\n'))
+    return [line.strip() for line in lines if line.strip()]
+
+
+def split_inline_options(letter, text):
+    """Split "A. Church leaders only B. Kings ..." into one option per letter"""
+    options = [[letter, text]]
+    while True:
+        next_letter = chr(ord(options[-1][0]) + 1)
+        match = re.search(rf'\s{next_letter}[.)]\s', options[-1][1])
+        if not match:
+            return options
+        rest = options[-1][1][match.end():]
+        options[-1][1] = options[-1][1][:match.start()].strip()
+        options.append([next_letter, rest.strip()])
+
+
+def join_wrapped(text, line):
+    """Append a wrapped continuation line ("cares/riches/" + "pleasures" keeps no space)"""
+    return f"{text}{line}" if text.endswith('/') else f"{text} {line}".strip()
+
+
+def normalize_quiz_text(text):
+    text = text.replace('’', "'").replace('‘', "'").replace('“', '"').replace('”', '"')
+    return ''.join(text.split()).lower()
+
+
+def answer_continues(question):
+    """Whether a "Correct Answer: B) ..." line stopped partway through option B"""
+    if not question["answer_text"]:
+        return False
+    option = normalize_quiz_text(dict(question["options"]).get(question["answer"], ""))
+    given = normalize_quiz_text(question["answer_text"])
+    return option.startswith(given) and option != given
+
+
+def validate_quiz_question(question, expected_number):
+    """Validation errors for one parsed question (empty when it can be seeded)"""
+    errors = []
+    letters = [letter for letter, _ in question["options"]]
+    if question["number"] != expected_number:
+        errors.append(f"numbered {question['number']}, expected {expected_number}")
+    if not question["question"]:
+        errors.append("has no question text")
+    if len(letters) < 2:
+        errors.append(f"has {len(letters)} option(s), need at least 2")
+    elif letters != [chr(ord('A') + i) for i in range(len(letters))]:
+        errors.append(f"options are lettered {', '.join(letters)}")
+    if any(not text for _, text in question["options"]):
+        errors.append("has an empty option")
+    answer = question["answer"]
+    if answer is None:
+        errors.append("has no answer")
+    elif answer not in letters:
+        errors.append(f"answer {answer} is not one of the options")
+    elif question["answer_text"]:
+        # "Correct Answer: B) ..." repeats the option; it must agree with the letter
+        option = normalize_quiz_text(dict(question["options"])[answer])
+        given = normalize_quiz_text(question["answer_text"])
+        if not (given.startswith(option) or option.startswith(given)):
+            errors.append(f"answer text does not match option {answer}")
+    return errors
+
+
+def parse_quiz_text(text):
+    """Parse an extracted quiz into {"title", "questions", "errors"}
+
+    Understands "Question N:", "N." and "N)" numbering (or none at all, when a
+    question is whatever precedes its options), A)-D) / A.-D. options and
+    "Correct Answer: X" / "Answer: X" lines; question and option text may wrap
+    over several lines. Questions with validation errors are reported in
+    "errors" and left out of "questions".
+    """
+    lines = split_quiz_lines(text)
+    numbered = any((match := QUIZ_QUESTION_RE.match(line)) and match.group(3) for line in lines)
+    title = None
+    parsed = []
+    pending = []  # unnumbered mode: text seen since the last answer
+    current = None
+    state = None  # "question", "options" or "answer"
+    
+    def start_question(number, question_text):
+        question = {"number": number, "question": question_text,
+                    "options": [], "answer": None, "answer_text": ""}
+        parsed.append(question)
+        return question
+    
+    for line in lines:
+        question_match = QUIZ_QUESTION_RE.match(line)
+        option_match = QUIZ_OPTION_RE.match(line)
+        answer_match = QUIZ_ANSWER_RE.match(line)
+        
+        if numbered and question_match and (state != "question" or not current["question"]):
+            current = start_question(int(question_match.group(1) or question_match.group(2)),
+                                     question_match.group(3).strip())
+            state = "question"
+        elif not numbered and question_match and not question_match.group(3):
+            continue  # bare "1." left behind when the numbers were extracted separately
+        elif option_match and (state in ("question", "options") or (not numbered and pending)):
+            if state not in ("question", "options"):
+                if title is None and len(parsed) == 0 and len(pending) > 1:
+                    title = pending.pop(0)
+                current = start_question(len(parsed) + 1, ' '.join(pending))
+                pending = []
+            current["options"].extend(split_inline_options(option_match.group(1).upper(),
+                                                           option_match.group(2).strip()))
+            state = "options"
+        elif answer_match and current is not None:
+            current["answer"] = answer_match.group(1).upper()
+            current["answer_text"] = answer_match.group(2).strip()
+            state = "answer"
+        elif QUIZ_SECTION_RE.match(line):
+            state = "answer" if current else None  # section header between questions
+        elif current is None and numbered:
+            if title is None:
+                title = line
+        elif not numbered and state in (None, "answer"):
+            if state == "answer" and answer_continues(current):
+                current["answer_text"] = join_wrapped(current["answer_text"], line)
+            else:
+                pending.append(line)
+        elif state == "question":
+            current["question"] = join_wrapped(current["question"], line)
+        elif state == "options":
+            current["options"][-1][1] = join_wrapped(current["options"][-1][1], line)
+        elif current["answer_text"]:
+            current["answer_text"] = join_wrapped(current["answer_text"], line)
+    
+    if title is None and not numbered and pending:
+        title = pending[0]
+    
+    questions = []
+    errors = []
+    if not parsed:
+        errors.append("no questions found")
+    for expected, question in enumerate(parsed, 1):
+        problems = validate_quiz_question(question, expected)
+        if problems:
+            errors.extend(f"Question {question['number']}: {problem}" for problem in problems)
+            continue
+        questions.append({
+            "number": question["number"],
+            "question": question["question"],
+            "options": [text for _, text in question["options"]],
+            "answer": question["answer"],
+        })
+    return {"title": title, "questions": questions, "errors": errors}
+
+
+QUIZ_INDEX_PATH = Path("server/quiz-index.json")
+
+
+def load_quiz_index(index_path=QUIZ_INDEX_PATH):
+    """Slug -> quiz ID index written by the generated seed scripts"""
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+ROUTE_REGISTRY_PATH = Path("client/src/course-routes.json")
+ROUTE_MODULE_PATH = Path("client/src/course-routes.tsx")
+APP_ROUTES_IMPORT = 'import { courseRoutes } from "@/course-routes";'
+APP_CATCH_ALL_ROUTE = '<Route component={NotFound} />'
+
+
+def load_route_registry(registry_path=ROUTE_REGISTRY_PATH):
+    """Course entries of the route registry, keyed by slug"""
+    try:
+        with open(registry_path, 'r', encoding='utf-8') as f:
+            courses = json.load(f)["courses"]
+    except FileNotFoundError:
+        return {}
+    return {course["slug"]: course for course in courses}
+
+
+def render_route_module(courses):
+    """TSX for the route registry: one lazily loaded, parameterized route per course"""
+    blocks = []
+    for course in sorted(courses, key=lambda c: c["slug"]):
+        slug = course["slug"]
+        ebook = course.get("ebook", f"{slug}-complete-ebook")
+        chapters = '\n'.join(
+            f'      {n}: lazy(() => import("@/pages/{slug}-ch{n}")),'
+            for n in range(1, course["chapters"] + 1)
+        )
+        blocks.append(f'''  {{
+    slug: "{slug}",
+    path: /^\\/(?:{slug}-ch(?<chapter>\\d+)|{ebook})$/,
+    chapters: {{
+{chapters}
+    }},
+    ebook: lazy(() => import("@/pages/{ebook}")),
+  }},''')
+    entries = '\n'.join(blocks)
+    return f'''// Generated by auto-create-course.py from course-routes.json - do not edit by hand.
+// Each course gets one route; its pages are separate chunks fetched when first opened.
+import React, {{ Suspense, lazy }} from "react";
+import {{ Route }} from "wouter";
+import NotFound from "@/pages/not-found";
+
+type LazyPage = React.LazyExoticComponent<React.ComponentType>;
+
+interface CourseRoutes {{
+  slug: string;
+  path: RegExp; // matches /<slug>-ch<N> and the complete e-book
+  chapters: Record<number, LazyPage>;
+  ebook: LazyPage;
+}}
+
+const courses: CourseRoutes[] = [
+{entries}
+];
+
+function CoursePage({{ course, chapter }}: {{ course: CourseRoutes; chapter?: string }}) {{
+  const Page = chapter === undefined ? course.ebook : course.chapters[Number(chapter)];
+  if (!Page) return <NotFound />;
+  return (
+    <Suspense fallback={{<div className="min-h-screen bg-gradient-to-br from-indigo-900 via-blue-900 to-purple-900" />}}>
+      <Page />
+    </Suspense>
+  );
+}}
+
+export const courseRoutes = courses.map((course) => (
+  <Route key={{course.slug}} path={{course.path}}>
+    {{(params: {{ chapter?: string }}) => <CoursePage course={{course}} chapter={{params.chapter}} />}}
+  </Route>
+));
+'''
+
+
+def remove_static_course_routes(app_source, pages):
+    """Drop App.tsx imports and routes that point at any of the given pages"""
+    removed = set()
+    kept = []
+    for line in app_source.split('\n'):
+        match = re.match(r'import (\w+) from "@/pages/([\w-]+)";$', line.strip())
+        if match and match.group(2) in pages:
+            removed.add(match.group(1))
+            continue
+        kept.append(line)
+    if not removed:
+        return app_source
+    route_re = re.compile(r'<Route path="[^"]*" component=\{(\w+)\} />$')
+    return '\n'.join(
+        line for line in kept
+        if not ((match := route_re.match(line.strip())) and match.group(1) in removed)
+    )
+
+
+def wire_course_routes(app_source):
+    """Make App.tsx render the registry's routes ahead of the catch-all (once)"""
+    if APP_ROUTES_IMPORT not in app_source:
+        anchor = 'import { Switch, Route } from "wouter";'
+        if anchor not in app_source:
+            raise ValueError("App.tsx does not import Switch/Route from wouter")
+        app_source = app_source.replace(anchor, f"{anchor}\n{APP_ROUTES_IMPORT}", 1)
+    if "{courseRoutes}" not in app_source:
+        if APP_CATCH_ALL_ROUTE not in app_source:
+            raise ValueError(f"App.tsx has no catch-all {APP_CATCH_ALL_ROUTE}")
+        indent = re.search(r'\n([ \t]*)' + re.escape(APP_CATCH_ALL_ROUTE), app_source).group(1)
+        app_source = app_source.replace(
+            APP_CATCH_ALL_ROUTE,
+            f"{{/* Generated course routes (client/src/course-routes.tsx) */}}\n"
+            f"{indent}{{courseRoutes}}\n{indent}{APP_CATCH_ALL_ROUTE}", 1)
+    return app_source
+
+
+def register_course_routes(course, app_path=Path("client/src/App.tsx")):
+    """Add or update a course in the route registry and regenerate the route module
+
+    Idempotent: re-registering a course rewrites nothing when its entry is unchanged.
+    The new keys are merged into an existing entry, so hand-set ones such as
+    "ebook" survive a rebuild.
+    """
+    registry = load_route_registry()
+    course = {**registry.get(course["slug"], {}), **course}
+    registry[course["slug"]] = course
+    courses = sorted(registry.values(), key=lambda c: c["slug"])
+    registry_json = json.dumps({"courses": courses}, indent=2) + '\n'
+    changed = write_if_changed(ROUTE_REGISTRY_PATH, registry_json.encode('utf-8'))
+    changed |= write_if_changed(ROUTE_MODULE_PATH, render_route_module(courses).encode('utf-8'))
+    
+    app_source = app_path.read_text(encoding='utf-8')
+    pages = {f"{course['slug']}-ch{n}" for n in range(1, course["chapters"] + 1)}
+    pages.add(course.get("ebook", f"{course['slug']}-complete-ebook"))
+    patched = wire_course_routes(remove_static_course_routes(app_source, pages))
+    changed |= write_if_changed(app_path, patched.encode('utf-8'))
+    return changed
+
+
+SEARCH_INDEX_VERSION = 1
+SEARCH_DIR = Path("public/search")
+SEARCH_SHARD_PREFIX = 2  # shards hold every term starting with the same two characters
+SEARCH_MAX_RANGE = 50  # verses a "3:16-18" style range may expand to
+SEARCH_STOPWORDS = frozenset("""
+a about after all also an and any are as at be because been but by can did do does for from had has
+have he her him his how i if in into is it its me my no not of on or our out shall she so than that
+the thee their them then there these they thou this those thy to unto up upon us was we were what when
+which who will with would ye you your
+""".split())
+SEARCH_WORD_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)*")
+SEARCH_SUFFIXES = ("ational", "fulness", "iveness", "ization", "ations", "ation", "ments", "ment",
+                   "ness", "ings", "ing", "ful", "edly", "ies", "ied", "ed", "ly", "es", "s")
+
+# Canonical book -> aliases (lowercase, periods dropped). Numbered books are
+# listed without their number; BIBLE_NUMBERED gives how many there are.
+BIBLE_BOOKS = {
+    "genesis": "gen ge gn", "exodus": "exod exo ex", "leviticus": "lev le lv", "numbers": "num nu nm nb",
+    "deuteronomy": "deut de dt", "joshua": "josh jos", "judges": "judg jdg", "ruth": "rth ru",
+    "samuel": "sam sa", "kings": "kgs ki", "chronicles": "chron chr ch", "ezra": "ezr", "nehemiah": "neh",
+    "esther": "esth est", "job": "jb", "psalms": "psalm ps psa pss", "proverbs": "prov pro prv pr",
+    "ecclesiastes": "eccl ecc qoh", "songofsolomon": "song sos songofsongs", "isaiah": "isa",
+    "jeremiah": "jer", "lamentations": "lam", "ezekiel": "ezek eze", "daniel": "dan da", "hosea": "hos",
+    "joel": "jl", "amos": "am", "obadiah": "obad ob", "jonah": "jon jnh", "micah": "mic", "nahum": "nah",
+    "habakkuk": "hab", "zephaniah": "zeph zep", "haggai": "hag", "zechariah": "zech zec", "malachi": "mal",
+    "matthew": "matt mt", "mark": "mk mrk", "luke": "lk luk", "john": "jn jhn", "acts": "act",
+    "romans": "rom ro rm", "corinthians": "cor co", "galatians": "gal", "ephesians": "eph",
+    "philippians": "phil php", "colossians": "col", "thessalonians": "thess th", "timothy": "tim ti",
+    "titus": "tit", "philemon": "phlm phm", "hebrews": "heb", "james": "jas jm", "peter": "pet pe pt",
+    "jude": "jud", "revelation": "rev re revelations",
+}
+BIBLE_NUMBERED = {"samuel": 2, "kings": 2, "chronicles": 2, "corinthians": 2, "thessalonians": 2,
+                  "timothy": 2, "peter": 2, "john": 3}
+BIBLE_ALIASES = {alias: book for book, aliases in BIBLE_BOOKS.items() for alias in [book, *aliases.split()]}
+BIBLE_ALIASES.update({"song of solomon": "songofsolomon", "song of songs": "songofsolomon"})
+BIBLE_ORDINALS = {"1": 1, "2": 2, "3": 3, "i": 1, "ii": 2, "iii": 3, "first": 1, "second": 2, "third": 3,
+                  "1st": 1, "2nd": 2, "3rd": 3}
+SCRIPTURE_REF_RE = re.compile(
+    r"\b(?:(1st|2nd|3rd|first|second|third|iii|ii|i|[123])\s*)?("
+    + "|".join(sorted((re.escape(a).replace("\\ ", r"\s+") for a in BIBLE_ALIASES), key=len, reverse=True))
+    + r")\.?\s+(\d{1,3})(?:\s*:\s*(\d{1,3})(?:\s*[-\u2013]\s*(\d{1,3}))?)?\b",
+    re.IGNORECASE)
+
+
+def search_stem(word):
+    """Light suffix-stripping stemmer (mirrored by client/src/lib/search.ts)"""
+    if len(word) <= 3 or not word.isalpha():
+        return word
+    for suffix in SEARCH_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            if suffix == "s" and word[-2] in "siu":
+                break
+            word = word[:-len(suffix)] + ("y" if suffix in ("ies", "ied") else "")
+            break
+    if len(word) > 4 and word.endswith("e"):
+        word = word[:-1]
+    if len(word) > 3 and word[-1] == word[-2] and word[-1] not in "lsz":
+        word = word[:-1]
+    return word
+
+
+def scripture_refs(text):
+    """Normalized scripture references in text: "1 Cor. 13:4-5" -> 1corinthians.13, .13.4, .13.5"""
+    refs = []
+    for match in SCRIPTURE_REF_RE.finditer(text):
+        ordinal, alias, chapter, verse, verse_end = match.groups()
+        book = BIBLE_ALIASES[re.sub(r'\s+', ' ', alias.lower())]
+        number = BIBLE_ORDINALS.get(ordinal.lower()) if ordinal else None
+        if book in BIBLE_NUMBERED:
+            if number is None and book != "john":
+                continue
+            if number is not None:
+                if number > BIBLE_NUMBERED[book]:
+                    continue
+                book = f"{number}{book}"
+        if verse is None and len(alias) <= 2:
+            continue  # "am 3", "ex 2": too likely to be ordinary words
+        refs.append(f"{book}.{int(chapter)}")
+        if verse is not None:
+            first = int(verse)
+            last = int(verse_end) if verse_end and int(verse_end) >= first else first
+            refs.extend(f"{book}.{int(chapter)}.{v}" for v in range(first, min(last, first + SEARCH_MAX_RANGE) + 1))
+    return refs
+
+
+def search_terms(text):
+    """Index terms of a text: stemmed words minus stopwords, plus scripture references"""
+    text = text.replace('\u2019', "'").lower()
+    terms = scripture_refs(text)
+    for word in SEARCH_WORD_RE.findall(text):
+        word = word.split("'")[0]
+        if word not in SEARCH_STOPWORDS and len(word) > 1 and not word.isdigit():
+            terms.append(search_stem(word))
+    return terms
+
+
+def index_documents(documents):
+    """Postings for one course: {term: [chapter, tf, chapter, tf, ...]} and chapter lengths"""
+    postings = {}
+    lengths = {}
+    for chapter, text in sorted(documents.items()):
+        terms = search_terms(text)
+        lengths[str(chapter)] = len(terms)
+        counts = {}
+        for term in terms:
+            counts[term] = counts.get(term, 0) + 1
+        for term, tf in counts.items():
+            postings.setdefault(term, []).extend((chapter, tf))
+    return postings, lengths
+
+
+def search_normalization():
+    """Tokenizer tables shipped in the search manifest so queries are normalized like the index"""
+    return {
+        "stopwords": sorted(SEARCH_STOPWORDS),
+        "suffixes": list(SEARCH_SUFFIXES),
+        "books": dict(sorted(BIBLE_ALIASES.items())),
+        "numbered": BIBLE_NUMBERED,
+        "ordinals": BIBLE_ORDINALS,
+        "maxRange": SEARCH_MAX_RANGE,
+    }
+
+
+def search_shard_key(term):
+    return term[:SEARCH_SHARD_PREFIX]
+
+
+def load_search_manifest(search_dir=SEARCH_DIR):
+    try:
+        with open(Path(search_dir) / "manifest.json", 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    return manifest if manifest.get("version") == SEARCH_INDEX_VERSION else None
+
+
+def update_search_index(slug, course, postings, search_dir=SEARCH_DIR):
+    """Replace one course's postings in the sharded index under public/search/
+
+    course holds the manifest entry ({"name", "hash", "lengths"}); postings of
+    None removes the course. Only shards whose terms changed are rewritten,
+    under content-hashed names listed in manifest.json. Returns the number of
+    shards written.
+    """
+    search_dir = Path(search_dir)
+    manifest = load_search_manifest(search_dir) or {"version": SEARCH_INDEX_VERSION, "courses": {}, "shards": {}}
+    old_terms = set()
+    shards = {}
+    for key, url in manifest["shards"].items():
+        with open(search_dir / Path(url).name, 'r', encoding='utf-8') as f:
+            shards[key] = json.load(f)
+    for key, shard in shards.items():
+        for term, courses in shard.items():
+            if slug in courses:
+                old_terms.add(term)
+    touched = {search_shard_key(t) for t in old_terms} | {search_shard_key(t) for t in postings or {}}
+    
+    for key in touched:
+        shard = shards.setdefault(key, {})
+        for term in [t for t in shard if slug in shard[t]]:
+            del shard[term][slug]
+            if not shard[term]:
+                del shard[term]
+    for term, entries in (postings or {}).items():
+        shards[search_shard_key(term)].setdefault(term, {})[slug] = entries
+    
+    if postings is None:
+        manifest["courses"].pop(slug, None)
+    else:
+        manifest["courses"][slug] = course
+    manifest["courses"] = dict(sorted(manifest["courses"].items()))
+    
+    search_dir.mkdir(parents=True, exist_ok=True)
+    written = 0
+    for key in sorted(touched):
+        shard = shards[key]
+        if not shard:
+            manifest["shards"].pop(key, None)
+            continue
+        data = json.dumps({t: dict(sorted(shard[t].items())) for t in sorted(shard)},
+                          separators=(',', ':')).encode('utf-8')
+        name = f"{key}.{hashlib.sha256(data).hexdigest()[:ASSET_HASH_LENGTH]}.json"
+        if write_if_changed(search_dir / name, data):
+            precompress_job(str(search_dir / name))
+            written += 1
+        manifest["shards"][key] = f"/search/{name}"
+    manifest["shards"] = dict(sorted(manifest["shards"].items()))
+    manifest["normalization"] = search_normalization()
+    write_if_changed(search_dir / "manifest.json", (json.dumps(manifest, indent=2) + '\n').encode('utf-8'))
+    
+    current = {Path(url).name for url in manifest["shards"].values()} | {"manifest.json"}
+    for stale in search_dir.glob("*.json"):
+        if stale.name not in current:
+            stale.unlink()
+            for encoding in ("gz", "br"):  # whichever precompress_job wrote
+                Path(f"{stale}.{encoding}").unlink(missing_ok=True)
+    return written
+
+
+class BuildManifest:
+    """Per-course record of the inputs behind every generated output
+
+    Each output path maps to the hashes of the inputs it was rendered from
+    (source PDF, extracted text, audio, course parameters, GENERATOR_VERSION)
+    plus the hash of what was written. An output is only regenerated when one
+    of those inputs changed or the file on disk no longer matches, so
+    untouched pages keep their mtime and Vite leaves them alone.
+    """
+    
+    def __init__(self, slug, root=CACHE_DIR / "builds"):
+        self.path = Path(root) / f"{slug}.json"
+        self.outputs = {}
+        self.file_hashes = {}
+        self.compressed = {}  # path -> size, mtime and .gz/.br sizes from precompress_files
+        self.weights = {}  # path -> size, mtime and bundle_weight_job result
+        self.rebuilt = []
+        self.skipped = []
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.outputs = data.get("outputs", {})
+            self.file_hashes = data.get("file_hashes", {})
+            self.compressed = data.get("compressed", {})
+            self.weights = data.get("weights", {})
+    
+    def hash_file(self, path):
+        """Hash an input file, reusing the stored hash while size and mtime are unchanged"""
+        if path is None:
+            return None
+        path = Path(path)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        key = str(path)
+        known = self.file_hashes.get(key)
+        if known and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+            return known[2]
+        digest = file_sha256(path)
+        self.file_hashes[key] = [stat.st_size, stat.st_mtime_ns, digest]
+        return digest
+    
+    def is_fresh(self, output_path, inputs):
+        entry = self.outputs.get(str(output_path))
+        if not entry or entry["inputs"] != inputs:
+            return False
+        return self.hash_file(output_path) == entry["hash"]
+    
+    def emit(self, output_path, inputs, render):
+        """Write render() to output_path unless inputs match the last build"""
+        return self.emit_stream(output_path, inputs, lambda out: out(render()))
+    
+    def emit_stream(self, output_path, inputs, write):
+        """Like emit(), but write(out) produces the output piecewise by calling out(text)
+
+        Pieces go straight to a temporary file while being hashed; it only
+        replaces output_path when the content differs, so unchanged files
+        keep their mtime.
+        """
+        output_path = Path(output_path)
+        inputs = dict(inputs, generator=GENERATOR_VERSION)
+        if self.is_fresh(output_path, inputs):
+            self.skipped.append(str(output_path))
+            return False
+        digest = hashlib.sha256()
+        tmp_path = output_path.with_name(output_path.name + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            def out(text):
+                data = text.encode('utf-8')
+                digest.update(data)
+                f.write(data)
+            write(out)
+        digest = digest.hexdigest()
+        if self.hash_file(output_path) == digest:
+            tmp_path.unlink()
+        else:
+            os.replace(tmp_path, output_path)
+        self.outputs[str(output_path)] = {"inputs": inputs, "hash": digest}
+        self.rebuilt.append(str(output_path))
+        return True
+    
+    def emit_file(self, output_path, inputs, produce):
+        """Like emit(), for outputs a tool writes itself: produce(tmp_path) writes the file"""
+        output_path = Path(output_path)
+        inputs = dict(inputs, generator=GENERATOR_VERSION)
+        if self.is_fresh(output_path, inputs):
+            self.skipped.append(str(output_path))
+            return False
+        tmp_path = output_path.with_name(output_path.name + ".tmp")
+        produce(tmp_path)
+        digest = file_sha256(tmp_path)
+        if self.hash_file(output_path) == digest:
+            tmp_path.unlink()
+        else:
+            os.replace(tmp_path, output_path)
+        self.outputs[str(output_path)] = {"inputs": inputs, "hash": digest}
+        self.rebuilt.append(str(output_path))
+        return True
+    
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"outputs": self.outputs, "file_hashes": self.file_hashes, "compressed": self.compressed,
+                "weights": self.weights}
+        write_if_changed(self.path, json.dumps(data, indent=2, sort_keys=True).encode('utf-8'))
+    
+    def print_summary(self):
+        print(f"🔁 Rebuilt {len(self.rebuilt)} output(s), skipped {len(self.skipped)} unchanged")
+        for path in sorted(self.rebuilt):
+            print(f"   rebuilt: {path}")
+
+
+def extract_pdf_job(pdf_path):
+    """Worker: extract one PDF and write its *_extracted.txt (runs in a pool process)"""
+    usage = usage_start(thread=False)
+    started = time.perf_counter()
+    output_path = extracted_text_path(pdf_path)
+    try:
+        text = extract_pdf_text(pdf_path)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+    except Exception as e:
+        return {"pdf": str(pdf_path), "output": str(output_path), "ok": False,
+                "error": f"{type(e).__name__}: {e}", "seconds": time.perf_counter() - started}
+    return {"pdf": str(pdf_path), "output": str(output_path), "ok": True,
+            "chars": len(text), "seconds": time.perf_counter() - started, "usage": usage_since(usage)}
+
+
+WATCH_DEBOUNCE_SECONDS = 0.3  # a burst of changes (a PDF being saved, a folder copied in) ends after this much quiet
+WATCH_POLL_SECONDS = 1.0
+WATCH_SUFFIXES = {".pdf", ".mp3", ".txt"} | IMAGE_SUFFIXES
+
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+INOTIFY_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+INOTIFY_EVENT = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+
+class InotifyWatcher:
+    """Changed paths under a directory tree, from Linux inotify (through libc, no extra packages)
+
+    Every directory gets its own watch; directories created later are added
+    as their events arrive.
+    """
+    
+    name = "inotify"
+    
+    def __init__(self, root):
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs = {}  # watch descriptor -> directory
+        try:
+            self.add_tree(Path(root))
+        except OSError:
+            self.close()
+            raise
+    
+    def add_tree(self, root):
+        for dirpath, _, _ in os.walk(root):
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(dirpath), INOTIFY_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {dirpath}")
+            self.dirs[wd] = Path(dirpath)
+    
+    def read(self, timeout):
+        """Paths changed within timeout seconds (None: wait for the first change)"""
+        changed = set()
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return changed
+        data = os.read(self.fd, 64 * 1024)
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+            offset += INOTIFY_EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            directory = self.dirs.get(wd)
+            if directory is None:
+                continue
+            path = directory / os.fsdecode(name) if name else directory
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                try:
+                    self.add_tree(path)
+                except OSError:
+                    pass  # removed again before it could be watched
+                changed.update(p for p in path.rglob("*") if p.is_file())
+            if mask & IN_DELETE_SELF:
+                del self.dirs[wd]
+            changed.add(path)
+        return changed
+    
+    def wait(self, debounce=WATCH_DEBOUNCE_SECONDS):
+        """Block until a burst of changes has settled and return every path it touched"""
+        changed = self.read(None)
+        while more := self.read(debounce):
+            changed |= more
+        return changed
+    
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Changed paths under a directory tree, from (size, mtime) snapshots taken every interval"""
+    
+    name = "polling"
+    
+    def __init__(self, root, interval=WATCH_POLL_SECONDS):
+        self.root = Path(root)
+        self.interval = interval
+        self.files = self.snapshot()
+    
+    def snapshot(self):
+        files = {}
+        pending = [self.root]
+        while pending:
+            try:
+                entries = list(os.scandir(pending.pop()))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.is_file():
+                    stat = entry.stat()
+                    files[entry.path] = (stat.st_size, stat.st_mtime_ns)
+        return files
+    
+    def poll(self):
+        files = self.snapshot()
+        changed = {Path(path) for path in files.keys() | self.files.keys() if files.get(path) != self.files.get(path)}
+        self.files = files
+        return changed
+    
+    def wait(self, debounce=WATCH_DEBOUNCE_SECONDS):
+        """Block until a burst of changes has settled and return every path it touched"""
+        changed = set()
+        while not changed:
+            time.sleep(self.interval)
+            changed = self.poll()
+        while True:
+            time.sleep(max(debounce, 0.05))
+            more = self.poll()
+            if not more:
+                return changed
+            changed |= more
+    
+    def close(self):
+        pass
+
+
+def course_watcher(root, polling=False):
+    """An inotify watcher for root, or a polling one where inotify is unavailable"""
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError) as e:
+            print(f"  ⚠️ inotify unavailable ({e}); polling every {WATCH_POLL_SECONDS:.0f}s instead")
+    return PollingWatcher(root)
+
+
+class TaskGraph:
+    """Named build tasks with dependencies, each started as soon as its dependencies finish
+
+    Tasks run on a thread pool; CPU-heavy ones hand their work to the PDF
+    process pool. Dependencies must be added before the tasks that need them,
+    so the graph cannot have cycles. A failing task only skips the tasks that
+    depend on it: everything else still runs, and every outcome ends up in
+    results ({"status": "ok" | "failed" | "skipped", "error"} plus the task's
+    usage_since() figures). A task may return a list of per-file records
+    ({"path", **usage}) for work it handed to the pool; their CPU time and
+    I/O count towards the task (pool_cpu is the pool's share). The task named
+    profile_task runs under cProfile.
+    """
+
+    def __init__(self, profile_task=None):
+        self.tasks = {}  # name -> (fn, dependency names, step)
+        self.results = {}
+        self.seconds = 0.0
+        self.profile_task = profile_task
+        self.profiler = None
+    
+    def add(self, name, fn, deps=(), step=None):
+        """Add a task and return its name; step groups tasks in reports (defaults to the name)"""
+        if name in self.tasks:
+            raise ValueError(f"Duplicate task {name!r}")
+        deps = tuple(dict.fromkeys(deps))
+        unknown = [dep for dep in deps if dep not in self.tasks]
+        if unknown:
+            raise ValueError(f"Task {name!r} depends on unknown task(s): {', '.join(unknown)}")
+        self.tasks[name] = (fn, deps, step or name)
+        return name
+    
+    def existing(self, names):
+        """The given names that are tasks of this graph, for dependencies that may be absent"""
+        return [name for name in names if name in self.tasks]
+    
+    def dependents_of(self, names):
+        """The named tasks plus every task that depends on them, directly or not"""
+        found = set(self.existing(names))
+        for name, (_, deps, _) in self.tasks.items():  # insertion order is a topological order
+            if any(dep in found for dep in deps):
+                found.add(name)
+        return found
+    
+    def subgraph(self, names):
+        """A graph of just the named tasks; dependencies on tasks left out count as done"""
+        graph = TaskGraph(profile_task=self.profile_task)
+        for name, (fn, deps, step) in self.tasks.items():
+            if name in names:
+                graph.add(name, fn, [dep for dep in deps if dep in names], step)
+        return graph
+    
+    def run_task(self, name):
+        usage = usage_start()
+        profiler = cProfile.Profile() if name == self.profile_task else None
+        try:
+            if profiler is not None:
+                files = profiler.runcall(self.tasks[name][0])
+                self.profiler = profiler
+            else:
+                files = self.tasks[name][0]()
+        except Exception as e:
+            return {"status": "failed", "error": f"{type(e).__name__}: {e}", **usage_since(usage),
+                    "pool_cpu": 0.0, "files": []}
+        result = {"status": "ok", "error": None, **usage_since(usage), "pool_cpu": 0.0,
+                  "files": files if isinstance(files, list) else []}
+        for record in result["files"]:
+            result["cpu"] += record["cpu"]
+            result["pool_cpu"] += record["cpu"]
+            result["read_bytes"] += record["read_bytes"]
+            result["written_bytes"] += record["written_bytes"]
+            result["peak_rss"] = max(result["peak_rss"], record["peak_rss"])
+        return result
+    
+    def run(self, max_workers=None):
+        """Run every task (tasks without dependencies start in the order they were added)
+
+        Returns the names of the tasks that failed or were skipped.
+        """
+        started = time.perf_counter()
+        dependents = {name: [] for name in self.tasks}
+        waiting = {}
+        for name, (_, deps, _) in self.tasks.items():
+            waiting[name] = len(deps)
+            for dep in deps:
+                dependents[dep].append(name)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            running = {pool.submit(self.run_task, name): name for name, count in waiting.items() if count == 0}
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    result = self.results[name] = future.result()
+                    if result["status"] == "failed":
+                        print(f"  ❌ {name}: {result['error']}")
+                        self.skip_dependents(name, dependents)
+                    for dependent in dependents[name]:
+                        waiting[dependent] -= 1
+                        if waiting[dependent] == 0 and dependent not in self.results:
+                            running[pool.submit(self.run_task, dependent)] = dependent
+        self.seconds = time.perf_counter() - started
+        return self.failures()
+    
+    def skip_dependents(self, name, dependents):
+        """Mark everything downstream of a failed task as skipped"""
+        pending = list(dependents[name])
+        while pending:
+            task = pending.pop()
+            if task not in self.results:
+                self.results[task] = {"status": "skipped", "error": f"{name} failed", "seconds": 0.0, "cpu": 0.0,
+                                      "pool_cpu": 0.0, "read_bytes": 0, "written_bytes": 0, "peak_rss": 0, "files": []}
+                pending.extend(dependents[task])
+    
+    def failures(self):
+        return [name for name in self.tasks if self.results.get(name, {}).get("status") not in (None, "ok")]
+    
+    def print_summary(self):
+        counts = {"ok": 0, "failed": 0, "skipped": 0}
+        for result in self.results.values():
+            counts[result["status"]] += 1
+        print(f"⏱️ {len(self.tasks)} task(s) in {self.seconds:.1f}s: {counts['ok']} ok, "
+              f"{counts['failed']} failed, {counts['skipped']} skipped")
+        for name in self.failures():
+            result = self.results[name]
+            print(f"   {result['status']}: {name} ({result['error']})")
+
+
+PROFILE_REPORT_VERSION = 1
+PROFILE_TOP_FUNCTIONS = 25
+
+
+def profile_top(profiler, limit=PROFILE_TOP_FUNCTIONS):
+    """The functions a cProfile run spent the most cumulative time in"""
+    stats = pstats.Stats(profiler).stats
+    rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+    return [{"function": f"{file}:{line}({func})", "calls": calls, "tottime": round(tottime, 6),
+             "cumtime": round(cumtime, 6)}
+            for (file, line, func), (_, calls, tottime, cumtime, _) in rows]
+
+
+def profile_report(slug, graphs):
+    """JSON-ready report of the tasks of one course build: per task, per step and per file
+
+    seconds are wall time (tasks overlap, so step totals can exceed the build's
+    own seconds), cpu includes the worker processes' time spent on the task,
+    read/written bytes count every read()/write() call and peak_rss is the
+    high-water mark of the process (or worker) running the task.
+    """
+    tasks = {}
+    steps = {}
+    files = []
+    for graph in graphs:
+        for name, (_, deps, step) in graph.tasks.items():
+            result = graph.results.get(name)
+            if result is None:
+                continue
+            entry = {key: value for key, value in result.items() if key != "files"}
+            entry.update(step=step, deps=list(deps))
+            tasks[name] = entry
+            totals = steps.setdefault(step, {"tasks": 0, "seconds": 0.0, "cpu": 0.0, "read_bytes": 0,
+                                             "written_bytes": 0, "peak_rss": 0})
+            totals["tasks"] += 1
+            for key in ("seconds", "cpu", "read_bytes", "written_bytes"):
+                totals[key] += result[key]
+            totals["peak_rss"] = max(totals["peak_rss"], result["peak_rss"])
+            files.extend(dict(record, task=name) for record in result["files"])
+    
+    def rounded(entry):
+        return {key: round(value, 6) if isinstance(value, float) else value for key, value in entry.items()}
+    
+    return {
+        "version": PROFILE_REPORT_VERSION,
+        "course": slug,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "seconds": round(sum(graph.seconds for graph in graphs), 6),
+        "peak_rss": peak_rss(),
+        "worker_peak_rss": peak_rss(resource.RUSAGE_CHILDREN),
+        "steps": {step: rounded(totals) for step, totals in sorted(steps.items(), key=lambda s: -s[1]["seconds"])},
+        "tasks": {name: rounded(entry) for name, entry in tasks.items()},
+        "files": [rounded(record) for record in sorted(files, key=lambda r: -r["seconds"])],
+    }
+
+
+def hottest_task(report_path):
+    """Task of an earlier profile report that spent the most CPU time in the creator's own process
+
+    (Work handed to pool processes is invisible to cProfile, so pool_cpu does not count.)
+    """
+    try:
+        with open(report_path, 'r', encoding='utf-8') as f:
+            tasks = json.load(f)["tasks"]
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        return None
+    return max(tasks, key=lambda name: tasks[name]["cpu"] - tasks[name].get("pool_cpu", 0.0), default=None)
+
+
+COURSE_INDEX_VERSION = 1
+TEXTBOOK_FOLDER_KEYS = {"textbook", "tetxbook", "ebook"}  # folder names reduced by folder_key()
+QUIZ_FOLDER_KEYS = {"quiz", "quizs", "quizes", "quizzes"}
+IMAGE_FOLDER_RE = re.compile(r'(?:.*\s)?img', re.IGNORECASE)  # "Img", "img", "GROW Img"
+FINAL_EXAM_RE = re.compile(r'final\s*exam|^last$', re.IGNORECASE)
+CHAPTER_FILE_RE = re.compile(r'\bchapter\s*(\d+)', re.IGNORECASE)
+WEEK_FILE_RE = re.compile(r'\bweek\s*(\d+)', re.IGNORECASE)
+
+
+def folder_key(name):
+    """A folder name reduced to lowercase letters and digits ("Text Book " and "Text-Book" -> "textbook")"""
+    return re.sub(r'[^a-z0-9]+', '', name.lower())
+
+
+def source_kind(name):
+    """"pdf", "text" (extracted), "audio" or "image" for a course source file name, else None"""
+    lower = name.lower()
+    if lower.endswith(EXTRACTED_SUFFIX):
+        return "text"
+    suffix = os.path.splitext(lower)[1]
+    if suffix == ".pdf":
+        return "pdf"
+    if suffix == ".mp3":
+        return "audio"
+    if suffix in IMAGE_SUFFIXES:
+        return "image"
+    return None
+
+
+def source_stem(name, kind):
+    return name[:-len(EXTRACTED_SUFFIX)] if kind == "text" else os.path.splitext(name)[0]
+
+
+class CourseIndex:
+    """Every PDF, extracted text, MP3 and image of a course folder, from one os.scandir walk
+
+    Chapters come from numbered folders in the textbook folder (Text-Book/3/)
+    or, in flat layouts, from "Chapter 3" in a file name; quizzes likewise
+    from Quiz/3/ or "Week 3". Each maps a number to its first "pdf", "text"
+    and "audio" path. Folder names are matched loosely (Quiz, Quizs, "Quiz ",
+    Text Book, Tetx-Book, E-Book). dirs keeps the mtime of every folder
+    scanned, so load() reuses a cached index until a folder gains, loses or
+    renames an entry.
+    """
+    
+    def __init__(self, root):
+        self.root = str(root)
+        self.dirs = {}  # folder -> st_mtime_ns when it was scanned
+        self.textbook_dir = None
+        self.textbook_pdfs = []  # PDFs directly in the textbook folder
+        self.chapter_dirs = {}  # from Text-Book/<n>/ folders
+        self.chapter_files = {}  # from "Chapter <n>" file names
+        self.quiz_dir = None
+        self.quizzes = {}
+        self.final_exam = {}
+        self.image_dirs = []
+        self.images = []
+    
+    @classmethod
+    def load(cls, root, cache_dir=CACHE_DIR / "index"):
+        """The index of a course folder, from the cache while none of its folders changed"""
+        key = hashlib.sha256(os.path.abspath(root).encode('utf-8')).hexdigest()[:16]
+        cache_path = Path(cache_dir) / f"{key}.json"
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if (data["version"] == COURSE_INDEX_VERSION and data["root"] == str(root)
+                    and all(os.stat(path).st_mtime_ns == mtime for path, mtime in data["dirs"].items())):
+                return cls.from_json(data)
+        except (FileNotFoundError, NotADirectoryError, json.JSONDecodeError, KeyError):
+            pass
+        index = cls(root)
+        index.scan()
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        write_if_changed(cache_path, json.dumps(index.to_json(), indent=2).encode('utf-8'))
+        return index
+    
+    @classmethod
+    def from_json(cls, data):
+        index = cls(data["root"])
+        for name in ("dirs", "textbook_dir", "textbook_pdfs", "quiz_dir", "final_exam", "image_dirs", "images"):
+            setattr(index, name, data[name])
+        for name in ("chapter_dirs", "chapter_files", "quizzes"):
+            setattr(index, name, {int(n): item for n, item in data[name].items()})
+        return index
+    
+    def to_json(self):
+        return {"version": COURSE_INDEX_VERSION, **vars(self)}
+    
+    def listdir(self, path):
+        """Sorted (name, path, is_dir) entries of a folder, remembering its mtime"""
+        self.dirs[path] = os.stat(path).st_mtime_ns  # before reading, so a change during the scan is caught
+        with os.scandir(path) as it:
+            entries = [(entry.name, entry.path, entry.is_dir()) for entry in it if not entry.name.startswith(".")]
+        return sorted(entries)
+    
+    def scan(self):
+        if not os.path.isdir(self.root):
+            return
+        for name, path, is_dir in self.listdir(self.root):
+            if not is_dir:
+                continue
+            key = folder_key(name)
+            if key in TEXTBOOK_FOLDER_KEYS and self.textbook_dir is None:
+                self.textbook_dir = path
+                self.scan_items(path, self.chapter_dirs, self.chapter_files, CHAPTER_FILE_RE)
+            elif key in QUIZ_FOLDER_KEYS and self.quiz_dir is None:
+                self.quiz_dir = path
+                self.scan_items(path, self.quizzes, self.quizzes, WEEK_FILE_RE, final=True)
+            elif IMAGE_FOLDER_RE.fullmatch(name.strip()):
+                self.image_dirs.append(path)
+                self.images.extend(image for name, image, is_dir in self.listdir(path)
+                                   if not is_dir and source_kind(name) == "image")
+    
+    def scan_items(self, path, numbered_dirs, numbered_files, number_re, final=False):
+        """Sort a textbook or quiz folder's numbered folders and files into items"""
+        for name, entry_path, is_dir in self.listdir(path):
+            label = name.strip()
+            if is_dir:
+                if label.isdigit():
+                    self.add_files(numbered_dirs.setdefault(int(label), {}), self.listdir(entry_path))
+                elif final and FINAL_EXAM_RE.search(label):
+                    self.add_files(self.final_exam, self.listdir(entry_path))
+                continue
+            kind = source_kind(name)
+            if kind is None:
+                continue
+            stem = source_stem(name, kind)
+            match = number_re.search(stem)
+            if final and FINAL_EXAM_RE.search(stem):
+                self.add_files(self.final_exam, [(name, entry_path, False)])
+            elif match:
+                self.add_files(numbered_files.setdefault(int(match.group(1)), {}), [(name, entry_path, False)])
+            if kind == "pdf" and number_re is CHAPTER_FILE_RE:
+                self.textbook_pdfs.append(entry_path)
+    
+    @staticmethod
+    def add_files(item, entries):
+        """Record the first pdf, text and audio file among entries that item doesn't have yet"""
+        for name, path, is_dir in entries:
+            kind = None if is_dir else source_kind(name)
+            if kind in ("pdf", "text", "audio") and kind not in item:
+                item[kind] = path
+    
+    def textbook_pdf(self):
+        """The whole-course textbook PDF in the textbook folder, if there is one"""
+        candidates = [pdf for pdf in self.textbook_pdfs if TEXTBOOK_NAME_RE.search(Path(pdf).stem)]
+        if candidates:
+            return Path(candidates[0])
+        if len(self.textbook_pdfs) == 1:
+            return Path(self.textbook_pdfs[0])
+        return None
+    
+    def chapter_layout(self):
+        """Where chapters come from: "chapter folders", "chapter files", "split textbook" or None
+
+        Per-chapter sources win over splitting a textbook: PDFs in
+        Text-Book/<n>/ folders first, then flat "Chapter <n>" PDFs or
+        extracted texts. Text-only chapter folders next to a textbook are
+        what an earlier split wrote, so the textbook is split again.
+        """
+        if any("pdf" in item for item in self.chapter_dirs.values()):
+            return "chapter folders"
+        if any("pdf" in item or "text" in item for item in self.chapter_files.values()):
+            return "chapter files"
+        if self.textbook_pdf() is not None:
+            return "split textbook"
+        if self.chapter_dirs:
+            return "chapter folders"
+        if self.chapter_files:
+            return "chapter files"
+        return None
+    
+    def single_textbook(self):
+        """The textbook PDF to split when there are no per-chapter sources"""
+        return self.textbook_pdf() if self.chapter_layout() == "split textbook" else None
+    
+    def chapters(self, layout=None):
+        """Chapter items of a layout (chapter_layout() by default)
+
+        Flat chapter files still take their audio from Text-Book/<n>/.
+        """
+        layout = layout or self.chapter_layout()
+        if layout == "chapter files":
+            items = {n: {"audio": item["audio"]} for n, item in self.chapter_dirs.items() if "audio" in item}
+            for n, item in self.chapter_files.items():
+                items[n] = {**items.get(n, {}), **item}
+            return items
+        return self.chapter_dirs
+    
+    def chapter_count(self):
+        """Highest chapter number found in folder or file names (0 when none)"""
+        return max([*self.chapter_dirs, *self.chapter_files], default=0)
+    
+    def quiz_count(self):
+        return max(self.quizzes, default=0)
+    
+    @staticmethod
+    def sources(item):
+        """An item's pdf, text and audio as Paths; text falls back to the PDF's *_extracted.txt once written"""
+        sources = {kind: Path(item[kind]) if kind in item else None for kind in ("pdf", "text", "audio")}
+        if sources["text"] is None and sources["pdf"] is not None:
+            text = extracted_text_path(sources["pdf"])
+            sources["text"] = text if text.exists() else None
+        return sources
+
+
 class CourseCreator:
-    def __init__(self):
+    def __init__(self, use_cache=True, cache_max_bytes=EXTRACTION_CACHE_MAX_BYTES, force=False,
+                 content_mode="inline", profile_path=None, cprofile=None, budgets_path=None, budget_mode="warn"):
         self.course_name = ""
         self.course_id = 0
         self.num_chapters = 0
@@ -22,8 +2522,27 @@ class CourseCreator:
         self.course_folder = ""
         self.url_slug = ""  # e.g., "deacon-course"
         self.component_name = ""  # e.g., "DeaconCourse"
+        self.max_workers = os.cpu_count() or 1
+        self.extraction_cache = ExtractionCache(max_bytes=cache_max_bytes) if use_cache else None
+        self.force = force
+        self.build_manifest = None
+        self.pdf_pool = None  # shared ProcessPoolExecutor when building several courses
+        self.textbook = None  # single-file textbook PDF to split into chapters
+        self.generate_pages = True  # False: pages are curated by hand, only data files are built
+        self.index = None  # CourseIndex of the course folder, see course_index()
+        self.content_mode = content_mode  # "inline" JSX or "data" files fetched on demand
+        self.audio_urls = {}  # chapter number -> published audio URL
+        self.audio_meta = {}  # chapter number -> scan_mp3 result
+        self.cover_image = None  # responsive image data of the course cover
+        self.image_variants = {}  # original URL -> responsive image data, for the image registry
+        self.profile_path = profile_path  # JSON report of every task's time, CPU, memory and I/O
+        self.cprofile = cprofile  # task to run under cProfile ("hottest": the previous report's hottest)
+        self.graphs = []  # task graphs run by this build, for the profile report
+        self.budgets_path = budgets_path
+        self.bundle_budgets = load_bundle_budgets(budgets_path)  # kind of file -> metric -> limit
+        self.budget_mode = budget_mode  # "warn" or "fail" when a generated file is over budget
         
-    def run(self):
+    def run(self, watch=False, polling=False):
         """Main entry point"""
         print("🚀 SFGM Boston - Automatic Course Creator\n")
         print("=" * 60)
@@ -37,10 +2556,19 @@ class CourseCreator:
             return
             
         # Create course
+        if watch:
+            print("\n🎯 Creating course, then watching for changes...\n")
+            self.watch(polling=polling)
+            return
+        
         print("\n🎯 Creating course...\n")
-        self.create_course()
+        failed = self.create_course()
         
-        print("\n✅ Course created successfully!")
+        if failed:
+            print(f"\n⚠️ Course created with {len(failed)} failed or skipped task(s); "
+                  f"fix them and re-run (finished outputs are kept)")
+        else:
+            print("\n✅ Course created successfully!")
         print(f"\n📝 Next steps:")
         print(f"1. Run: DATABASE_URL='your-db' npx tsx add-{self.url_slug}-quizzes.ts")
         print(f"2. Restart server: pkill -f 'npm run dev' && npm run dev")
@@ -51,17 +2579,42 @@ class CourseCreator:
         """Get course information from user"""
         self.course_name = input("📚 Enter course name (e.g., 'Deacon Course'): ").strip()
         self.course_id = int(input("🔢 Enter course ID number: ").strip())
-        self.num_chapters = int(input("📖 Enter number of chapters: ").strip())
-        self.num_quizzes = int(input("📝 Enter number of weekly quizzes: ").strip())
+        self.course_folder = input("📁 Enter course folder path (relative to project): ").strip()
+        index = self.course_index()
+        chapters = input(f"📖 Enter number of chapters [{index.chapter_count()}]: ").strip()
+        self.num_chapters = int(chapters) if chapters else index.chapter_count()
+        quizzes = input(f"📝 Enter number of weekly quizzes [{index.quiz_count()}]: ").strip()
+        self.num_quizzes = int(quizzes) if quizzes else index.quiz_count()
         self.has_videos = input("🎥 Does this course have videos? (y/n): ").lower() == 'y'
         self.has_bible_readings = input("📕 Does this course have Bible readings? (y/n): ").lower() == 'y'
-        self.course_folder = input("📁 Enter course folder path (relative to project): ").strip()
-        
+        self.derive_names()
+    
+    def derive_names(self, url_slug=None, component_name=None):
+        """Fill in the URL slug and component name from the course name"""
         # Generate URL slug (e.g., "Deacon Course" -> "deacon-course")
-        self.url_slug = re.sub(r'[^a-z0-9]+', '-', self.course_name.lower()).strip('-')
+        self.url_slug = url_slug or re.sub(r'[^a-z0-9]+', '-', self.course_name.lower()).strip('-')
         
         # Generate component name (e.g., "Deacon Course" -> "DeaconCourse")
-        self.component_name = ''.join(word.capitalize() for word in self.course_name.split())
+        self.component_name = component_name or ''.join(
+            re.sub(r'[^A-Za-z0-9]', '', word.capitalize()) for word in self.course_name.split())
+    
+    def load_course_info(self, entry):
+        """Set course information from a course manifest entry instead of prompting"""
+        self.course_name = entry["name"]
+        self.course_id = int(entry["id"])
+        self.course_folder = entry["folder"]
+        self.num_chapters = int(entry["chapters"]) if "chapters" in entry else self.course_index().chapter_count()
+        self.num_quizzes = int(entry["quizzes"]) if "quizzes" in entry else self.course_index().quiz_count()
+        if not self.num_chapters:
+            raise ValueError(f"{self.course_folder}: no chapters found, set \"chapters\"")
+        self.has_videos = bool(entry.get("videos", False))
+        self.has_bible_readings = bool(entry.get("bible_readings", False))
+        self.textbook = entry.get("textbook")
+        self.generate_pages = bool(entry.get("generate", True))
+        self.content_mode = entry.get("content_mode", self.content_mode)
+        if "budgets" in entry:
+            self.bundle_budgets = load_bundle_budgets(self.budgets_path, entry["budgets"])
+        self.derive_names(entry.get("slug"), entry.get("component"))
         
     def confirm_details(self):
         """Show details and confirm"""
@@ -83,306 +2636,597 @@ class CourseCreator:
         return response == 'y'
         
     def create_course(self):
-        """Create the complete course"""
-        # Step 1: Extract all PDFs
-        print("📄 Step 1: Extracting PDFs...")
-        self.extract_pdfs()
-        
-        # Step 2: Copy audio files
-        print("🎵 Step 2: Copying audio files...")
-        self.copy_audio_files()
-        
-        # Step 3: Create chapter pages
-        print("📖 Step 3: Creating chapter pages...")
-        self.create_chapter_pages()
-        
-        # Step 4: Create complete e-book
-        print("📚 Step 4: Creating complete e-book...")
-        self.create_complete_ebook()
-        
-        # Step 5: Generate quiz scripts
-        print("📝 Step 5: Generating quiz database script...")
-        self.create_quiz_script()
+        """Create the complete course as one task graph; returns the tasks that failed or were skipped"""
+        self.start_build()
+        graph = self.task_graph()
+        self.add_build_tasks(graph)
+        self.add_shared_tasks(graph)
+        print(f"🧩 Running {len(graph.tasks)} build tasks...")
+        with self.worker_pool():
+            failed = graph.run()
+        self.finish_build(graph)
+        return failed
+    
+    def watch(self, polling=False, debounce=WATCH_DEBOUNCE_SECONDS):
+        """Build the course, then keep rebuilding just what each change to the course folder affects
+
+        A changed chapter PDF re-extracts that PDF and re-renders what reads its
+        text, a swapped MP3 republishes that file, a fixed quiz PDF regenerates
+        the quiz script, and so on; new or deleted source files trigger a full
+        (still incremental) build. One worker pool serves the whole session.
+        Runs until interrupted.
+        """
+        with self.worker_pool():
+            self.create_course()
+            watcher = course_watcher(self.course_folder, polling=polling)
+            print(f"\n👀 Watching {self.course_folder} ({watcher.name}); press Ctrl+C to stop")
+            known = self.watch_snapshot()
+            try:
+                while True:
+                    changed = {path for path in watcher.wait(debounce) if self.watch_relevant(path, known)}
+                    if changed:
+                        self.rebuild_changed(changed)
+                        known = self.watch_snapshot()
+            except KeyboardInterrupt:
+                print("\n👋 Stopped watching")
+            finally:
+                watcher.close()
+    
+    def watch_snapshot(self):
+        """mtime of every source file in the course folder, to tell our own writes from edits"""
+        known = {}
+        for dirpath, _, filenames in os.walk(self.course_folder):
+            for filename in filenames:
+                path = os.path.abspath(os.path.join(dirpath, filename))
+                try:
+                    known[path] = os.stat(path).st_mtime_ns
+                except FileNotFoundError:
+                    continue
+        return known
+    
+    def watch_relevant(self, path, known):
+        """Whether a changed path is a source file that was really edited, added or removed"""
+        path = Path(path)
+        if path.suffix.lower() not in WATCH_SUFFIXES or path.name.startswith("."):
+            return False
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return os.path.abspath(path) in known
+        return known.get(os.path.abspath(path)) != mtime
+    
+    def watch_targets(self, graph):
+        """Absolute source path -> tasks to re-run (with everything depending on them) when it changes"""
+        targets = {}
         
-        # Step 6: Update App.tsx
-        print("🔗 Step 6: Updating routes...")
-        self.update_app_routes()
+        def add(path, tasks):
+            if path is not None and graph.existing(tasks):
+                targets.setdefault(os.path.abspath(path), []).extend(graph.existing(tasks))
         
-        # Step 7: Update course-content-viewer.tsx
-        print("📋 Step 7: Updating course page...")
-        self.update_course_viewer()
+        for label, pdf in self.collect_pdfs():
+            add(pdf, [f"extract {label}"])
+        textbook = self.find_single_textbook()
+        if textbook is not None:
+            add(textbook, ["split textbook", "complete pdf"])
+        for i in range(1, self.num_chapters + 1):
+            sources = self.chapter_sources(i)
+            add(sources["pdf"], ["complete pdf"])
+            add(sources["text"], [f"page ch{i}", "ebook", "search index"])
+            add(sources["audio"], [f"audio ch{i}"])
+        for source in self.quiz_sources():
+            add(source, ["quiz script"])
+        for image in self.course_index().images:
+            add(image, ["images"])
+        return targets
+    
+    def rebuild_changed(self, changed):
+        """Run the tasks that depend on the changed source files (everything, for unknown files)"""
+        self.index = None  # files were added, removed or renamed
+        graph = TaskGraph()
+        self.add_build_tasks(graph)
+        self.add_shared_tasks(graph)
+        targets = self.watch_targets(graph)
+        roots = set()
+        full = False
+        for path in changed:
+            tasks = targets.get(os.path.abspath(path))
+            if tasks and Path(path).exists():
+                roots.update(tasks)
+            else:
+                full = True
+        names = set(graph.tasks) if full else graph.dependents_of(roots)
+        shown = ", ".join(sorted(Path(path).name for path in changed)[:3]) + (", ..." if len(changed) > 3 else "")
+        print(f"\n🔄 {shown}: {'full rebuild' if full else f'{len(names)} task(s)'}")
+        if full:
+            self.audio_urls = {}
+            self.audio_meta = {}
+        self.build_manifest.rebuilt = []
+        self.build_manifest.skipped = []
+        subgraph = graph.subgraph(names)
+        self.graphs = [subgraph]
+        subgraph.run()
+        self.finish_build(subgraph)
+    
+    def start_build(self):
+        self.build_manifest = BuildManifest(self.url_slug)
+        self.index = None
+        if self.force:
+            self.build_manifest.outputs = {}
+        self.audio_urls = {}
+        self.audio_meta = {}
+        self.graphs = []
+    
+    def task_graph(self):
+        """A new TaskGraph for this build, profiling the task picked with cprofile"""
+        profile_task = self.cprofile
+        if profile_task == "hottest":
+            profile_task = hottest_task(self.profile_path) if self.profile_path else None
+            if profile_task is None:
+                print("  ⚠️ No earlier profile report to pick the hottest task from; run once with --profile first")
+            self.cprofile = profile_task
+        graph = TaskGraph(profile_task=profile_task)
+        self.graphs.append(graph)
+        return graph
+    
+    @contextmanager
+    def worker_pool(self):
+        """The shared PDF process pool, or one owned by this build while the block runs"""
+        if self.pdf_pool is not None:
+            yield self.pdf_pool
+            return
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            self.pdf_pool = pool
+            try:
+                yield pool
+            finally:
+                self.pdf_pool = None
+    
+    def chapter_text_tasks(self, graph, chapter_num):
+        """Tasks that write a chapter's extracted text"""
+        return graph.existing([f"extract Chapter {chapter_num}", "split textbook"])
+    
+    def add_build_tasks(self, graph):
+        """Tasks that only touch this course's own files (safe to run per course in parallel)
+
+        Every PDF is extracted by its own task and every chapter page is
+        rendered as soon as that chapter's text and audio (and the course
+        cover) are ready, while other chapters are still being extracted.
+        """
+        layout = self.chapter_layout()
+        textbook = self.find_single_textbook()
+        if textbook is not None:
+            print(f"  📂 Chapters: split from {textbook.name}")
+        else:
+            unsplit = self.course_index().textbook_pdf()
+            print(f"  📂 Chapters: {layout or 'none found'}"
+                  + (f" ({unsplit.name} is not split)" if unsplit is not None and layout else ""))
+        extracts = [graph.add(f"extract {label}", lambda label=label, pdf=pdf: self.extract_pdf(label, pdf),
+                              step="extract")
+                    for label, pdf in self.collect_pdfs()]
+        if textbook is not None:
+            extracts.append(graph.add("split textbook", lambda: self.split_single_textbook(textbook)))
+        if not extracts:
+            print("  ⚠️ No PDFs found to extract")
+        elif self.extraction_cache is not None:
+            graph.add("evict extraction cache", self.extraction_cache.evict, extracts)
         
-        # Step 8: Update server routes
-        print("🛣️ Step 8: Updating server routes...")
-        self.update_server_routes()
+        audio = []
+        for i in range(1, self.num_chapters + 1):
+            if self.chapter_sources(i)["audio"] is not None:
+                audio.append(graph.add(f"audio ch{i}", lambda i=i: self.publish_chapter_audio(i), step="audio"))
+        graph.add("audio manifest", self.write_audio_manifest, audio)
+        images = graph.add("images", self.optimize_course_images)
         
-        # Step 9: Update textbook catalog
-        print("📚 Step 9: Updating textbook catalog...")
-        self.update_textbook_catalog()
+        pages = []
+        if self.generate_pages:
+            for i in range(1, self.num_chapters + 1):
+                deps = self.chapter_text_tasks(graph, i) + graph.existing([f"audio ch{i}"]) + [images]
+                pages.append(graph.add(f"page ch{i}", lambda i=i: self.create_single_chapter_page(i), deps,
+                                       step="page"))
+            text = [task for i in range(1, self.num_chapters + 1) for task in self.chapter_text_tasks(graph, i)]
+            pages.append(graph.add("ebook", self.create_complete_ebook, text + audio + [images]))
+            pages.append(graph.add("complete pdf", self.create_complete_pdf, step="pdf"))
+        else:
+            print("  📝 Pages are curated by hand (\"generate\": false): building data files only")
+        prefetch = graph.add("prefetch manifest", self.write_prefetch_manifest, audio + pages)
         
+        quizzes = [task for task in extracts if task.startswith(("extract Quiz", "extract Final Exam"))]
+        graph.add("quiz script", self.create_quiz_script, quizzes)
+        outputs = pages + [prefetch, "audio manifest", images]
+        graph.add("precompress", self.precompress_outputs, outputs)
+        graph.add("bundle report", self.write_bundle_report, outputs)
+    
+    def add_shared_tasks(self, graph):
+        """Tasks that edit files shared by every course (one course at a time)
+
+        Added after add_build_tasks() they wait for the outputs they describe;
+        on their own (update_shared_files) they run in order.
+        """
+        pages = graph.existing([f"page ch{i}" for i in range(1, self.num_chapters + 1)] + ["ebook"])
+        text = [task for i in range(1, self.num_chapters + 1) for task in self.chapter_text_tasks(graph, i)]
+        if self.generate_pages:
+            graph.add("routes", self.update_app_routes, pages)
+            graph.add("course page", self.update_course_viewer)
+        graph.add("server routes", self.update_server_routes, graph.existing(["quiz script"]))
+        if self.generate_pages:
+            graph.add("textbook catalog", self.update_textbook_catalog, graph.existing(["ebook"]))
+        graph.add("image registry", self.update_image_registry, graph.existing(["images"]))
+        graph.add("search index", self.update_search, list(dict.fromkeys(text)))
+    
+    def build_course_outputs(self):
+        """Build this course's own files; raises once every task has run if any failed"""
+        self.start_build()
+        graph = self.task_graph()
+        self.add_build_tasks(graph)
+        with self.worker_pool():
+            failed = graph.run()
+        if failed:
+            graph.print_summary()
+            self.build_manifest.save()  # keep what did get built
+            raise RuntimeError(f"{len(failed)} task(s) failed or skipped: {', '.join(failed)}")
+        return graph
+    
+    def update_shared_files(self):
+        """Update the files shared by every course; returns the tasks that failed or were skipped"""
+        graph = self.task_graph()
+        self.add_shared_tasks(graph)
+        return graph.run(max_workers=1)
+    
+    def finish_build(self, graph=None):
+        """Persist the build manifest and report what changed"""
+        self.build_manifest.save()
+        print()
+        if graph is not None:
+            graph.print_summary()
+        self.build_manifest.print_summary()
+        if self.profile_path:
+            self.write_profile_report()
         print("\n🎉 All done!")
+    
+    def write_profile_report(self):
+        """Write the --profile JSON report (and the cProfile dump, when a task was profiled)"""
+        report_path = Path(self.profile_path)
+        report = profile_report(self.url_slug, self.graphs)
+        profiled = [graph for graph in self.graphs if graph.profiler is not None]
+        if profiled:
+            dump_path = report_path.with_suffix(".prof")
+            profiled[0].profiler.dump_stats(str(dump_path))
+            report["cprofile"] = {"task": profiled[0].profile_task, "path": str(dump_path),
+                                  "top": profile_top(profiled[0].profiler)}
+        elif self.cprofile:
+            print(f"  ⚠️ No task named {self.cprofile!r} ran, nothing was profiled")
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        written = write_if_changed(report_path, (json.dumps(report, indent=2) + '\n').encode('utf-8'))
+        print(f"📈 Profile report: {report_path}")
+        for step, totals in list(report["steps"].items())[:5]:
+            print(f"   {step}: {totals['seconds']:.2f}s wall, {totals['cpu']:.2f}s CPU, "
+                  f"{totals['read_bytes'] / 1e6:.1f} MB read, {totals['written_bytes'] / 1e6:.1f} MB written")
+        if profiled:
+            print(f"   cProfile of {profiled[0].profile_task!r}: {report['cprofile']['path']} "
+                  f"(python3 -m pstats {report['cprofile']['path']})")
         
-    def extract_pdfs(self):
-        """Extract all PDFs using extract-pdf.cjs"""
-        course_path = Path(self.course_folder)
-        
-        # Extract chapters
-        textbook_path = course_path / "Text-Book"
-        if textbook_path.exists():
-            for i in range(1, self.num_chapters + 1):
-                chapter_dir = textbook_path / str(i)
-                if chapter_dir.exists():
-                    pdf_files = list(chapter_dir.glob("*.pdf"))
-                    if pdf_files:
-                        pdf_file = pdf_files[0]
-                        print(f"  Extracting Chapter {i}...")
-                        os.system(f'node extract-pdf.cjs "{pdf_file}"')
-        
-        # Extract quizzes
-        quiz_path = course_path / "Quiz"
-        if quiz_path.exists():
-            for i in range(1, self.num_quizzes + 1):
-                quiz_dir = quiz_path / str(i)
-                if quiz_dir.exists():
-                    pdf_files = list(quiz_dir.glob("*.pdf"))
-                    if pdf_files:
-                        pdf_file = pdf_files[0]
-                        print(f"  Extracting Quiz {i}...")
-                        os.system(f'node extract-pdf.cjs "{pdf_file}"')
-            
-            # Final exam
-            final_dir = quiz_path / "Final Exam"
-            if final_dir.exists():
-                pdf_files = list(final_dir.glob("*.pdf"))
-                if pdf_files:
-                    print(f"  Extracting Final Exam...")
-                    os.system(f'node extract-pdf.cjs "{pdf_files[0]}"')
-    
-    def copy_audio_files(self):
-        """Copy all audio files to /public/"""
-        course_path = Path(self.course_folder)
-        textbook_path = course_path / "Text-Book"
+    def course_index(self):
+        """The CourseIndex of the course folder, scanned (or loaded from its cache) once per build"""
+        if self.index is None:
+            self.index = CourseIndex.load(self.course_folder)
+        return self.index
+    
+    def find_single_textbook(self):
+        """Return the textbook PDF to split when chapters have no Text-Book/<n>/ folders"""
+        if self.textbook:
+            return Path(self.textbook)
+        return self.course_index().single_textbook()
+    
+    def chapter_layout(self):
+        """CourseIndex.chapter_layout(), or "split textbook" when the manifest names a textbook"""
+        return "split textbook" if self.textbook else self.course_index().chapter_layout()
+    
+    def textbook_dir(self):
+        """Folder holding the Text-Book/<n>/ chapter folders"""
+        textbook = self.find_single_textbook()
+        if textbook is not None:
+            return textbook.parent
+        return Path(self.course_index().textbook_dir or Path(self.course_folder) / "Text-Book")
+    
+    def collect_pdfs(self):
+        """List (label, pdf path) for every chapter, weekly quiz and final exam PDF"""
+        index = self.course_index()
+        chapters = index.chapters(self.chapter_layout())
+        pdfs = [(f"Chapter {i}", Path(chapters[i]["pdf"])) for i in range(1, self.num_chapters + 1)
+                if "pdf" in chapters.get(i, {})]
+        pdfs.extend((f"Quiz {i}", Path(index.quizzes[i]["pdf"])) for i in range(1, self.num_quizzes + 1)
+                    if "pdf" in index.quizzes.get(i, {}))
+        if "pdf" in index.final_exam:
+            pdfs.append(("Final Exam", Path(index.final_exam["pdf"])))
+        return pdfs
+    
+    def extract_pdf(self, label, pdf):
+        """Extract one PDF on the worker pool (or restore it from the cache) next to the PDF"""
+        cache = self.extraction_cache
+        pdf_hash = None
+        if cache is not None:
+            pdf_hash = file_sha256(pdf)
+            if cache.materialize(pdf_hash, pdf) is not None:
+                print(f"  ♻️ {label}: cached")
+                return []
+        result = self.pdf_pool.submit(extract_pdf_job, str(pdf)).result()
+        if not result["ok"]:
+            raise RuntimeError(result["error"])
+        print(f"  ✅ {label}: {result['chars']:,} chars in {result['seconds']:.1f}s")
+        if cache is not None:
+            cache.put(pdf_hash, result["output"])
+        return [{"path": str(pdf), **result["usage"]}]
+    
+    def split_single_textbook(self, textbook):
+        """Split a single-file textbook into Text-Book/<n>/ chapter text"""
+        print(f"  Splitting single-file textbook {textbook.name} into chapters...")
+        chapters = split_textbook(textbook, textbook.parent, pool=self.pdf_pool,
+                                  max_workers=self.max_workers, cache=self.extraction_cache)
+        if not chapters:
+            raise RuntimeError(f"No chapter headings found in {textbook.name}")
+        for chapter in chapters:
+            print(f"  ✅ Chapter {chapter['number']}: {chapter['title']} "
+                  f"(pages {chapter['start'] + 1}-{chapter['end']})")
+        if len(chapters) != self.num_chapters:
+            print(f"  ⚠️ Found {len(chapters)} chapters in {textbook.name}, expected {self.num_chapters}")
+    
+    def audio_dir(self):
+        return Path("public") / "audio" / self.url_slug
+    
+    def publish_chapter_audio(self, chapter_num):
+        """Publish a chapter's audio under a content-hashed name in public/audio/<slug>/
+
+        Unchanged files are skipped and new ones are reflinked/hardlinked when
+        possible; the MP3 is scanned for the player's seek index.
+        """
+        src = self.chapter_sources(chapter_num)["audio"]
+        digest = self.build_manifest.hash_file(src)
+        dest, method = publish_asset(src, digest, self.audio_dir(), f"ch{chapter_num}")
+        self.audio_urls[chapter_num] = "/" + dest.relative_to("public").as_posix()
+        meta = cached_scan_mp3(src, digest)
+        if meta:
+            self.audio_meta[chapter_num] = meta
+        else:
+            print(f"  ⚠️ {src.name}: no MPEG audio frames found, players will probe it")
+        if method:
+            print(f"  Published {src.name} -> {dest.name} ({method})")
+        else:
+            print(f"  ⏭️ {dest.name} unchanged")
+    
+    def write_audio_manifest(self):
+        """public/audio/<slug>/manifest.json mapping chapters to their audio URLs"""
+        if self.audio_urls:
+            manifest = {str(n): url for n, url in sorted(self.audio_urls.items())}
+            write_if_changed(self.audio_dir() / "manifest.json",
+                             (json.dumps(manifest, indent=2) + '\n').encode('utf-8'))
+    
+    def prefetch_url(self):
+        return f"/prefetch/{self.url_slug}.json"
+    
+    def write_prefetch_manifest(self):
+        """public/prefetch/<slug>.json: each chapter's next chapter and what players warm for it
+
+        Players fetch the next chapter's content data file and the first bytes
+        of its audio (from the first frame, audioStart) while the current
+        chapter plays, up to maxBytes.
+        """
+        chapters = {}
+        for i in range(1, self.num_chapters + 1):
+            meta = self.audio_meta.get(i)
+            audio_path = Path("public") / self.audio_urls[i].lstrip("/") if i in self.audio_urls else None
+            content_path = Path("public") / self.chapter_content_url(i).lstrip("/")
+            data_mode = self.content_mode == "data" and content_path.exists()
+            chapters[str(i)] = {
+                "url": f"/{self.url_slug}-ch{i}",
+                "next": i + 1 if i < self.num_chapters else None,
+                "audioUrl": self.audio_urls.get(i),
+                "audioBytes": audio_path.stat().st_size if audio_path else None,
+                "audioStart": meta["seekTable"][0] if meta else 0,
+                "audioEnd": meta["bytes"] if meta else None,
+                "contentUrl": self.chapter_content_url(i) if data_mode else None,
+                "contentBytes": content_path.stat().st_size if data_mode else None,
+            }
+        manifest = {"version": PREFETCH_MANIFEST_VERSION, "maxBytes": PREFETCH_MAX_BYTES, "chapters": chapters}
+        output_path = Path("public") / self.prefetch_url().lstrip("/")
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        if write_if_changed(output_path, (json.dumps(manifest, indent=2) + '\n').encode('utf-8')):
+            print(f"  ✅ {output_path}: next-chapter prefetch for {len(chapters)} chapter(s)")
+    
+    def audio_url(self, chapter_num):
+        """Published URL of a chapter's audio (legacy fixed name when it has none)"""
+        return self.audio_urls.get(chapter_num, f"/{self.url_slug}-ch{chapter_num}.mp3")
+    
+    def audio_meta_js(self, chapter_num):
+        """Compact JS object literal of a chapter's MP3 metadata, or None"""
+        meta = self.audio_meta.get(chapter_num)
+        return json.dumps(meta, separators=(',', ':')) if meta else None
+    
+    def player_props(self, chapter_num):
+        """Audio (and cover, when the course has one) props of a chapter player"""
+        props = [f'audioUrl="{self.audio_url(chapter_num)}"']
+        meta = self.audio_meta_js(chapter_num)
+        if meta:
+            props.append(f'audioMeta={{{meta}}}')
+        props.append(f'prefetchUrl="{self.prefetch_url()}" chapter={{{chapter_num}}}')
+        props.extend(self.cover_props())
+        return '\n      '.join(props)
+    
+    def cover_props(self):
+        """coverSrc/coverSrcSet props for the course cover's WebP variants"""
+        if not self.cover_image:
+            return []
+        return [f'coverSrc="{self.cover_image["src"]}"', f'coverSrcSet="{self.cover_image["srcSet"]}"',
+                f'coverAlt={jsx_attr(self.course_name + " Cover")}']
+    
+    def optimize_course_images(self):
+        """Publish WebP variants of the course cover and its Img folder images
+
+        Covers go to public/img/covers/ (and the image registry, for the catalog);
+        Img folder images go to public/img/<slug>/ with a manifest.json of their srcsets.
+        Returns {"path", **usage} records of the images converted on the pool.
+        """
+        usage = []
+        self.image_variants = optimize_cover_images(prefix=self.url_slug, pool=self.pdf_pool,
+                                                    max_workers=self.max_workers, usage=usage)
+        self.cover_image = next(iter(self.image_variants.values()), None)
         
-        if not textbook_path.exists():
+        sources = [Path(image) for image in self.course_index().images]
+        image_dir = Path("public") / "img" / self.url_slug
+        if sources:
+            published = optimize_images(sources, image_dir, pool=self.pdf_pool, max_workers=self.max_workers,
+                                        usage=usage)
+            manifest = {Path(src).name: image for src, image in sorted(published.items())}
+            write_if_changed(image_dir / "manifest.json", (json.dumps(manifest, indent=2) + '\n').encode('utf-8'))
+        else:
+            manifest = {}
+            (image_dir / "manifest.json").unlink(missing_ok=True)
+        removed = prune_image_variants(image_dir, manifest) if image_dir.is_dir() else 0
+        if removed:
+            print(f"  🧹 Removed {removed} variant(s) of images no longer in the Img folder")
+        if not self.image_variants and not sources:
+            print("  No cover or Img folder images found")
+        return usage
+    
+    def course_params(self):
+        """Course parameters that end up inside generated files"""
+        return {
+            "name": self.course_name,
+            "id": self.course_id,
+            "slug": self.url_slug,
+            "chapters": self.num_chapters,
+            "quizzes": self.num_quizzes,
+            "content_mode": self.content_mode,
+        }
+    
+    def chapter_sources(self, chapter_num):
+        """Locate the source PDF, extracted text and audio file of a chapter"""
+        sources = CourseIndex.sources(self.course_index().chapters(self.chapter_layout()).get(chapter_num, {}))
+        if sources["text"] is None and sources["pdf"] is None and self.find_single_textbook() is not None:
+            text = self.textbook_dir() / str(chapter_num) / f"Chapter {chapter_num}{EXTRACTED_SUFFIX}"
+            sources["text"] = text if text.exists() else None  # written by split_textbook during this build
+        return sources
+    
+    def chapter_inputs(self, chapter_num):
+        """Input hashes a chapter page is rendered from"""
+        sources = self.chapter_sources(chapter_num)
+        manifest = self.build_manifest
+        inputs = {
+            "course": self.course_params(),
+            "audio": manifest.hash_file(sources["audio"]),
+            "cover": self.cover_image,
+        }
+        if self.content_mode == "inline":
+            # In data mode the text lives in public/content, so edits don't touch the page
+            inputs["pdf"] = manifest.hash_file(sources["pdf"])
+            inputs["text"] = manifest.hash_file(sources["text"])
+        return inputs
+    
+    def chapter_content_url(self, chapter_num):
+        return f"/content/{self.url_slug}/ch{chapter_num}.json"
+    
+    def chapter_content_blocks(self, chapter_num, html_output=False):
+        """Formatted blocks of a chapter, read lazily from its extracted text (or a placeholder)"""
+        extracted_file = self.chapter_sources(chapter_num)["text"]
+        if extracted_file is None:
+            print(f"    ⚠️ No extracted text found for Chapter {chapter_num}")
+            yield f"<p>Chapter {chapter_num} content will be added here.</p>"
             return
-            
-        for i in range(1, self.num_chapters + 1):
-            chapter_dir = textbook_path / str(i)
-            if chapter_dir.exists():
-                audio_files = list(chapter_dir.glob("*.mp3"))
-                if audio_files:
-                    src = audio_files[0]
-                    dest = Path("public") / f"{self.url_slug}-ch{i}.mp3"
-                    print(f"  Copying {src.name} -> {dest.name}")
-                    shutil.copy(src, dest)
-    
-    def create_chapter_pages(self):
-        """Create all chapter pages with extracted content"""
-        for i in range(1, self.num_chapters + 1):
-            print(f"  Creating Chapter {i} page...")
-            self.create_single_chapter_page(i)
+        with open(extracted_file, 'r', encoding='utf-8') as f:
+            yield from format_chapter_blocks(f, html_output=html_output)
+    
+    def read_chapter_content(self, chapter_num, html_output=False):
+        """Formatted content of a chapter, or a placeholder when it hasn't been extracted"""
+        return '\n'.join(self.chapter_content_blocks(chapter_num, html_output=html_output))
+    
+    def keep_curated_page(self, output_path):
+        """True, with a warning, when output_path is a hand-made page the build must leave alone"""
+        if not is_curated_page(output_path):
+            return False
+        print(f"  ⚠️ {output_path} was not written by the generator, leaving it as is (delete it to regenerate)")
+        return True
     
     def create_single_chapter_page(self, chapter_num):
         """Create a single chapter page"""
-        # Read extracted text
-        course_path = Path(self.course_folder)
-        textbook_path = course_path / "Text-Book" / str(chapter_num)
-        extracted_files = list(textbook_path.glob("*_extracted.txt"))
+        output_path = Path("client/src/pages") / f"{self.url_slug}-ch{chapter_num}.tsx"
+        if self.keep_curated_page(output_path):
+            return
         
-        if not extracted_files:
-            print(f"    ⚠️ No extracted text found for Chapter {chapter_num}")
-            content = f"<p>Chapter {chapter_num} content will be added here.</p>"
-        else:
-            with open(extracted_files[0], 'r', encoding='utf-8') as f:
-                raw_content = f.read()
-            content = self.format_chapter_content(raw_content, chapter_num)
+        inputs = self.chapter_inputs(chapter_num)
+        self.write_chapter_data(chapter_num)  # the e-book fetches it in either content mode
+        if self.content_mode == "data":
+            self.build_manifest.emit(output_path, inputs, lambda: self.generate_data_chapter_component(chapter_num))
+            return
         
-        # Generate component
-        component = self.generate_chapter_component(chapter_num, content)
+        head, tail = self.chapter_component_parts(chapter_num)
         
-        # Write file
-        output_path = Path("client/src/pages") / f"{self.url_slug}-ch{chapter_num}.tsx"
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(component)
-    
-    def format_chapter_content(self, raw_content, chapter_num):
-        """Format raw text into beautiful HTML with color-coded sections"""
-        # This is a simplified formatter - adjust based on your content structure
-        lines = raw_content.split('\n')
-        formatted = []
+        def write(out):
+            out(head)
+            write_joined(out, self.chapter_content_blocks(chapter_num))
+            out(tail)
         
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Detect headings
-            if line.isupper() or (len(line) < 50 and line.endswith(':')):
-                formatted.append(f'<h2 className="text-2xl font-bold mb-4 mt-6">{line}</h2>')
-            # Detect scripture (starts with number or quote)
-            elif line.startswith('"') or re.match(r'^\d+:', line):
-                formatted.append(f'''<div className="bg-purple-50 border-l-4 border-purple-500 p-4 mb-4">
-                    <blockquote className="text-purple-900 italic">{line}</blockquote>
-                </div>''')
-            # Regular paragraph
-            else:
-                formatted.append(f'<p className="mb-4">{line}</p>')
+        self.build_manifest.emit_stream(output_path, inputs, write)
+    
+    def write_chapter_data(self, chapter_num):
+        """Write a chapter's HTML as a compact JSON file under public/content"""
+        output_path = Path("public") / self.chapter_content_url(chapter_num).lstrip("/")
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        sources = self.chapter_sources(chapter_num)
+        inputs = {
+            "course": self.course_params(),
+            "text": self.build_manifest.hash_file(sources["text"]),
+        }
         
-        return '\n'.join(formatted)
+        self.build_manifest.emit_stream(output_path, inputs, lambda out: write_chapter_json(
+            out, chapter_num, self.chapter_content_blocks(chapter_num, html_output=True)))
     
-    def generate_chapter_component(self, chapter_num, content):
-        """Generate complete React component for chapter"""
-        return f'''import React, {{ useRef, useState }} from "react";
-import {{ useLocation }} from "wouter";
-import {{ Button }} from "@/components/ui/button";
-import {{ Card, CardContent }} from "@/components/ui/card";
-import {{ Slider }} from "@/components/ui/slider";
-import {{ Play, Pause, SkipBack, SkipForward, ArrowLeft, Volume2 }} from "lucide-react";
+    def format_chapter_content(self, raw_content, chapter_num, html_output=False):
+        """Format raw text into beautiful HTML with color-coded sections
 
-export default function {self.component_name}Ch{chapter_num}() {{
-  const [, setLocation] = useLocation();
-  const audioRef = useRef<HTMLAudioElement>(null);
-  const [isPlaying, setIsPlaying] = useState(false);
-  const [currentTime, setCurrentTime] = useState(0);
-  const [duration, setDuration] = useState(0);
-  const [volume, setVolume] = useState(1);
-
-  const handlePlayPause = () => {{
-    const audio = audioRef.current;
-    if (!audio) return;
-    if (isPlaying) {{
-      audio.pause();
-      setIsPlaying(false);
-    }} else {{
-      audio.play();
-      setIsPlaying(true);
-    }}
-  }};
-
-  const handleSkip = (delta: number) => {{
-    const audio = audioRef.current;
-    if (!audio) return;
-    const next = Math.min(Math.max(0, audio.currentTime + delta), duration || audio.duration || 0);
-    audio.currentTime = next;
-    setCurrentTime(next);
-  }};
-
-  const formatTime = (time: number) => {{
-    const m = Math.floor(time / 60);
-    const s = Math.floor(time % 60);
-    return `${{m}}:${{String(s).padStart(2, "0")}}`;
-  }};
+        Produces JSX (className) for inlining into a page, or plain escaped
+        HTML (class) for the data files fetched by ChapterContent.
+        """
+        return '\n'.join(format_chapter_blocks(raw_content.splitlines(), html_output=html_output))
+    
+    def chapter_component_parts(self, chapter_num):
+        """The chapter page source before and after its content, so the content can be streamed between"""
+        head = f'''{GENERATED_PAGE_MARKER}
+import ChapterPlayer from "@/components/chapter-player";
 
+export default function {self.component_name}Ch{chapter_num}() {{
   return (
-    <div className="min-h-screen bg-gradient-to-br from-indigo-900 via-blue-900 to-purple-900 p-4 sm:p-6 lg:p-8">
-      <div className="max-w-4xl mx-auto">
-        {{/* Header */}}
-        <div className="mb-6 flex items-center justify-between">
-          <Button
-            onClick={{() => setLocation("/course/{self.course_id}")}}
-            variant="ghost"
-            className="text-white hover:bg-white/20"
-          >
-            <ArrowLeft className="mr-2 h-4 w-4" />
-            Back to Course
-          </Button>
-        </div>
-
-        {{/* Audio Player */}}
-        <Card className="bg-gradient-to-r from-blue-600 to-indigo-600 border-none shadow-2xl mb-8">
-          <CardContent className="p-4 sm:p-6">
-            <div className="flex items-start gap-4 mb-4">
-              <div className="flex-1 min-w-0">
-                <h3 className="text-white text-xl sm:text-2xl font-bold mb-1">
-                  <span className="text-2xl sm:text-3xl align-text-top mr-1">📚</span>
-                  <span className="align-middle">{self.course_name}</span>
-                </h3>
-                <p className="text-white/90 text-base sm:text-xl font-semibold">
-                  <span className="align-middle">Chapter {chapter_num}</span>
-                </p>
-              </div>
-            </div>
-
-            <div className="space-y-3">
-              <div className="flex items-center justify-center gap-3">
-                <Button
-                  onClick={{() => handleSkip(-15)}}
-                  size="sm"
-                  variant="ghost"
-                  className="text-white hover:bg-white/20"
-                >
-                  <SkipBack className="h-4 w-4 mr-1" />
-                  15s
-                </Button>
-                <Button
-                  onClick={{handlePlayPause}}
-                  size="lg"
-                  className="h-14 w-14 rounded-full bg-white text-blue-600 hover:bg-white/90 shadow-lg"
-                >
-                  {{isPlaying ? <Pause className="h-7 w-7" /> : <Play className="h-7 w-7 ml-1" />}}
-                </Button>
-                <Button
-                  onClick={{() => handleSkip(15)}}
-                  size="sm"
-                  variant="ghost"
-                  className="text-white hover:bg-white/20"
-                >
-                  15s
-                  <SkipForward className="h-4 w-4 ml-1" />
-                </Button>
-              </div>
-
-              <div className="space-y-1">
-                <Slider
-                  value={{[currentTime]}}
-                  max={{duration || 100}}
-                  step={{0.1}}
-                  onValueChange={{([value]) => {{
-                    if (audioRef.current) {{
-                      audioRef.current.currentTime = value;
-                      setCurrentTime(value);
-                    }}
-                  }}}}
-                  className="cursor-pointer"
-                />
-                <div className="flex justify-between text-xs sm:text-sm text-white/80">
-                  <span>{{formatTime(currentTime)}}</span>
-                  <span>{{formatTime(duration)}}</span>
-                </div>
-              </div>
-
-              <div className="flex items-center gap-2 justify-center">
-                <Volume2 className="h-4 w-4 text-white/70" />
-                <Slider
-                  value={{[volume * 100]}}
-                  max={{100}}
-                  step={{1}}
-                  onValueChange={{([value]) => setVolume(value / 100)}}
-                  className="w-24 sm:w-32"
-                />
-              </div>
-            </div>
-
-            <audio
-              ref={{audioRef}}
-              src="/{self.url_slug}-ch{chapter_num}.mp3"
-              onTimeUpdate={{(e) => setCurrentTime(e.currentTarget.currentTime)}}
-              onLoadedMetadata={{(e) => setDuration(e.currentTarget.duration)}}
-              onPlay={{() => setIsPlaying(true)}}
-              onPause={{() => setIsPlaying(false)}}
-              onEnded={{() => setIsPlaying(false)}}
-            />
-          </CardContent>
-        </Card>
+    <ChapterPlayer
+      courseId={{{self.course_id}}}
+      title={jsx_attr(self.course_name)}
+      subtitle="Chapter {chapter_num}"
+      {self.player_props(chapter_num)}
+    >
+      '''
+        tail = '''
+    </ChapterPlayer>
+  );
+}
+'''
+        return head, tail
+    
+    def generate_chapter_component(self, chapter_num, content):
+        """Generate a chapter page on top of the shared ChapterPlayer runtime"""
+        head, tail = self.chapter_component_parts(chapter_num)
+        return head + content + tail
+    
+    def generate_data_chapter_component(self, chapter_num):
+        """Generate a chapter page whose content is fetched from public/content on demand"""
+        return f'''{GENERATED_PAGE_MARKER}
+import ChapterPlayer from "@/components/chapter-player";
 
-        {{/* Content */}}
-        <Card className="bg-white shadow-xl mb-8">
-          <CardContent className="p-8 prose max-w-none">
-            {content}
-          </CardContent>
-        </Card>
-      </div>
-    </div>
+export default function {self.component_name}Ch{chapter_num}() {{
+  return (
+    <ChapterPlayer
+      courseId={{{self.course_id}}}
+      title={jsx_attr(self.course_name)}
+      subtitle="Chapter {chapter_num}"
+      {self.player_props(chapter_num)}
+      contentUrl="{self.chapter_content_url(chapter_num)}"
+    />
   );
 }}
 '''
@@ -390,77 +3234,86 @@ export default function {self.component_name}Ch{chapter_num}() {{
     def create_complete_ebook(self):
         """Create complete e-book with all chapters"""
         print("  Generating complete e-book component...")
+        output_path = Path("client/src/pages") / f"{self.url_slug}-complete-ebook.tsx"
+        if self.keep_curated_page(output_path):
+            return
+        inputs = {
+            "course": self.course_params(),
+            "chapters": [self.chapter_inputs(i) for i in range(1, self.num_chapters + 1)],
+        }
+        self.build_manifest.emit(output_path, inputs, self.generate_complete_ebook)
+    
+    def create_complete_pdf(self):
+        """Assemble public/<slug>-complete.pdf, the e-book's Download PDF, from the chapter PDFs"""
+        output_path = Path("public") / f"{self.url_slug}-complete.pdf"
+        chapters = []
+        for i in range(1, self.num_chapters + 1):
+            pdf = self.chapter_sources(i)["pdf"]
+            if pdf is not None:
+                chapters.append((chapter_pdf_title(i, pdf), str(pdf)))
+        textbook = None if chapters else self.find_single_textbook()
+        if not chapters and textbook is None:
+            print("  ⚠️ No chapter PDFs to assemble the complete PDF from")
+            return []
+        if chapters and len(chapters) < self.num_chapters:
+            print(f"  ⚠️ Only {len(chapters)} of {self.num_chapters} chapters have a PDF")
+        manifest = self.build_manifest
+        inputs = {
+            "course": self.course_params(),
+            "chapters": [[bookmark, manifest.hash_file(pdf)] for bookmark, pdf in chapters],
+            "textbook": manifest.hash_file(textbook),
+            "linearized": shutil.which("qpdf") is not None,
+        }
+        records = []
         
-        # This would be similar but more complex - embedding all chapter content
-        # For now, create a basic structure
-        component = f'''import React, {{ useRef, useState, useEffect }} from "react";
+        def produce(tmp_path):
+            result = self.pdf_pool.submit(complete_pdf_job, chapters, textbook and str(textbook),
+                                          str(tmp_path), self.course_name).result()
+            records.append({"path": str(output_path), **result["usage"]})
+            source = f"{len(chapters)} chapter PDF(s)" if chapters else textbook.name
+            print(f"  ✅ {output_path}: {result['pages']} pages from {source}")
+            if not result["linearized"]:
+                print("  ⚠️ qpdf not installed, the complete PDF is not linearized for fast web view (optional)")
+        
+        output_path.parent.mkdir(exist_ok=True)
+        if not manifest.emit_file(output_path, inputs, produce):
+            print(f"  ⏭️ {output_path} unchanged")
+        return records
+    
+    def ebook_chapter_entry(self, chapter_num):
+        """One entry of the e-book's chapters array"""
+        entry = f'{{ id: {chapter_num}, title: "Chapter {chapter_num}", audioUrl: "{self.audio_url(chapter_num)}"'
+        meta = self.audio_meta_js(chapter_num)
+        if meta:
+            entry += f', audioMeta: {meta}'
+        return entry + f', contentUrl: "{self.chapter_content_url(chapter_num)}" }}'
+    
+    def generate_complete_ebook(self):
+        """Generate complete React component for the e-book
+
+        Chapter text is always fetched from the public/content data files, so
+        the e-book bundle doesn't carry the whole book in either content mode.
+        """
+        cover = ''.join(' ' + prop for prop in self.cover_props())
+        component = f'''{GENERATED_PAGE_MARKER}
+import React, {{ useState }} from "react";
 import {{ useLocation }} from "wouter";
 import {{ Button }} from "@/components/ui/button";
 import {{ Card, CardContent }} from "@/components/ui/card";
-import {{ Slider }} from "@/components/ui/slider";
 import {{ Select, SelectContent, SelectItem, SelectTrigger, SelectValue }} from "@/components/ui/select";
-import {{ Play, Pause, SkipBack, SkipForward, ArrowLeft, Volume2, Download }} from "lucide-react";
+import {{ ArrowLeft, Download }} from "lucide-react";
+import {{ ChapterAudioPlayer, ChapterContent }} from "@/components/chapter-player";
+
+const chapters = [
+  {', '.join(self.ebook_chapter_entry(i) for i in range(1, self.num_chapters + 1))}
+];
 
 export default function {self.component_name}CompleteEbook() {{
   const [, setLocation] = useLocation();
-  const audioRef = useRef<HTMLAudioElement>(null);
-  const [isPlaying, setIsPlaying] = useState(false);
-  const [currentTime, setCurrentTime] = useState(0);
-  const [duration, setDuration] = useState(0);
-  const [volume, setVolume] = useState(1);
   const [currentChapter, setCurrentChapter] = useState(1);
 
-  const chapters = [
-    {', '.join(f'{{ id: {i}, title: "Chapter {i}", audioUrl: "/{self.url_slug}-ch{i}.mp3" }}' for i in range(1, self.num_chapters + 1))}
-  ];
-
   const currentChapterData = chapters[currentChapter - 1];
 
-  useEffect(() => {{
-    if (audioRef.current) {{
-      audioRef.current.volume = volume;
-      audioRef.current.src = currentChapterData.audioUrl;
-      setCurrentTime(0);
-      setDuration(0);
-      setIsPlaying(false);
-    }}
-  }}, [volume, currentChapter]);
-
-  const handlePlayPause = () => {{
-    const audio = audioRef.current;
-    if (!audio) return;
-    if (isPlaying) {{
-      audio.pause();
-      setIsPlaying(false);
-    }} else {{
-      audio.play();
-      setIsPlaying(true);
-    }}
-  }};
-
-  const handleSkip = (delta: number) => {{
-    const audio = audioRef.current;
-    if (!audio) return;
-    const next = Math.min(Math.max(0, audio.currentTime + delta), duration || audio.duration || 0);
-    audio.currentTime = next;
-    setCurrentTime(next);
-  }};
-
-  const formatTime = (time: number) => {{
-    const m = Math.floor(time / 60);
-    const s = Math.floor(time % 60);
-    return `${{m}}:${{String(s).padStart(2, "0")}}`;
-  }};
-
-  const handleChapterChange = (chapterId: string) => {{
-    setCurrentChapter(parseInt(chapterId));
-  }};
-
-  const getChapterContent = (chapterId: number) => {{
-    // Content will be embedded here by build script
-    return <div>Chapter {{chapterId}} content</div>;
-  }};
-
   return (
     <div className="min-h-screen bg-gradient-to-br from-indigo-900 via-blue-900 to-purple-900 p-4 sm:p-6 lg:p-8">
       <div className="max-w-5xl mx-auto">
@@ -475,77 +3328,26 @@ export default function {self.component_name}CompleteEbook() {{
           </Button>
         </div>
 
-        {/* Audio Player - same structure as chapter pages */}
-        <Card className="bg-gradient-to-r from-blue-600 to-indigo-600 border-none shadow-2xl mb-8">
-          <CardContent className="p-4 sm:p-6">
-            <div className="flex items-start gap-4 mb-4">
-              <div className="flex-1 min-w-0">
-                <h3 className="text-white text-xl sm:text-2xl font-bold mb-1">
-                  <span className="text-2xl sm:text-3xl align-text-top mr-1">📚</span>
-                  <span className="align-middle">{self.course_name}</span>
-                </h3>
-                <p className="text-white/90 text-base sm:text-xl font-semibold">
-                  <span className="align-middle">Complete E-Book</span>
-                </p>
-              </div>
-            </div>
-
-            <div className="mb-4">
-              <Select value={{currentChapter.toString()}} onValueChange={{handleChapterChange}}>
-                <SelectTrigger className="w-full bg-white/10 text-white border-white/20">
-                  <SelectValue />
-                </SelectTrigger>
-                <SelectContent>
-                  {{chapters.map((ch) => (
-                    <SelectItem key={{ch.id}} value={{ch.id.toString()}}>
-                      {{ch.title}}
-                    </SelectItem>
-                  ))}}
-                </SelectContent>
-              </Select>
-            </div>
-
-            <div className="space-y-3">
-              <div className="flex items-center justify-center gap-3">
-                <Button onClick={{() => handleSkip(-15)}} size="sm" variant="ghost" className="text-white hover:bg-white/20">
-                  <SkipBack className="h-4 w-4 mr-1" />15s
-                </Button>
-                <Button onClick={{handlePlayPause}} size="lg" className="h-14 w-14 rounded-full bg-white text-blue-600 hover:bg-white/90 shadow-lg">
-                  {{isPlaying ? <Pause className="h-7 w-7" /> : <Play className="h-7 w-7 ml-1" />}}
-                </Button>
-                <Button onClick={{() => handleSkip(15)}} size="sm" variant="ghost" className="text-white hover:bg-white/20">
-                  15s<SkipForward className="h-4 w-4 ml-1" />
-                </Button>
-              </div>
-
-              <div className="space-y-1">
-                <Slider value={{[currentTime]}} max={{duration || 100}} step={{0.1}}
-                  onValueChange={{([value]) => {{ if (audioRef.current) {{ audioRef.current.currentTime = value; setCurrentTime(value); }} }}}}
-                  className="cursor-pointer" />
-                <div className="flex justify-between text-xs sm:text-sm text-white/80">
-                  <span>{{formatTime(currentTime)}}</span>
-                  <span>{{formatTime(duration)}}</span>
-                </div>
-              </div>
-
-              <div className="flex items-center gap-2 justify-center">
-                <Volume2 className="h-4 w-4 text-white/70" />
-                <Slider value={{[volume * 100]}} max={{100}} step={{1}} onValueChange={{([value]) => setVolume(value / 100)}} className="w-24 sm:w-32" />
-              </div>
-            </div>
-
-            <audio ref={{audioRef}} src={{currentChapterData.audioUrl}}
-              onTimeUpdate={{(e) => setCurrentTime(e.currentTarget.currentTime)}}
-              onLoadedMetadata={{(e) => setDuration(e.currentTarget.duration)}}
-              onPlay={{() => setIsPlaying(true)}}
-              onPause={{() => setIsPlaying(false)}}
-              onEnded={{() => setIsPlaying(false)}} />
-          </CardContent>
-        </Card>
+        <ChapterAudioPlayer title={jsx_attr(self.course_name)} subtitle="Complete E-Book" audioUrl={{currentChapterData.audioUrl}} audioMeta={{currentChapterData.audioMeta}} prefetchUrl="{self.prefetch_url()}" chapter={{currentChapter}}{cover}>
+          <div className="mb-4">
+            <Select value={{currentChapter.toString()}} onValueChange={{(chapterId) => setCurrentChapter(parseInt(chapterId))}}>
+              <SelectTrigger className="w-full bg-white/10 text-white border-white/20">
+                <SelectValue />
+              </SelectTrigger>
+              <SelectContent>
+                {{chapters.map((ch) => (
+                  <SelectItem key={{ch.id}} value={{ch.id.toString()}}>
+                    {{ch.title}}
+                  </SelectItem>
+                ))}}
+              </SelectContent>
+            </Select>
+          </div>
+        </ChapterAudioPlayer>
 
         <Card className="bg-white shadow-xl">
           <CardContent className="p-6 sm:p-8 prose max-w-none">
-            {{getChapterContent(currentChapter)}}
+            <ChapterContent url={{currentChapterData.contentUrl}} />
           </CardContent>
         </Card>
       </div>
@@ -553,66 +3355,160 @@ export default function {self.component_name}CompleteEbook() {{
   );
 }}
 '''
-        
-        output_path = Path("client/src/pages") / f"{self.url_slug}-complete-ebook.tsx"
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(component)
+        return component
+    
+    def quiz_sources(self):
+        """Extracted text of every weekly quiz and the final exam, in order"""
+        index = self.course_index()
+        items = [index.quizzes.get(i, {}) for i in range(1, self.num_quizzes + 1)] + [index.final_exam]
+        return [CourseIndex.sources(item)["text"] for item in items]
     
     def create_quiz_script(self):
         """Generate database script for all quizzes"""
-        # This would parse extracted quiz PDFs and generate the database script
-        # Simplified version:
-        script = f'''import {{ db }} from "./db";
-import {{ quizzes, quizQuestions }} from "@db/schema";
+        output_path = Path(f"add-{self.url_slug}-quizzes.ts")
+        inputs = {
+            "course": self.course_params(),
+            "quizzes": [self.build_manifest.hash_file(path) for path in self.quiz_sources()],
+        }
+        self.build_manifest.emit(output_path, inputs, self.generate_quiz_script)
+    
+    def parse_course_quizzes(self):
+        """Structured weekly quizzes and final exam, reporting validation errors"""
+        course_quizzes = []
+        for index, source in enumerate(self.quiz_sources(), 1):
+            is_final = index > self.num_quizzes
+            slug = f"{self.url_slug}-final-exam" if is_final else f"{self.url_slug}-week-{index}"
+            label = "Final Exam" if is_final else f"Week {index}"
+            if source is None:
+                print(f"  ⚠️ {label}: no extracted quiz found, skipped")
+                continue
+            parsed = parse_quiz_text(Path(source).read_text(encoding='utf-8'))
+            for error in parsed["errors"]:
+                print(f"  ⚠️ {Path(source).name}: {error}")
+            if not parsed["questions"]:
+                continue
+            course_quizzes.append({
+                "slug": slug,
+                "title": f"{self.course_name} - {label}",
+                "timeLimit": 120 if is_final else 60,
+                "isFinalExam": is_final,
+                "questions": [
+                    {
+                        "question": question["question"],
+                        "options": question["options"],
+                        # The quiz page submits the option text itself; options carry no
+                        # "A) " prefix, matching what cleanupQuizOptions leaves in the database
+                        "correctAnswer": question["options"][ord(question["answer"]) - ord('A')],
+                    }
+                    for question in parsed["questions"]
+                ],
+            })
+            print(f"  ✅ {label}: {len(parsed['questions'])} question(s)")
+        return course_quizzes
+    
+    def generate_quiz_script(self):
+        """Generate a seed script inserting every quiz and question in one transaction"""
+        course_quizzes = json.dumps(self.parse_course_quizzes(), indent=2, ensure_ascii=False)
+        script = f'''// Generated by auto-create-course.py from the extracted quiz PDFs.
+// Seeds every {self.course_name} quiz and its questions in one transaction:
+//   DATABASE_URL="your-db-url" npx tsx add-{self.url_slug}-quizzes.ts
+import fs from "fs";
+import path from "path";
+import {{ inArray }} from "drizzle-orm";
+import {{ db }} from "./server/db.js";
+import {{ writeQuizBundles }} from "./server/quiz-bundles.js";
+import {{ quizzes, quizQuestions }} from "./shared/schema.js";
+
+interface SeedQuiz {{
+  slug: string;
+  title: string;
+  timeLimit: number;
+  isFinalExam: boolean;
+  questions: {{ question: string; options: string[]; correctAnswer: string }}[];
+}}
+
+// Rows per multi-row INSERT, well under Postgres' 65535 bind parameter limit
+const QUESTION_BATCH_SIZE = 500;
+// Slug -> quiz ID index the server resolves string quiz URLs with
+const QUIZ_INDEX_PATH = path.join(process.cwd(), "{QUIZ_INDEX_PATH.as_posix()}");
+
+const courseQuizzes: SeedQuiz[] = {course_quizzes};
 
 async function addQuizzes() {{
   console.log("Adding {self.course_name} quizzes...");
-  
-  // TODO: Add actual quiz data here
-  // This script needs to be populated with quiz questions from extracted PDFs
-  
-  console.log("✅ Quizzes added!");
-  process.exit(0);
+
+  const quizIds = await db.transaction(async (tx) => {{
+    const titles = courseQuizzes.map((quiz) => quiz.title);
+    const existing = await tx.select({{ title: quizzes.title }}).from(quizzes).where(inArray(quizzes.title, titles));
+    if (existing.length > 0) {{
+      throw new Error(`Already seeded: ${{existing.map((quiz) => quiz.title).join(", ")}}`);
+    }}
+
+    const created = await tx
+      .insert(quizzes)
+      .values(courseQuizzes.map(({{ title, timeLimit, isFinalExam }}) => ({{
+        title,
+        timeLimit,
+        isFinalExam,
+        passingScore: 70,
+        isPublished: true,
+      }})))
+      .returning({{ id: quizzes.id, title: quizzes.title }});
+    const idByTitle = new Map(created.map((quiz) => [quiz.title, quiz.id]));
+
+    const rows = courseQuizzes.flatMap((quiz) =>
+      quiz.questions.map((question, index) => ({{
+        quizId: idByTitle.get(quiz.title)!,
+        question: question.question,
+        type: "multiple_choice" as const,
+        options: question.options,
+        correctAnswer: question.correctAnswer,
+        points: 1,
+        orderIndex: index + 1,
+        isBonus: false,
+      }}))
+    );
+    for (let i = 0; i < rows.length; i += QUESTION_BATCH_SIZE) {{
+      await tx.insert(quizQuestions).values(rows.slice(i, i + QUESTION_BATCH_SIZE));
+    }}
+
+    console.log(`Inserted ${{created.length}} quizzes and ${{rows.length}} questions`);
+    return courseQuizzes.map((quiz) => [quiz.slug, idByTitle.get(quiz.title)!] as const);
+  }});
+
+  const index: Record<string, number> = fs.existsSync(QUIZ_INDEX_PATH)
+    ? JSON.parse(fs.readFileSync(QUIZ_INDEX_PATH, "utf-8"))
+    : {{}};
+  for (const [slug, id] of quizIds) {{
+    index[slug] = id;
+    console.log(`  ${{slug}} -> ${{id}}`);
+  }}
+  const sorted = Object.fromEntries(Object.entries(index).sort(([a], [b]) => a.localeCompare(b)));
+  fs.writeFileSync(`${{QUIZ_INDEX_PATH}}.tmp`, JSON.stringify(sorted, null, 2) + "\\n");
+  fs.renameSync(`${{QUIZ_INDEX_PATH}}.tmp`, QUIZ_INDEX_PATH);
+  await writeQuizBundles(quizIds);
+  console.log(`✅ Quizzes added! Registered in ${{QUIZ_INDEX_PATH}} (restart the server to pick them up)`);
 }}
 
-addQuizzes().catch(console.error);
+addQuizzes()
+  .then(() => process.exit(0))
+  .catch((error) => {{
+    console.error("❌ Error seeding quizzes:", error);
+    process.exit(1);
+  }});
 '''
-        
-        output_path = Path(f"add-{self.url_slug}-quizzes.ts")
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(script)
+        return script
     
     def update_app_routes(self):
-        """Add all routes to App.tsx"""
-        app_path = Path("client/src/App.tsx")
-        with open(app_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Add imports
-        imports = '\n'.join([
-            f'import {self.component_name}Ch{i} from "@/pages/{self.url_slug}-ch{i}";'
-            for i in range(1, self.num_chapters + 1)
-        ])
-        imports += f'\nimport {self.component_name}CompleteEbook from "@/pages/{self.url_slug}-complete-ebook";'
-        
-        # Find where to insert imports (after last import)
-        last_import = content.rfind('import ')
-        insert_pos = content.find('\n', last_import)
-        content = content[:insert_pos] + '\n' + imports + content[insert_pos:]
-        
-        # Add routes
-        routes = '\n'.join([
-            f'          <Route path="/{self.url_slug}-ch{i}" component={{{self.component_name}Ch{i}}} />'
-            for i in range(1, self.num_chapters + 1)
-        ])
-        routes += f'\n          <Route path="/{self.url_slug}-complete-ebook" component={{{self.component_name}CompleteEbook}} />'
-        
-        # Find where to insert routes (before </Switch>)
-        switch_end = content.rfind('</Switch>')
-        content = content[:switch_end] + routes + '\n' + content[switch_end:]
-        
-        with open(app_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        """Register the course in the lazily loaded route registry used by App.tsx"""
+        course = {
+            "slug": self.url_slug,
+            "chapters": self.num_chapters,
+        }
+        if register_course_routes(course):
+            print(f"  ✅ Registered /{self.url_slug}-ch1..{self.num_chapters} and e-book routes")
+        else:
+            print("  ⏭️ Routes already registered")
     
     def update_course_viewer(self):
         """Add week cards to course-content-viewer.tsx"""
@@ -621,17 +3517,286 @@ addQuizzes().catch(console.error);
         print(f"     Add cards for courseId === {self.course_id}")
     
     def update_server_routes(self):
-        """Add quiz ID mappings to server/routes.ts"""
-        # This is complex - simplified version
-        print("  ⚠️ Manual step required: Add quiz mappings to server/routes.ts")
-        print(f"     Add '{self.url_slug}-week-X' mappings")
+        """Check the course's quiz slugs are in the server's quiz ID index"""
+        slugs = [f"{self.url_slug}-week-{i}" for i in range(1, self.num_quizzes + 1)]
+        slugs.append(f"{self.url_slug}-final-exam")
+        missing = [slug for slug in slugs if slug not in load_quiz_index()]
+        if not missing:
+            print(f"  ✅ {len(slugs)} quiz slug(s) already in {QUIZ_INDEX_PATH}")
+        else:
+            print(f"  ⏳ {len(missing)} quiz slug(s) not in {QUIZ_INDEX_PATH} yet; running "
+                  f"add-{self.url_slug}-quizzes.ts registers them")
+    
+    def course_public_paths(self):
+        """This course's own files and folders under public/"""
+        public = Path("public")
+        return [public / "content" / self.url_slug, public / "audio" / self.url_slug,
+                public / "img" / self.url_slug, public / f"{self.url_slug}-complete.pdf",
+                public / self.prefetch_url().lstrip("/")]
+    
+    def bundle_files(self):
+        """(kind, path) of every generated file this course sends to the client"""
+        files = []
+        if self.generate_pages:
+            pages = Path("client/src/pages")
+            files.extend(("chapter page", pages / f"{self.url_slug}-ch{i}.tsx") for i in range(1, self.num_chapters + 1))
+            files.append(("ebook page", pages / f"{self.url_slug}-complete-ebook.tsx"))
+        content_dir = Path("public") / "content" / self.url_slug
+        for path in self.course_public_paths():
+            for file in sorted(path.rglob("*")) if path.is_dir() else [path]:
+                suffix = file.suffix.lower()
+                if suffix in (".gz", ".br"):
+                    continue
+                if suffix == ".mp3":
+                    kind = "audio"
+                elif suffix in IMAGE_SUFFIXES:
+                    kind = "image"
+                elif suffix == ".pdf":
+                    kind = "pdf"
+                else:
+                    kind = "chapter data" if file.parent == content_dir else "manifest"
+                files.append((kind, file))
+        return [(kind, path) for kind, path in files if path.is_file()]
+    
+    def write_bundle_report(self):
+        """Weigh this course's generated files into BUNDLE_REPORT_DIR/<slug>.json and check the budgets"""
+        entries, measured = bundle_weights(self.bundle_files(), self.build_manifest, pool=self.pdf_pool,
+                                           max_workers=self.max_workers)
+        report = bundle_report(self.url_slug, entries, self.bundle_budgets)
+        report_path = BUNDLE_REPORT_DIR / f"{self.url_slug}.json"
+        previous = {}
+        if report_path.exists():
+            with open(report_path, 'r', encoding='utf-8') as f:
+                previous = json.load(f).get("files", {})
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        written = write_if_changed(report_path, (json.dumps(report, indent=2) + '\n').encode('utf-8'))
+        
+        for kind, totals in report["kinds"].items():
+            compressed = f", {totals['gzip']:,} gzip" if totals["gzip"] else ""
+            print(f"  📦 {kind}: {totals['files']} file(s), {totals['bytes']:,} bytes{compressed}")
+        over = report["over_budget"]
+        for item in over:
+            was = previous.get(item["path"], {}).get(item["metric"])
+            change = f" (was {was:,})" if was is not None and was != item["value"] else ""
+            print(f"  {'❌' if self.budget_mode == 'fail' else '⚠️'} {item['path']}: {item['metric']} "
+                  f"{item['value']:,} over the {item['kind']} budget of {item['limit']:,}{change}")
+        print(f"  📝 Bundle report: {report_path}" if written else f"  ⏭️ Bundle report unchanged: {report_path}")
+        if over and self.budget_mode == "fail":
+            raise RuntimeError(f"{len(over)} bundle budget(s) exceeded, see {report_path}")
+        return measured
+    
+    def precompress_outputs(self):
+        """Write .gz/.br siblings of this course's changed compressible files nginx serves statically"""
+        public = Path("public")
+        paths = [path for path in self.course_public_paths()
+                 if path.relative_to(public).parts[0] in GZIP_STATIC_DIRS]
+        results = precompress_files(paths, self.build_manifest, pool=self.pdf_pool, max_workers=self.max_workers)
+        for result in sorted(results, key=lambda r: r["path"]):
+            sizes = ", ".join(f".{e} {size:,}" if size else f".{e} skipped (no gain)"
+                              for e, size in result["sizes"].items())
+            print(f"  ✅ {result['path']}: {result['bytes']:,} bytes -> {sizes}")
+        removed = remove_orphan_siblings(self.build_manifest, paths)
+        if removed:
+            print(f"  🧹 Removed {removed} orphaned compressed file(s)")
+        if not results:
+            print("  ⏭️ Nothing changed")
+        return [{"path": result["path"], **result["usage"]} for result in results]
+    
+    def update_search(self):
+        """Re-index this course's chapter text in the search index under public/search/"""
+        documents = {}
+        for i in range(1, self.num_chapters + 1):
+            text_path = self.chapter_sources(i)["text"]
+            if text_path is not None:
+                documents[i] = Path(text_path).read_text(encoding='utf-8', errors='replace')
+        if not documents:
+            print("  ⚠️ No extracted chapter text to index")
+            return
+        digest = hashlib.sha256(json.dumps(
+            {"name": self.course_name, "version": SEARCH_INDEX_VERSION, "chapters": documents},
+            sort_keys=True).encode('utf-8')).hexdigest()
+        manifest = load_search_manifest()
+        if manifest and manifest["courses"].get(self.url_slug, {}).get("hash") == digest:
+            print("  ⏭️ Search index unchanged")
+            return
+        postings, lengths = index_documents(documents)
+        course = {"name": self.course_name, "hash": digest, "lengths": lengths}
+        written = update_search_index(self.url_slug, course, postings)
+        print(f"  ✅ Indexed {len(documents)} chapter(s), {len(postings):,} terms ({written} shard(s) written)")
+    
+    def update_image_registry(self):
+        """Add the course cover's WebP variants to client/src/image-variants.json for the catalog"""
+        if not self.image_variants:
+            print("  No cover images to register")
+        elif register_images(self.image_variants):
+            print(f"  ✅ Registered {len(self.image_variants)} cover image(s)")
+        else:
+            print("  ⏭️ Image registry unchanged")
     
     def update_textbook_catalog(self):
         """Add e-book link to textbook catalog"""
         print("  ⚠️ Manual step required: Add e-book link to textbook-catalog.tsx")
         print(f"     Link courseId {self.course_id} to /{self.url_slug}-complete-ebook")
 
+def load_course_manifest(manifest_path):
+    """Read a JSON or TOML course manifest and validate its course entries
+
+    The manifest holds a "courses" list; every entry needs name, id and folder,
+    and may set chapters and quizzes (detected from the folder otherwise),
+    videos, bible_readings, slug and component. Courses with "generate": false
+    have pages curated by hand: their data files (audio, images, quiz bundles,
+    search shards, manifests) are still built, their pages and routes are not.
+    """
+    manifest_path = Path(manifest_path)
+    if manifest_path.suffix == ".toml":
+        with open(manifest_path, 'rb') as f:
+            data = tomllib.load(f)
+    else:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    
+    courses = data.get("courses", [])
+    if not courses:
+        raise ValueError(f"{manifest_path}: no courses listed")
+    
+    required = ("name", "id", "folder")
+    seen_ids = set()
+    for index, entry in enumerate(courses, 1):
+        missing = [key for key in required if key not in entry]
+        if missing:
+            raise ValueError(f"{manifest_path}: course #{index} is missing {', '.join(missing)}")
+        if not Path(entry["folder"]).exists():
+            raise ValueError(f"{manifest_path}: course #{index} folder not found: {entry['folder']}")
+        if entry["id"] in seen_ids:
+            raise ValueError(f"{manifest_path}: course id {entry['id']} is listed twice")
+        seen_ids.add(entry["id"])
+    return courses
+
+
+def run_batch(manifest_path, jobs=None, **options):
+    """Build every course listed in a manifest without prompting
+
+    Per-course outputs are built concurrently (one thread per course, sharing
+    one PDF extraction process pool); edits to shared files such as App.tsx
+    are then applied one course at a time in manifest order so the result is
+    the same on every run. Returns the number of failed courses.
+    """
+    courses = load_course_manifest(manifest_path)
+    creators = []
+    for entry in courses:
+        creator = CourseCreator(**options)
+        creator.load_course_info(entry)
+        if creator.profile_path and len(courses) > 1:
+            report = Path(creator.profile_path)
+            creator.profile_path = report.with_name(f"{report.stem}-{creator.url_slug}{report.suffix}")
+        creators.append(creator)
+    
+    print(f"🚀 Building {len(creators)} course(s) from {manifest_path}\n")
+    failed = {}
+    workers = os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pdf_pool, \
+            ThreadPoolExecutor(max_workers=jobs or len(creators)) as course_pool:
+        futures = {}
+        for creator in creators:
+            creator.pdf_pool = pdf_pool
+            futures[course_pool.submit(creator.build_course_outputs)] = creator
+        for future in as_completed(futures):
+            creator = futures[future]
+            try:
+                future.result()
+                print(f"✅ Built {creator.course_name}")
+            except Exception as e:
+                failed[creator.url_slug] = e
+                print(f"❌ {creator.course_name}: {type(e).__name__}: {e}")
+    
+    print("\n🔗 Updating shared files...")
+    for creator in creators:
+        if creator.url_slug in failed:
+            continue
+        print(f"\n📚 {creator.course_name}")
+        shared_failed = creator.update_shared_files()
+        if shared_failed:
+            failed[creator.url_slug] = RuntimeError(f"failed: {', '.join(shared_failed)}")
+        creator.finish_build()
+    
+    print(f"\n🎉 {len(creators) - len(failed)}/{len(creators)} course(s) built")
+    return len(failed)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="SFGM Boston - Automatic Course Creator")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="re-extract every PDF instead of reusing the extraction cache")
+    parser.add_argument("--cache-max-mb", type=int, default=EXTRACTION_CACHE_MAX_BYTES // (1024 * 1024),
+                        help="size limit of the extraction cache before old entries are evicted")
+    parser.add_argument("--force", action="store_true",
+                        help="regenerate every output even if its inputs are unchanged")
+    parser.add_argument("--split-textbook", metavar="PDF",
+                        help="split a single-file textbook into per-chapter extracted text and exit")
+    parser.add_argument("--content-mode", choices=("inline", "data"), default="inline",
+                        help="inline chapter text as JSX, or write it to public/content and fetch it on demand")
+    parser.add_argument("--optimize-covers", action="store_true",
+                        help="publish WebP variants of every cover image in public/ for the catalog and exit")
+    parser.add_argument("--search-index", metavar="MANIFEST",
+                        help="(re)index the extracted chapter text of every course in a manifest and exit")
+    parser.add_argument("--profile", metavar="REPORT",
+                        help="write wall time, CPU time, peak memory and bytes read/written of every build task "
+                             "to a JSON report (one per course in --batch mode: REPORT-<slug>.json)")
+    parser.add_argument("--cprofile", metavar="TASK", nargs="?", const="hottest",
+                        help="with --profile, run one task (e.g. \"page ch3\") under cProfile and dump it next to "
+                             "the report; without a name, the hottest task of the previous report")
+    parser.add_argument("--watch", action="store_true",
+                        help="after building the course, keep watching its folder and rebuild only what each "
+                             "change affects")
+    parser.add_argument("--polling", action="store_true",
+                        help="with --watch, poll the course folder instead of using inotify")
+    parser.add_argument("--budgets", metavar="FILE",
+                        help=f"JSON file of per-kind bundle weight limits (default: {BUNDLE_BUDGETS_PATH} if present)")
+    parser.add_argument("--budget-mode", choices=("warn", "fail"), default="warn",
+                        help="warn about generated files over their bundle budget, or fail the build")
+    parser.add_argument("--batch", metavar="MANIFEST",
+                        help="build every course listed in a JSON/TOML manifest without prompting")
+    parser.add_argument("--jobs", type=int,
+                        help="number of courses to build at once in --batch mode (default: all)")
+    args = parser.parse_args(argv)
+    if args.cprofile and not args.profile:
+        parser.error("--cprofile needs --profile REPORT")
+    return args
+
+
 if __name__ == "__main__":
-    creator = CourseCreator()
-    creator.run()
+    args = parse_args()
+    options = {
+        "use_cache": not args.no_cache,
+        "cache_max_bytes": args.cache_max_mb * 1024 * 1024,
+        "force": args.force,
+        "content_mode": args.content_mode,
+        "profile_path": args.profile,
+        "cprofile": args.cprofile,
+        "budgets_path": args.budgets,
+        "budget_mode": args.budget_mode,
+    }
+    if args.optimize_covers:
+        covers = optimize_cover_images()
+        register_images(covers)
+        print(f"✅ {len(covers)} cover image(s) registered in {IMAGE_VARIANTS_PATH}")
+        sys.exit(0)
+    if args.search_index:
+        for entry in load_course_manifest(args.search_index):
+            creator = CourseCreator(**options)
+            creator.load_course_info(entry)
+            print(f"🔎 {creator.course_name}")
+            creator.update_search()
+        sys.exit(0)
+    if args.split_textbook:
+        textbook = Path(args.split_textbook)
+        cache = ExtractionCache(max_bytes=options["cache_max_bytes"]) if options["use_cache"] else None
+        for chapter in split_textbook(textbook, textbook.parent, cache=cache):
+            print(f"✅ Chapter {chapter['number']}: {chapter['title']} "
+                  f"(pages {chapter['start'] + 1}-{chapter['end']}) -> {chapter['output']}")
+        sys.exit(0)
+    if args.batch:
+        sys.exit(1 if run_batch(args.batch, jobs=args.jobs, **options) else 0)
+    creator = CourseCreator(**options)
+    creator.run(watch=args.watch, polling=args.polling)
 
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Benchmark: chapter formatting, old whole-file formatter vs streaming formatter
+
+Runs both on the largest real *_extracted.txt chapter texts in the course
+trees and reports throughput and peak Python memory (tracemalloc) for the
+formatter alone and for turning one chapter text file into a page file.
+
+    python3 benchmarks/format_chapter.py [--files 5] [--repeat 20] [--json]
+"""
+
+import argparse
+import hashlib
+import html
+import importlib.util
+import json
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def load_creator():
+    spec = importlib.util.spec_from_file_location("auto_create_course", ROOT / "auto-create-course.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def largest_chapter_texts(count):
+    """The largest distinct chapter texts (quiz extractions excluded)"""
+    seen = set()
+    texts = []
+    for path in ROOT.rglob("*_extracted.txt"):
+        if "node_modules" in path.parts or "quiz" in str(path).lower() or "exam" in path.name.lower():
+            continue
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        if digest not in seen:
+            seen.add(digest)
+            texts.append(path)
+    return sorted(texts, key=lambda p: p.stat().st_size, reverse=True)[:count]
+
+
+def legacy_format_chapter_content(raw_content, html_output=False):
+    """format_chapter_content as it was before the streaming rewrite (baseline)"""
+    lines = raw_content.split('\n')
+    formatted = []
+    attr = "class" if html_output else "className"
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        text = html.escape(line, quote=False) if html_output else line
+        if line.isupper() or (len(line) < 50 and line.endswith(':')):
+            formatted.append(f'<h2 {attr}="text-2xl font-bold mb-4 mt-6">{text}</h2>')
+        elif line.startswith('"') or re.match(r'^\d+:', line):
+            formatted.append(f'''<div {attr}="bg-purple-50 border-l-4 border-purple-500 p-4 mb-4">
+                    <blockquote {attr}="text-purple-900 italic">{text}</blockquote>
+                </div>''')
+        else:
+            formatted.append(f'<p {attr}="mb-4">{text}</p>')
+    return '\n'.join(formatted)
+
+
+PAGE_HEAD = '''import ChapterPlayer from "@/components/chapter-player";
+
+export default function BenchCh1() {
+  return (
+    <ChapterPlayer courseId={1} title="Bench" subtitle="Chapter 1" audioUrl="/bench-ch1.mp3">
+      '''
+PAGE_TAIL = '''
+    </ChapterPlayer>
+  );
+}
+'''
+
+
+def legacy_page(m, text_path, output_path):
+    with open(text_path, 'r', encoding='utf-8') as f:
+        raw_content = f.read()
+    content = legacy_format_chapter_content(raw_content)
+    page = f"{PAGE_HEAD}{content}{PAGE_TAIL}"
+    m.write_if_changed(output_path, page.encode('utf-8'))
+
+
+def streaming_page(m, text_path, output_path):
+    with open(text_path, 'r', encoding='utf-8') as source, open(output_path, 'wb') as target:
+        def out(text):
+            target.write(text.encode('utf-8'))
+        out(PAGE_HEAD)
+        m.write_joined(out, m.format_chapter_blocks(source))
+        out(PAGE_TAIL)
+
+
+def measure(implementations, inputs, repeat):
+    """Best-of-repeat total time over all inputs and the peak traced memory of any one input
+
+    Implementations are run alternately in each round, so load on the machine
+    affects them alike.
+    """
+    best = {name: float("inf") for name in implementations}
+    for _ in range(repeat):
+        for name, implementation in implementations.items():
+            started = time.perf_counter()
+            for item in inputs:
+                implementation(item)
+            best[name] = min(best[name], time.perf_counter() - started)
+    results = {}
+    for name, implementation in implementations.items():
+        peak = 0
+        for item in inputs:
+            tracemalloc.start()
+            implementation(item)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        results[name] = (best[name], peak)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark chapter formatting")
+    parser.add_argument("--files", type=int, default=5, help="number of largest chapter texts to use")
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per implementation (best is kept)")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args(argv)
+
+    m = load_creator()
+    texts = largest_chapter_texts(args.files)
+    if not texts:
+        sys.exit("No *_extracted.txt chapter texts found")
+    total_bytes = sum(p.stat().st_size for p in texts)
+    results = {"files": [str(p.relative_to(ROOT)) for p in texts], "input_bytes": total_bytes}
+
+    # format: text already in memory -> formatted blocks (the formatter alone)
+    loaded = [(raw, raw.splitlines(True)) for raw in (p.read_text(encoding='utf-8') for p in texts)]
+    stages = {"format": (loaded, {
+        "legacy": lambda item: legacy_format_chapter_content(item[0]),
+        "streaming": lambda item: sum(1 for _ in m.format_chapter_blocks(item[1])),
+    })}
+    # page: extracted text file -> chapter page file (read, format, write)
+    with tempfile.TemporaryDirectory() as tmp:
+        output_path = Path(tmp) / "page.tsx"
+
+        def page(implementation):
+            def run(text_path):
+                output_path.unlink(missing_ok=True)
+                implementation(m, text_path, output_path)
+            return run
+
+        stages["page"] = (texts, {"legacy": page(legacy_page), "streaming": page(streaming_page)})
+        for stage, (inputs, implementations) in stages.items():
+            results[stage] = {
+                name: {"seconds": seconds, "mb_per_second": total_bytes / seconds / 1e6, "peak_bytes": peak}
+                for name, (seconds, peak) in measure(implementations, inputs, args.repeat).items()
+            }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{len(texts)} chapter texts, {total_bytes / 1024:.0f} KiB total (best of {args.repeat})")
+    for stage in stages:
+        print(f"{stage}:")
+        for name, r in results[stage].items():
+            print(f"  {name:<10} {r['mb_per_second']:7.1f} MB/s   peak {r['peak_bytes'] / 1024:8.1f} KiB")
+        legacy, streaming = results[stage]["legacy"], results[stage]["streaming"]
+        print(f"  speedup {legacy['seconds'] / streaming['seconds']:.2f}x, "
+              f"peak memory {legacy['peak_bytes'] / streaming['peak_bytes']:.1f}x lower")
+
+
+if __name__ == "__main__":
+    main()
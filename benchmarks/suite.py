@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: the main CourseCreator stages over a fixed slice of the course corpus
+
+Stages (each run offline in a scratch directory, never touching the course trees):
+
+    extract     PDFs -> *_extracted.txt through CourseCreator.extract_pdf and the extraction cache
+    format      format_chapter_content over chapter texts held in memory
+    components  chapter pages and the complete e-book through the build manifest
+    routes      register_course_routes on an App.tsx with the old static routes
+    quiz        parse_quiz_text over extracted quizzes
+
+Every stage runs once cold (fresh scratch directory: empty caches, no build
+manifest, unpatched App.tsx) and then --repeat times warm (state from the
+previous run kept, as on a rebuild). Inputs are listed with their hashes in
+benchmarks/corpus.json, so every run measures the same files; regenerate it
+with --select-corpus when the corpus changes. Timings are also expressed
+relative to a fixed pure-Python calibration loop so baselines carry over
+between machines.
+
+    python3 benchmarks/suite.py [--stages extract,format] [--repeat 5] [--output results.json]
+    python3 benchmarks/suite.py --compare               # against benchmarks/baseline.json
+    python3 benchmarks/suite.py --save-baseline         # record a new baseline
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from importlib import metadata
+from pathlib import Path
+
+from format_chapter import ROOT, load_creator
+
+SUITE_VERSION = 1
+CORPUS_PATH = Path(__file__).resolve().parent / "corpus.json"
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+CORPUS_TREES = ("SFGM Boston Courses", "SFGM Orlando Courses")
+CORPUS_SIZES = {"pdfs": 6, "chapters": 8, "quizzes": 8}
+STAGES = ("extract", "format", "components", "routes", "quiz")
+NOISE_FLOOR_SECONDS = 0.005  # slowdowns smaller than this are timer noise, never regressions
+
+
+def sha256_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def is_quiz(path):
+    return any(word in str(path).lower() for word in ("quiz", "exam"))
+
+
+def spread(paths, count):
+    """count files evenly spaced from smallest to largest (duplicates by content dropped)"""
+    seen = set()
+    unique = []
+    for path in sorted(paths, key=lambda p: (p.stat().st_size, str(p))):
+        digest = sha256_bytes(path.read_bytes())
+        if digest not in seen:
+            seen.add(digest)
+            unique.append(path)
+    if len(unique) <= count:
+        return unique
+    return [unique[round(i * (len(unique) - 1) / (count - 1))] for i in range(count)]
+
+
+def select_corpus():
+    """Pick the benchmark inputs from the course trees and describe them for corpus.json"""
+    files = [path for tree in CORPUS_TREES for path in (ROOT / tree).rglob("*") if path.is_file()]
+    texts = [path for path in files if path.name.endswith("_extracted.txt")]
+    pdfs = [path for path in files if path.suffix.lower() == ".pdf"]
+    chapter_pdfs = spread([p for p in pdfs if not is_quiz(p)], CORPUS_SIZES["pdfs"] - 2)
+    groups = {
+        "pdfs": chapter_pdfs + spread([p for p in pdfs if is_quiz(p)], 2),
+        "chapters": spread([p for p in texts if not is_quiz(p)], CORPUS_SIZES["chapters"]),
+        "quizzes": spread([p for p in texts if is_quiz(p)], CORPUS_SIZES["quizzes"]),
+    }
+    return {
+        "version": SUITE_VERSION,
+        "files": {
+            group: [{"path": str(path.relative_to(ROOT)), "bytes": path.stat().st_size,
+                     "sha256": sha256_bytes(path.read_bytes())} for path in paths]
+            for group, paths in groups.items()
+        },
+    }
+
+
+def load_corpus():
+    """The corpus listed in corpus.json, checked against the files on disk"""
+    with open(CORPUS_PATH, 'r', encoding='utf-8') as f:
+        corpus = json.load(f)
+    problems = []
+    for group, entries in corpus["files"].items():
+        for entry in entries:
+            path = ROOT / entry["path"]
+            if not path.is_file():
+                problems.append(f"{group}: {entry['path']} is missing")
+            elif sha256_bytes(path.read_bytes()) != entry["sha256"]:
+                problems.append(f"{group}: {entry['path']} changed")
+    if problems:
+        sys.exit("Benchmark corpus does not match corpus.json (re-run with --select-corpus "
+                 "and --save-baseline):\n  " + "\n  ".join(problems))
+    corpus["digest"] = sha256_bytes(json.dumps(corpus["files"], sort_keys=True).encode('utf-8'))
+    return corpus
+
+
+def calibrate(repeat=5):
+    """Best time of a fixed pure-Python loop, the unit stage times are normalized by"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        sum(i * i for i in range(1_000_000))
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def digest_files(paths):
+    digest = hashlib.sha256()
+    for path in sorted(paths, key=str):
+        digest.update(Path(path).name.encode('utf-8') + b'\0' + Path(path).read_bytes())
+    return digest.hexdigest()
+
+
+class Stage:
+    """One benchmark stage: setup() prepares a fresh scratch directory, run() is timed"""
+    group = None  # corpus.json group the stage reads
+
+    def __init__(self, m, corpus, workdir):
+        self.m = m
+        self.corpus = corpus
+        self.workdir = Path(workdir)
+
+    def inputs(self, group):
+        return [ROOT / entry["path"] for entry in self.corpus["files"][group]]
+
+    def size(self):
+        """Number of inputs and their total size"""
+        entries = self.corpus["files"][self.group]
+        return len(entries), sum(entry["bytes"] for entry in entries)
+
+    def setup(self):
+        pass
+
+    def run(self):
+        raise NotImplementedError
+
+    def digest(self):
+        """Hash of what the stage produced, to notice output changes between runs"""
+        raise NotImplementedError
+
+
+class ExtractStage(Stage):
+    """PDF -> extracted text via CourseCreator.extract_pdf (cold: extraction, warm: cache hits)"""
+    group = "pdfs"
+
+    def setup(self):
+        self.pdfs = []
+        for index, pdf in enumerate(self.inputs(self.group), 1):
+            target = self.workdir / "pdfs" / str(index) / pdf.name
+            target.parent.mkdir(parents=True)
+            shutil.copyfile(pdf, target)
+            self.pdfs.append(target)
+        self.creator = self.m.CourseCreator()
+        self.creator.extraction_cache = self.m.ExtractionCache(root=self.workdir / "cache")
+
+    def run(self):
+        with ThreadPoolExecutor(max_workers=1) as pool:  # in-process, one PDF at a time
+            self.creator.pdf_pool = pool
+            for pdf in self.pdfs:
+                self.creator.extract_pdf(pdf.name, pdf)
+
+    def digest(self):
+        return digest_files(self.m.extracted_text_path(pdf) for pdf in self.pdfs)
+
+
+class FormatStage(Stage):
+    group = "chapters"
+
+    def setup(self):
+        self.creator = self.m.CourseCreator()
+        self.texts = [path.read_text(encoding='utf-8') for path in self.inputs(self.group)]
+
+    def run(self):
+        self.output = [self.creator.format_chapter_content(text, n) for n, text in enumerate(self.texts, 1)]
+
+    def digest(self):
+        return sha256_bytes('\0'.join(self.output).encode('utf-8'))
+
+
+class ComponentsStage(Stage):
+    """Chapter pages and the e-book (cold: everything rendered, warm: build manifest says unchanged)"""
+    group = "chapters"
+
+    def setup(self):
+        course = self.workdir / "course"
+        for n, text in enumerate(self.inputs(self.group), 1):
+            chapter_dir = course / "Text-Book" / str(n)
+            chapter_dir.mkdir(parents=True)
+            shutil.copyfile(text, chapter_dir / f"Chapter {n}_extracted.txt")
+        (self.workdir / "client" / "src" / "pages").mkdir(parents=True)
+        self.creator = self.m.CourseCreator()
+        self.creator.load_course_info({"name": "Benchmark Course", "id": 9000, "folder": str(course),
+                                       "chapters": len(self.inputs(self.group)), "quizzes": 0,
+                                       "slug": "benchmark-course"})
+
+    def run(self):
+        self.creator.start_build()
+        for n in range(1, self.creator.num_chapters + 1):
+            self.creator.create_single_chapter_page(n)
+        self.creator.create_complete_ebook()
+        self.creator.build_manifest.save()
+
+    def digest(self):
+        return digest_files((self.workdir / "client" / "src" / "pages").glob("*.tsx"))
+
+
+class RoutesStage(Stage):
+    """Route registration for every course in course-routes.json, starting from static App.tsx routes"""
+
+    def setup(self):
+        with open(ROOT / "client" / "src" / "course-routes.json", 'r', encoding='utf-8') as f:
+            self.courses = json.load(f)["courses"]
+        app = (ROOT / "client" / "src" / "App.tsx").read_text(encoding='utf-8')
+        app = app.replace(self.m.APP_ROUTES_IMPORT + "\n", "")
+        app = app.replace("{/* Generated course routes (client/src/course-routes.tsx) */}\n", "")
+        app = "\n".join(line for line in app.split("\n") if line.strip() != "{courseRoutes}")
+        imports = []
+        routes = []
+        for course in self.courses:
+            pages = [f"{course['slug']}-ch{n}" for n in range(1, course["chapters"] + 1)]
+            pages.append(course.get("ebook", f"{course['slug']}-complete-ebook"))
+            for page in pages:
+                component = "".join(word.capitalize() for word in page.split("-"))
+                imports.append(f'import {component} from "@/pages/{page}";')
+                routes.append(f'      <Route path="/{page}" component={{{component}}} />')
+        anchor = 'import { Switch, Route } from "wouter";'
+        app = app.replace(anchor, anchor + "\n" + "\n".join(imports), 1)
+        app = app.replace("      " + self.m.APP_CATCH_ALL_ROUTE,
+                          "\n".join(routes) + "\n      " + self.m.APP_CATCH_ALL_ROUTE, 1)
+        self.app = app
+        (self.workdir / "client" / "src").mkdir(parents=True)
+        (self.workdir / "client" / "src" / "App.tsx").write_text(app, encoding='utf-8')
+
+    def size(self):
+        return len(self.courses), len(self.app.encode('utf-8'))
+
+    def run(self):
+        for course in self.courses:
+            self.m.register_course_routes(course)
+
+    def digest(self):
+        src = self.workdir / "client" / "src"
+        return digest_files([src / "App.tsx", src / "course-routes.json", src / "course-routes.tsx"])
+
+
+class QuizStage(Stage):
+    group = "quizzes"
+
+    def setup(self):
+        self.texts = [path.read_text(encoding='utf-8') for path in self.inputs(self.group)]
+
+    def run(self):
+        self.output = [self.m.parse_quiz_text(text) for text in self.texts]
+
+    def digest(self):
+        return sha256_bytes(json.dumps(self.output, sort_keys=True).encode('utf-8'))
+
+
+STAGE_CLASSES = {"extract": ExtractStage, "format": FormatStage, "components": ComponentsStage,
+                 "routes": RoutesStage, "quiz": QuizStage}
+
+
+def run_stage(m, corpus, name, repeat):
+    """Cold run plus repeat warm runs of one stage in its own scratch directory"""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix=f"bench-{name}-") as workdir, \
+            open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        os.chdir(workdir)  # the creator writes client/, public/ and .course-cache/ relative to cwd
+        try:
+            stage = STAGE_CLASSES[name](m, corpus, workdir)
+            stage.setup()
+            started = time.perf_counter()
+            stage.run()
+            cold = time.perf_counter() - started
+            output = stage.digest()
+            warm = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                stage.run()
+                warm.append(time.perf_counter() - started)
+        finally:
+            os.chdir(cwd)
+    items, input_bytes = stage.size()
+    return {
+        "items": items,
+        "input_bytes": input_bytes,
+        "cold": {"seconds": cold},
+        "warm": {"seconds": statistics.median(warm), "min": min(warm), "runs": len(warm)} if warm else None,
+        "output": output,
+    }
+
+
+def environment():
+    def version(package):
+        try:
+            return metadata.version(package)
+        except metadata.PackageNotFoundError:
+            return None
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "pdfplumber": version("pdfplumber"),
+        "PyPDF2": version("PyPDF2"),
+        "commit": commit,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Per stage and mode: calibration-normalized time relative to the baseline; returns regressions
+
+    Warm runs are compared by their fastest run, which is the least noisy.
+    """
+    regressions = []
+    scale = baseline["calibration_seconds"] / results["calibration_seconds"]
+    print(f"\nCompared with baseline from {baseline['created']} (commit {(baseline['environment']['commit'] or '?')[:10]}):")
+    for name, result in results["stages"].items():
+        base = baseline["stages"].get(name)
+        if base is None:
+            print(f"  {name:<11} no baseline")
+            continue
+        for mode in ("cold", "warm"):
+            if not result[mode] or not base[mode]:
+                continue
+            key = "min" if mode == "warm" else "seconds"
+            seconds = result[mode][key] * scale
+            ratio = seconds / base[mode][key]
+            flag = ""
+            if ratio > 1 + tolerance and seconds - base[mode][key] > NOISE_FLOOR_SECONDS:
+                flag = "  REGRESSION"
+                regressions.append(f"{name} {mode}")
+            print(f"  {name:<11} {mode}  {ratio:6.2f}x baseline{flag}")
+        if result["output"] != base["output"]:
+            print(f"  {name:<11} output differs from the baseline's (expected after generator changes)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the course creator stages")
+    parser.add_argument("--stages", default=",".join(STAGES), help=f"comma-separated subset of {', '.join(STAGES)}")
+    parser.add_argument("--repeat", type=int, default=5, help="warm runs per stage (median is reported)")
+    parser.add_argument("--output", metavar="FILE", help="write the JSON results to FILE")
+    parser.add_argument("--json", action="store_true", help="print the JSON results instead of a table")
+    parser.add_argument("--compare", metavar="BASELINE", nargs="?", const=str(BASELINE_PATH),
+                        help="compare with a baseline (default benchmarks/baseline.json); exits 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="how much slower than the baseline counts as a regression (default 0.25 = 25%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results to benchmarks/baseline.json")
+    parser.add_argument("--select-corpus", action="store_true",
+                        help="pick the benchmark inputs from the course trees, write benchmarks/corpus.json and exit")
+    args = parser.parse_args(argv)
+
+    if args.select_corpus:
+        corpus = select_corpus()
+        CORPUS_PATH.write_text(json.dumps(corpus, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+        for group, entries in corpus["files"].items():
+            print(f"{group}: {len(entries)} file(s), {sum(e['bytes'] for e in entries) / 1024:.0f} KiB")
+        return 0
+
+    stages = [name.strip() for name in args.stages.split(",") if name.strip()]
+    unknown = [name for name in stages if name not in STAGE_CLASSES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+
+    m = load_creator()
+    corpus = load_corpus()
+    results = {
+        "version": SUITE_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": environment(),
+        "corpus": corpus["digest"],
+        "calibration_seconds": calibrate(),
+        "stages": {},
+    }
+    for name in stages:
+        result = results["stages"][name] = run_stage(m, corpus, name, args.repeat)
+        if not args.json:
+            warm = result["warm"]
+            print(f"{name:<11} {result['items']:>3} item(s)  cold {result['cold']['seconds'] * 1000:9.1f} ms"
+                  + (f"  warm {warm['seconds'] * 1000:9.1f} ms (min {warm['min'] * 1000:.1f})" if warm else ""))
+
+    data = json.dumps(results, indent=2) + '\n'
+    if args.json:
+        print(data, end="")
+    if args.output:
+        Path(args.output).write_text(data, encoding='utf-8')
+    if args.save_baseline:
+        BASELINE_PATH.write_text(data, encoding='utf-8')
+        print(f"Baseline written to {BASELINE_PATH.relative_to(ROOT)}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get("corpus") != results["corpus"]:
+            print("⚠️ The baseline was recorded on a different corpus; timings are not comparable")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
 import React from "react";
 import { Switch, Route } from "wouter";
+import { courseRoutes } from "@/course-routes";
 import { queryClient } from "./lib/queryClient";
 import { QueryClientProvider } from "@tanstack/react-query";
 import { Toaster } from "@/components/ui/toaster";
@@ -41,53 +42,12 @@ import DontBeAJonahPlayerCh8 from "@/pages/dont-be-a-jonah-player-ch8";
 import DontBeAJonahPlayerCh9 from "@/pages/dont-be-a-jonah-player-ch9";
 import DontBeAJonahPlayerCh10 from "@/pages/dont-be-a-jonah-player-ch10";
 import DontBeAJonahPlayerCh11 from "@/pages/dont-be-a-jonah-player-ch11";
-import BecomingAFireStarterCh1 from "@/pages/becoming-a-firestarter-ch1";
-import BecomingAFireStarterCh2 from "@/pages/becoming-a-firestarter-ch2";
-import BecomingAFireStarterCh3 from "@/pages/becoming-a-firestarter-ch3";
-import BecomingAFireStarterCh4 from "@/pages/becoming-a-firestarter-ch4";
-import BecomingAFireStarterCh5 from "@/pages/becoming-a-firestarter-ch5";
-import BecomingAFireStarterCh6 from "@/pages/becoming-a-firestarter-ch6";
-import BecomingAFireStarterCh7 from "@/pages/becoming-a-firestarter-ch7";
-import BecomingAFireStarterCh8 from "@/pages/becoming-a-firestarter-ch8";
-import BecomingAFireStarterCh9 from "@/pages/becoming-a-firestarter-ch9";
-import BecomingAFireStarterCh10 from "@/pages/becoming-a-firestarter-ch10";
-import BecomingAFireStarterCompleteEbook from "@/pages/becoming-a-firestarter-complete-ebook";
-import StudyingForServiceCh1 from "@/pages/studying-for-service-ch1";
-import StudyingForServiceCh2 from "@/pages/studying-for-service-ch2";
-import StudyingForServiceCh3 from "@/pages/studying-for-service-ch3";
-import StudyingForServiceCh4 from "@/pages/studying-for-service-ch4";
-import StudyingForServiceCh5 from "@/pages/studying-for-service-ch5";
-import StudyingForServiceCh6 from "@/pages/studying-for-service-ch6";
-import StudyingForServiceCh7 from "@/pages/studying-for-service-ch7";
-import StudyingForServiceCh8 from "@/pages/studying-for-service-ch8";
-import StudyingForServiceCh9 from "@/pages/studying-for-service-ch9";
-import StudyingForServiceCh10 from "@/pages/studying-for-service-ch10";
-import StudyingForServiceCh11 from "@/pages/studying-for-service-ch11";
-import StudyingForServiceCh12 from "@/pages/studying-for-service-ch12";
-import StudyingForServiceCompleteEbook from "@/pages/studying-for-service-complete-ebook";
-import GrowCh1 from "@/pages/grow-ch1";
-import GrowCh2 from "@/pages/grow-ch2";
-import GrowCh3 from "@/pages/grow-ch3";
-import GrowCh4 from "@/pages/grow-ch4";
-import GrowCompleteEbook from "@/pages/grow-complete-ebook";
-import DeaconCourseCh1 from "@/pages/deacon-course-ch1";
-import DeaconCourseCh2 from "@/pages/deacon-course-ch2";
-import DeaconCourseCh3 from "@/pages/deacon-course-ch3";
-import DeaconCourseCh4 from "@/pages/deacon-course-ch4";
-import DeaconCourseCh5 from "@/pages/deacon-course-ch5";
-import DeaconCourseCompleteEbook from "@/pages/deacon-course-complete-ebook";
 import LevelUpLeadershipWeek1 from "@/pages/level-up-leadership-week1";
 import LevelUpLeadershipWeek2 from "@/pages/level-up-leadership-week2";
 import LevelUpLeadershipWeek3 from "@/pages/level-up-leadership-week3";
 import LevelUpLeadershipWeek4 from "@/pages/level-up-leadership-week4";
 import LevelUpLeadershipWeek5 from "@/pages/level-up-leadership-week5";
 import LevelUpLeadershipWeek6 from "@/pages/level-up-leadership-week6";
-import YouthMinistryCourseCh1 from "@/pages/youth-ministry-course-ch1";
-import YouthMinistryCourseCh2 from "@/pages/youth-ministry-course-ch2";
-import YouthMinistryCourseCh3 from "@/pages/youth-ministry-course-ch3";
-import YouthMinistryCourseCh4 from "@/pages/youth-ministry-course-ch4";
-import YouthMinistryCourseCh5 from "@/pages/youth-ministry-course-ch5";
-import YouthMinistryCompleteEbook from "@/pages/youth-ministry-complete-ebook";
 import CourseDetail from "@/pages/course-detail";
 import QuizTake from "@/pages/quiz-take";
 import Profile from "@/pages/profile";
@@ -187,47 +147,6 @@ function Router() {
       <Route path="/dont-be-a-jonah-player-ch9" component={DontBeAJonahPlayerCh9} />
       <Route path="/dont-be-a-jonah-player-ch10" component={DontBeAJonahPlayerCh10} />
       <Route path="/dont-be-a-jonah-player-ch11" component={DontBeAJonahPlayerCh11} />
-      <Route path="/becoming-a-firestarter-ch1" component={BecomingAFireStarterCh1} />
-      <Route path="/becoming-a-firestarter-ch2" component={BecomingAFireStarterCh2} />
-      <Route path="/becoming-a-firestarter-ch3" component={BecomingAFireStarterCh3} />
-      <Route path="/becoming-a-firestarter-ch4" component={BecomingAFireStarterCh4} />
-      <Route path="/becoming-a-firestarter-ch5" component={BecomingAFireStarterCh5} />
-      <Route path="/becoming-a-firestarter-ch6" component={BecomingAFireStarterCh6} />
-      <Route path="/becoming-a-firestarter-ch7" component={BecomingAFireStarterCh7} />
-      <Route path="/becoming-a-firestarter-ch8" component={BecomingAFireStarterCh8} />
-      <Route path="/becoming-a-firestarter-ch9" component={BecomingAFireStarterCh9} />
-      <Route path="/becoming-a-firestarter-ch10" component={BecomingAFireStarterCh10} />
-      <Route path="/becoming-a-firestarter-complete-ebook" component={BecomingAFireStarterCompleteEbook} />
-      <Route path="/studying-for-service-ch1" component={StudyingForServiceCh1} />
-      <Route path="/studying-for-service-ch2" component={StudyingForServiceCh2} />
-      <Route path="/studying-for-service-ch3" component={StudyingForServiceCh3} />
-      <Route path="/studying-for-service-ch4" component={StudyingForServiceCh4} />
-      <Route path="/studying-for-service-ch5" component={StudyingForServiceCh5} />
-      <Route path="/studying-for-service-ch6" component={StudyingForServiceCh6} />
-      <Route path="/studying-for-service-ch7" component={StudyingForServiceCh7} />
-      <Route path="/studying-for-service-ch8" component={StudyingForServiceCh8} />
-      <Route path="/studying-for-service-ch9" component={StudyingForServiceCh9} />
-      <Route path="/studying-for-service-ch10" component={StudyingForServiceCh10} />
-      <Route path="/studying-for-service-ch11" component={StudyingForServiceCh11} />
-      <Route path="/studying-for-service-ch12" component={StudyingForServiceCh12} />
-      <Route path="/studying-for-service-complete-ebook" component={StudyingForServiceCompleteEbook} />
-      <Route path="/grow-ch1" component={GrowCh1} />
-      <Route path="/grow-ch2" component={GrowCh2} />
-      <Route path="/grow-ch3" component={GrowCh3} />
-      <Route path="/grow-ch4" component={GrowCh4} />
-      <Route path="/grow-complete-ebook" component={GrowCompleteEbook} />
-      <Route path="/deacon-course-ch1" component={DeaconCourseCh1} />
-      <Route path="/deacon-course-ch2" component={DeaconCourseCh2} />
-      <Route path="/deacon-course-ch3" component={DeaconCourseCh3} />
-      <Route path="/deacon-course-ch4" component={DeaconCourseCh4} />
-      <Route path="/deacon-course-ch5" component={DeaconCourseCh5} />
-      <Route path="/deacon-course-complete-ebook" component={DeaconCourseCompleteEbook} />
-      <Route path="/youth-ministry-course-ch1" component={YouthMinistryCourseCh1} />
-      <Route path="/youth-ministry-course-ch2" component={YouthMinistryCourseCh2} />
-      <Route path="/youth-ministry-course-ch3" component={YouthMinistryCourseCh3} />
-      <Route path="/youth-ministry-course-ch4" component={YouthMinistryCourseCh4} />
-      <Route path="/youth-ministry-course-ch5" component={YouthMinistryCourseCh5} />
-      <Route path="/youth-ministry-complete-ebook" component={YouthMinistryCompleteEbook} />
       <Route path="/level-up-leadership-week1" component={LevelUpLeadershipWeek1} />
       <Route path="/level-up-leadership-week2" component={LevelUpLeadershipWeek2} />
       <Route path="/level-up-leadership-week3" component={LevelUpLeadershipWeek3} />
@@ -258,6 +177,8 @@ function Router() {
       <Route path="/message-student" component={MessageStudent} />
       <Route path="/student-management" component={StudentManagement} />
       {/* <Route path="/clicksend-setup-guide" component={ClickSendSetupGuide} /> */}
+      {/* Generated course routes (client/src/course-routes.tsx) */}
+      {courseRoutes}
       <Route component={NotFound} />
     </Switch>
   );
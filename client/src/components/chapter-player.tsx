@@ -0,0 +1,280 @@
+import React, { useEffect, useRef, useState } from "react";
+import { useLocation } from "wouter";
+import { Button } from "@/components/ui/button";
+import { Card, CardContent } from "@/components/ui/card";
+import { Slider } from "@/components/ui/slider";
+import { Play, Pause, SkipBack, SkipForward, ArrowLeft, Volume2 } from "lucide-react";
+import { type AudioMeta, Mp3Stream, canStreamMp3 } from "@/lib/mp3Stream";
+import { warmNextChapter } from "@/lib/prefetch";
+
+// Shared runtime for the chapter pages generated by auto-create-course.py.
+// Generated pages only pass their course/chapter details and content, either
+// inline as children or as a contentUrl fetched on demand (--content-mode data).
+
+export interface ChapterPlayerTheme {
+  page: string; // page background (and padding) classes
+  player: string; // audio player card classes
+  accent: string; // play button icon color
+}
+
+export const defaultChapterPlayerTheme: ChapterPlayerTheme = {
+  page: "bg-gradient-to-br from-indigo-900 via-blue-900 to-purple-900 p-4 sm:p-6 lg:p-8",
+  player: "bg-gradient-to-r from-blue-600 to-indigo-600 border-none shadow-2xl",
+  accent: "text-blue-600",
+};
+
+interface ChapterAudioPlayerProps {
+  title: string;
+  subtitle: string;
+  audioUrl: string;
+  audioMeta?: AudioMeta; // duration and seek table, so seeking needs one range request
+  icon?: string;
+  subtitleIcon?: string;
+  coverSrc?: string;
+  coverSrcSet?: string; // WebP variants generated by auto-create-course.py
+  coverAlt?: string;
+  theme?: ChapterPlayerTheme;
+  prefetchUrl?: string; // course prefetch manifest; the next chapter is warmed while this one plays
+  chapter?: number;
+  children?: React.ReactNode; // extra controls shown above playback (e.g. a chapter picker)
+}
+
+const formatTime = (time: number) => {
+  if (!isFinite(time)) return "0:00";
+  const m = Math.floor(time / 60);
+  const s = Math.floor(time % 60);
+  return `${m}:${String(s).padStart(2, "0")}`;
+};
+
+export function ChapterAudioPlayer({
+  title,
+  subtitle,
+  audioUrl,
+  audioMeta,
+  icon = "📚",
+  subtitleIcon,
+  coverSrc,
+  coverSrcSet,
+  coverAlt,
+  theme = defaultChapterPlayerTheme,
+  prefetchUrl,
+  chapter,
+  children,
+}: ChapterAudioPlayerProps) {
+  const audioRef = useRef<HTMLAudioElement>(null);
+  const [isPlaying, setIsPlaying] = useState(false);
+  const [currentTime, setCurrentTime] = useState(0);
+  const [duration, setDuration] = useState(audioMeta?.duration ?? 0);
+  const [volume, setVolume] = useState(1);
+  const audioMetaRef = useRef(audioMeta);
+  audioMetaRef.current = audioMeta; // generated pages pass a fresh object literal each render
+
+  useEffect(() => {
+    if (audioRef.current) {
+      audioRef.current.volume = volume;
+    }
+  }, [volume]);
+
+  useEffect(() => {
+    setCurrentTime(0);
+    setDuration(audioMetaRef.current?.duration ?? 0);
+    setIsPlaying(false);
+
+    const audio = audioRef.current;
+    if (!audio) return;
+    const meta = audioMetaRef.current;
+    if (meta && canStreamMp3()) {
+      const stream = new Mp3Stream(audio, audioUrl, meta);
+      return () => stream.destroy();
+    }
+    audio.src = audioUrl;
+  }, [audioUrl]);
+
+  const handlePlayPause = () => {
+    const audio = audioRef.current;
+    if (!audio) return;
+    if (isPlaying) {
+      audio.pause();
+    } else {
+      audio.play();
+    }
+  };
+
+  const handleSkip = (delta: number) => {
+    const audio = audioRef.current;
+    if (!audio) return;
+    const next = Math.min(Math.max(0, audio.currentTime + delta), duration || audio.duration || 0);
+    audio.currentTime = next;
+    setCurrentTime(next);
+  };
+
+  return (
+    <Card className={`${theme.player} mb-8`}>
+      <CardContent className="p-4 sm:p-6">
+        <div className="flex items-start gap-4 mb-4">
+          {coverSrc && (
+            <img
+              src={coverSrc}
+              srcSet={coverSrcSet}
+              sizes="96px"
+              alt={coverAlt ?? title}
+              className="w-24 h-auto rounded shadow-lg"
+            />
+          )}
+          <div className="flex-1 min-w-0">
+            <h3 className="text-white text-xl sm:text-2xl font-bold mb-1">
+              <span className="text-2xl sm:text-3xl align-text-top mr-1">{icon}</span>
+              <span className="align-middle">{title}</span>
+            </h3>
+            <p className="text-white/90 text-base sm:text-xl font-semibold">
+              <span className="align-middle">{subtitle}</span>
+              {subtitleIcon && <span className="text-2xl align-text-top ml-1">{subtitleIcon}</span>}
+            </p>
+          </div>
+        </div>
+
+        {children}
+
+        <div className="space-y-3">
+          <div className="flex items-center justify-center gap-3">
+            <Button onClick={() => handleSkip(-15)} size="sm" variant="ghost" className="text-white hover:bg-white/20">
+              <SkipBack className="h-4 w-4 mr-1" />
+              15s
+            </Button>
+            <Button
+              onClick={handlePlayPause}
+              size="lg"
+              className={`h-14 w-14 rounded-full bg-white ${theme.accent} hover:bg-white/90 shadow-lg`}
+            >
+              {isPlaying ? <Pause className="h-7 w-7" /> : <Play className="h-7 w-7 ml-1" />}
+            </Button>
+            <Button onClick={() => handleSkip(15)} size="sm" variant="ghost" className="text-white hover:bg-white/20">
+              15s
+              <SkipForward className="h-4 w-4 ml-1" />
+            </Button>
+          </div>
+
+          <div className="space-y-1">
+            <Slider
+              value={[currentTime]}
+              max={duration || 100}
+              step={0.1}
+              onValueChange={([value]) => {
+                if (audioRef.current) {
+                  audioRef.current.currentTime = value;
+                  setCurrentTime(value);
+                }
+              }}
+              className="cursor-pointer"
+            />
+            <div className="flex justify-between text-xs sm:text-sm text-white/80">
+              <span>{formatTime(currentTime)}</span>
+              <span>{formatTime(duration)}</span>
+            </div>
+          </div>
+
+          <div className="flex items-center gap-2 justify-center">
+            <Volume2 className="h-4 w-4 text-white/70" />
+            <Slider
+              value={[volume * 100]}
+              max={100}
+              step={1}
+              onValueChange={([value]) => setVolume(value / 100)}
+              className="w-24 sm:w-32"
+            />
+          </div>
+        </div>
+
+        <audio
+          ref={audioRef}
+          onTimeUpdate={(e) => setCurrentTime(e.currentTarget.currentTime)}
+          onLoadedMetadata={(e) => setDuration(audioMetaRef.current?.duration ?? e.currentTarget.duration)}
+          onPlay={() => {
+            setIsPlaying(true);
+            if (prefetchUrl && chapter !== undefined) warmNextChapter(prefetchUrl, chapter, loadChapterContent);
+          }}
+          onPause={() => setIsPlaying(false)}
+          onEnded={() => setIsPlaying(false)}
+        />
+      </CardContent>
+    </Card>
+  );
+}
+
+// Chapter data files are immutable per URL for the life of the page, so each is fetched once.
+const chapterContentCache = new Map<string, Promise<string>>();
+
+export function loadChapterContent(url: string): Promise<string> {
+  let pending = chapterContentCache.get(url);
+  if (!pending) {
+    pending = fetch(url)
+      .then((res) => {
+        if (!res.ok) throw new Error(`Failed to load ${url}: ${res.status}`);
+        return res.json();
+      })
+      .then((data: { html: string }) => data.html);
+    pending.catch(() => chapterContentCache.delete(url)); // allow a retry
+    chapterContentCache.set(url, pending);
+  }
+  return pending;
+}
+
+export function ChapterContent({ url }: { url: string }) {
+  const [html, setHtml] = useState<string | null>(null);
+  const [failed, setFailed] = useState(false);
+
+  useEffect(() => {
+    let cancelled = false;
+    setHtml(null);
+    setFailed(false);
+    loadChapterContent(url)
+      .then((content) => !cancelled && setHtml(content))
+      .catch(() => !cancelled && setFailed(true));
+    return () => {
+      cancelled = true;
+    };
+  }, [url]);
+
+  if (failed) return <p className="text-red-600">This chapter could not be loaded. Please refresh the page.</p>;
+  if (html === null) return <p className="text-gray-500">Loading chapter...</p>;
+  return <div dangerouslySetInnerHTML={{ __html: html }} />;
+}
+
+interface ChapterPlayerProps extends Omit<ChapterAudioPlayerProps, "children"> {
+  courseId?: number; // shows a "Back to Course" button when set
+  contentUrl?: string; // chapter content data file, used when no children are given
+  children?: React.ReactNode; // chapter content
+}
+
+export default function ChapterPlayer({
+  courseId,
+  contentUrl,
+  theme = defaultChapterPlayerTheme,
+  children,
+  ...player
+}: ChapterPlayerProps) {
+  const [, setLocation] = useLocation();
+
+  return (
+    <div className={`min-h-screen ${theme.page}`}>
+      <div className="max-w-4xl mx-auto">
+        {courseId !== undefined && (
+          <div className="mb-6 flex items-center justify-between">
+            <Button onClick={() => setLocation(`/course/${courseId}`)} variant="ghost" className="text-white hover:bg-white/20">
+              <ArrowLeft className="mr-2 h-4 w-4" />
+              Back to Course
+            </Button>
+          </div>
+        )}
+
+        <ChapterAudioPlayer theme={theme} {...player} />
+
+        <Card className="bg-white shadow-xl mb-8">
+          <CardContent className="p-8 prose max-w-none">
+            {children ?? (contentUrl && <ChapterContent url={contentUrl} />)}
+          </CardContent>
+        </Card>
+      </div>
+    </div>
+  );
+}
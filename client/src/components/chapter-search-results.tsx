@@ -0,0 +1,46 @@
+import { useEffect, useState } from "react";
+import { Link } from "wouter";
+import { Badge } from "@/components/ui/badge";
+import { type ChapterHit, searchChapters } from "@/lib/search";
+
+const DEBOUNCE_MS = 200;
+
+// Chapters whose text matches the query (words or scripture references such as
+// "John 3:16"), from the search index built by auto-create-course.py.
+export default function ChapterSearchResults({ query }: { query: string }) {
+  const [hits, setHits] = useState<ChapterHit[]>([]);
+
+  useEffect(() => {
+    const q = query.trim();
+    if (q.length < 2) {
+      setHits([]);
+      return;
+    }
+    let cancelled = false;
+    const timer = setTimeout(() => {
+      searchChapters(q)
+        .then((results) => !cancelled && setHits(results))
+        .catch(() => !cancelled && setHits([]));
+    }, DEBOUNCE_MS);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [query]);
+
+  if (hits.length === 0) return null;
+  return (
+    <div className="mt-4">
+      <p className="text-sm text-gray-600 dark:text-gray-300 mb-2">Found in chapter text:</p>
+      <div className="flex flex-wrap gap-2">
+        {hits.map((hit) => (
+          <Link key={`${hit.slug}-${hit.chapter}`} href={hit.url}>
+            <Badge variant="outline" className="px-3 py-1 cursor-pointer hover:bg-blue-50 dark:hover:bg-gray-800">
+              {hit.course} · Chapter {hit.chapter}
+            </Badge>
+          </Link>
+        ))}
+      </div>
+    </div>
+  );
+}
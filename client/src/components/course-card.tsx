@@ -7,6 +7,7 @@ import { useMutation, useQuery } from "@tanstack/react-query";
 import { apiRequest, queryClient } from "@/lib/queryClient";
 import { useToast } from "@/hooks/use-toast";
 import { Enrollment } from "@/types/enrollment";
+import { responsiveImage } from "@/image-variants";
 
 interface CourseCardProps {
   course: {
@@ -103,12 +104,13 @@ export default function CourseCard({ course }: CourseCardProps) {
         {/* Course Cover Image */}
         <div className="flex justify-center mb-4">
           <img 
-            src={course.id === 1 ? "/acts-in-action-cover.png" : 
+            {...responsiveImage(course.id === 1 ? "/acts-in-action-cover.png" : 
                   course.id === 2 ? "/becoming-a-fire-starter-cover.jpeg" :
                   course.id === 3 ? "/dont-be-a-jonah-cover.jpg" :
                   course.id === 4 ? "/grow-cover.png" :
                   course.id === 5 ? "/studying-for-service-cover.jpg" :
-                  "/course-cover-placeholder.png"} 
+                  "/course-cover-placeholder.png")} 
+            sizes="96px"
             alt={`${course.name} Cover`}
             className="w-24 h-32 object-cover rounded-lg shadow-md border border-gray-200"
           />
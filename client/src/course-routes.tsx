@@ -0,0 +1,104 @@
+// Generated by auto-create-course.py from course-routes.json - do not edit by hand.
+// Each course gets one route; its pages are separate chunks fetched when first opened.
+import React, { Suspense, lazy } from "react";
+import { Route } from "wouter";
+import NotFound from "@/pages/not-found";
+
+type LazyPage = React.LazyExoticComponent<React.ComponentType>;
+
+interface CourseRoutes {
+  slug: string;
+  path: RegExp; // matches /<slug>-ch<N> and the complete e-book
+  chapters: Record<number, LazyPage>;
+  ebook: LazyPage;
+}
+
+const courses: CourseRoutes[] = [
+  {
+    slug: "becoming-a-firestarter",
+    path: /^\/(?:becoming-a-firestarter-ch(?<chapter>\d+)|becoming-a-firestarter-complete-ebook)$/,
+    chapters: {
+      1: lazy(() => import("@/pages/becoming-a-firestarter-ch1")),
+      2: lazy(() => import("@/pages/becoming-a-firestarter-ch2")),
+      3: lazy(() => import("@/pages/becoming-a-firestarter-ch3")),
+      4: lazy(() => import("@/pages/becoming-a-firestarter-ch4")),
+      5: lazy(() => import("@/pages/becoming-a-firestarter-ch5")),
+      6: lazy(() => import("@/pages/becoming-a-firestarter-ch6")),
+      7: lazy(() => import("@/pages/becoming-a-firestarter-ch7")),
+      8: lazy(() => import("@/pages/becoming-a-firestarter-ch8")),
+      9: lazy(() => import("@/pages/becoming-a-firestarter-ch9")),
+      10: lazy(() => import("@/pages/becoming-a-firestarter-ch10")),
+    },
+    ebook: lazy(() => import("@/pages/becoming-a-firestarter-complete-ebook")),
+  },
+  {
+    slug: "deacon-course",
+    path: /^\/(?:deacon-course-ch(?<chapter>\d+)|deacon-course-complete-ebook)$/,
+    chapters: {
+      1: lazy(() => import("@/pages/deacon-course-ch1")),
+      2: lazy(() => import("@/pages/deacon-course-ch2")),
+      3: lazy(() => import("@/pages/deacon-course-ch3")),
+      4: lazy(() => import("@/pages/deacon-course-ch4")),
+      5: lazy(() => import("@/pages/deacon-course-ch5")),
+    },
+    ebook: lazy(() => import("@/pages/deacon-course-complete-ebook")),
+  },
+  {
+    slug: "grow",
+    path: /^\/(?:grow-ch(?<chapter>\d+)|grow-complete-ebook)$/,
+    chapters: {
+      1: lazy(() => import("@/pages/grow-ch1")),
+      2: lazy(() => import("@/pages/grow-ch2")),
+      3: lazy(() => import("@/pages/grow-ch3")),
+      4: lazy(() => import("@/pages/grow-ch4")),
+    },
+    ebook: lazy(() => import("@/pages/grow-complete-ebook")),
+  },
+  {
+    slug: "studying-for-service",
+    path: /^\/(?:studying-for-service-ch(?<chapter>\d+)|studying-for-service-complete-ebook)$/,
+    chapters: {
+      1: lazy(() => import("@/pages/studying-for-service-ch1")),
+      2: lazy(() => import("@/pages/studying-for-service-ch2")),
+      3: lazy(() => import("@/pages/studying-for-service-ch3")),
+      4: lazy(() => import("@/pages/studying-for-service-ch4")),
+      5: lazy(() => import("@/pages/studying-for-service-ch5")),
+      6: lazy(() => import("@/pages/studying-for-service-ch6")),
+      7: lazy(() => import("@/pages/studying-for-service-ch7")),
+      8: lazy(() => import("@/pages/studying-for-service-ch8")),
+      9: lazy(() => import("@/pages/studying-for-service-ch9")),
+      10: lazy(() => import("@/pages/studying-for-service-ch10")),
+      11: lazy(() => import("@/pages/studying-for-service-ch11")),
+      12: lazy(() => import("@/pages/studying-for-service-ch12")),
+    },
+    ebook: lazy(() => import("@/pages/studying-for-service-complete-ebook")),
+  },
+  {
+    slug: "youth-ministry-course",
+    path: /^\/(?:youth-ministry-course-ch(?<chapter>\d+)|youth-ministry-complete-ebook)$/,
+    chapters: {
+      1: lazy(() => import("@/pages/youth-ministry-course-ch1")),
+      2: lazy(() => import("@/pages/youth-ministry-course-ch2")),
+      3: lazy(() => import("@/pages/youth-ministry-course-ch3")),
+      4: lazy(() => import("@/pages/youth-ministry-course-ch4")),
+      5: lazy(() => import("@/pages/youth-ministry-course-ch5")),
+    },
+    ebook: lazy(() => import("@/pages/youth-ministry-complete-ebook")),
+  },
+];
+
+function CoursePage({ course, chapter }: { course: CourseRoutes; chapter?: string }) {
+  const Page = chapter === undefined ? course.ebook : course.chapters[Number(chapter)];
+  if (!Page) return <NotFound />;
+  return (
+    <Suspense fallback={<div className="min-h-screen bg-gradient-to-br from-indigo-900 via-blue-900 to-purple-900" />}>
+      <Page />
+    </Suspense>
+  );
+}
+
+export const courseRoutes = courses.map((course) => (
+  <Route key={course.slug} path={course.path}>
+    {(params: { chapter?: string }) => <CoursePage course={course} chapter={params.chapter} />}
+  </Route>
+));
@@ -0,0 +1,22 @@
+// WebP variants of public images, keyed by the original image's URL. The
+// registry (image-variants.json) and the variants under public/img/ are build
+// outputs of auto-create-course.py (npm run build runs it first, see
+// "prebuild"); without them every image is served as its original file.
+
+export interface ResponsiveImage {
+  src: string;
+  srcSet?: string;
+  width?: number;
+  height?: number;
+}
+
+type Registry = { images: Record<string, Required<ResponsiveImage>> };
+
+// A glob instead of an import, so a checkout that hasn't built images yet still compiles
+const registries = import.meta.glob<Registry>("./image-variants.json", { eager: true, import: "default" });
+const images = registries["./image-variants.json"]?.images ?? {};
+
+// <img> props for an image: its WebP srcset when variants were generated, else the original URL
+export function responsiveImage(src: string): ResponsiveImage {
+  return images[src] ?? { src };
+}
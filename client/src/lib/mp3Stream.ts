@@ -0,0 +1,181 @@
+// MP3 metadata written into chapter pages by auto-create-course.py (scan_mp3).
+export interface AudioMeta {
+  duration: number; // seconds
+  bitrate: number; // average bits per second
+  bytes: number; // byte offset where the audio data ends
+  seekInterval: number; // seconds between seek table entries
+  seekTable: number[]; // byte offset of the frame playing at k * seekInterval
+  seekTimes: number[]; // when each of those frames starts (at or just before k * seekInterval)
+}
+
+const CHUNK_BYTES = 256 * 1024;
+const BUFFER_AHEAD = 30; // seconds fetched ahead of the playhead
+const KEEP_BEHIND = 30; // seconds kept behind it before being evicted
+
+export function canStreamMp3() {
+  return typeof MediaSource !== "undefined" && MediaSource.isTypeSupported("audio/mpeg");
+}
+
+// First chunks fetched ahead of time by prefetchAudio, keyed by URL and byte offset
+const prefetched = new Map<string, Promise<ArrayBuffer | null>>();
+
+// Fetch up to maxBytes of an MP3 from its first frame so the Mp3Stream that
+// later opens it starts without waiting for the network.
+export function prefetchAudio(url: string, start: number, end: number, maxBytes: number) {
+  const key = `${url}@${start}`;
+  const bytes = Math.min(maxBytes, CHUNK_BYTES, end - start);
+  if (bytes <= 0 || prefetched.has(key)) return;
+  const chunk = fetch(url, { headers: { Range: `bytes=${start}-${start + bytes - 1}` } })
+    .then((res) => (res.status === 206 ? res.arrayBuffer() : null))
+    .catch(() => null);
+  prefetched.set(key, chunk);
+}
+
+function takePrefetched(url: string, offset: number) {
+  const key = `${url}@${offset}`;
+  const chunk = prefetched.get(key);
+  prefetched.delete(key);
+  return chunk ?? Promise.resolve(null);
+}
+
+function bufferedRangeAt(buffered: TimeRanges, time: number) {
+  for (let i = 0; i < buffered.length; i++) {
+    if (buffered.start(i) <= time && time < buffered.end(i)) return i;
+  }
+  return -1;
+}
+
+// Feeds an <audio> element through Media Source Extensions in byte ranges.
+// Seeking to a position that isn't buffered restarts fetching at the frame the
+// seek table gives for it, so a seek costs one range request instead of the
+// browser probing through a VBR file. Any failure falls back to a plain src.
+export class Mp3Stream {
+  private mediaSource = new MediaSource();
+  private sourceBuffer: SourceBuffer | null = null;
+  private objectUrl: string;
+  private offset = 0; // next byte to fetch
+  private controller: AbortController | null = null;
+  private generation = 0; // bumped on every restart so stale chunks are dropped
+  private pumping = false;
+
+  constructor(
+    private audio: HTMLAudioElement,
+    private url: string,
+    private meta: AudioMeta,
+  ) {
+    this.objectUrl = URL.createObjectURL(this.mediaSource);
+    this.mediaSource.addEventListener("sourceopen", this.handleOpen, { once: true });
+    audio.addEventListener("timeupdate", this.pump);
+    audio.addEventListener("seeking", this.handleSeeking);
+    audio.src = this.objectUrl;
+  }
+
+  destroy() {
+    this.generation++;
+    this.controller?.abort();
+    this.audio.removeEventListener("timeupdate", this.pump);
+    this.audio.removeEventListener("seeking", this.handleSeeking);
+    URL.revokeObjectURL(this.objectUrl);
+  }
+
+  private handleOpen = () => {
+    try {
+      this.mediaSource.duration = this.meta.duration;
+      this.sourceBuffer = this.mediaSource.addSourceBuffer("audio/mpeg");
+      this.sourceBuffer.mode = "sequence";
+      this.offset = this.meta.seekTable[0] ?? 0;
+      this.pump();
+    } catch (error) {
+      this.fallback(error);
+    }
+  };
+
+  private handleSeeking = () => {
+    const sb = this.sourceBuffer;
+    if (sb && bufferedRangeAt(sb.buffered, this.audio.currentTime) < 0) {
+      this.restartAt(this.audio.currentTime).catch((error) => this.fallback(error));
+    }
+  };
+
+  private updateEnd() {
+    return new Promise<void>((resolve) => {
+      this.sourceBuffer!.addEventListener("updateend", () => resolve(), { once: true });
+    });
+  }
+
+  private async restartAt(time: number) {
+    const sb = this.sourceBuffer!;
+    this.generation++;
+    this.controller?.abort();
+    this.pumping = false;
+    // Reset the parser (it may hold half a frame), then drop what was buffered
+    if (this.mediaSource.readyState === "open") sb.abort();
+    if (sb.buffered.length > 0) {
+      sb.remove(0, Infinity);
+      await this.updateEnd();
+    }
+    const k = Math.min(Math.floor(time / this.meta.seekInterval), this.meta.seekTable.length - 1);
+    // The frame's own start time, so appended audio lines up with the timeline
+    sb.timestampOffset = this.meta.seekTimes[k];
+    this.offset = this.meta.seekTable[k];
+    this.pump();
+  }
+
+  private bufferedAhead() {
+    const buffered = this.sourceBuffer!.buffered;
+    const index = bufferedRangeAt(buffered, this.audio.currentTime);
+    return index < 0 ? 0 : buffered.end(index) - this.audio.currentTime;
+  }
+
+  private async evictBehind() {
+    const sb = this.sourceBuffer!;
+    const before = this.audio.currentTime - KEEP_BEHIND;
+    if (sb.buffered.length > 0 && sb.buffered.start(0) < before) {
+      sb.remove(0, before);
+      await this.updateEnd();
+    }
+  }
+
+  private async fetchChunk() {
+    this.controller = new AbortController();
+    const end = Math.min(this.offset + CHUNK_BYTES, this.meta.bytes) - 1;
+    const res = await fetch(this.url, {
+      headers: { Range: `bytes=${this.offset}-${end}` },
+      signal: this.controller.signal,
+    });
+    if (res.status !== 206) throw new Error(`Range request for ${this.url} returned ${res.status}`);
+    return res.arrayBuffer();
+  }
+
+  private pump = async () => {
+    const sb = this.sourceBuffer;
+    if (!sb || this.pumping) return;
+    this.pumping = true;
+    const generation = this.generation;
+    try {
+      while (generation === this.generation && this.offset < this.meta.bytes && this.bufferedAhead() < BUFFER_AHEAD) {
+        const chunk = (await takePrefetched(this.url, this.offset)) ?? (await this.fetchChunk());
+        if (generation !== this.generation) return;
+        await this.evictBehind();
+        sb.appendBuffer(chunk);
+        await this.updateEnd();
+        this.offset += chunk.byteLength;
+      }
+      if (generation === this.generation && this.offset >= this.meta.bytes && this.mediaSource.readyState === "open") {
+        this.mediaSource.endOfStream();
+      }
+    } catch (error) {
+      if (generation === this.generation && (error as Error).name !== "AbortError") this.fallback(error);
+    } finally {
+      if (generation === this.generation) this.pumping = false;
+    }
+  };
+
+  private fallback(error: unknown) {
+    console.warn("Streaming audio failed, falling back to direct playback:", error);
+    const time = this.audio.currentTime;
+    this.destroy();
+    this.audio.src = this.url;
+    this.audio.currentTime = time;
+  }
+}
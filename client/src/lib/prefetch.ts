@@ -0,0 +1,79 @@
+// Warms the next chapter while the current one plays, using the per-course
+// manifest auto-create-course.py writes to public/prefetch/<slug>.json
+// (write_prefetch_manifest). The next chapter's content data file and the
+// first chunk of its audio are fetched within the manifest's byte cap, which
+// shrinks on slow connections; nothing is fetched with Save-Data on.
+import { canStreamMp3, prefetchAudio } from "@/lib/mp3Stream";
+
+interface PrefetchChapter {
+  url: string;
+  next: number | null;
+  audioUrl: string | null;
+  audioBytes: number | null;
+  audioStart: number; // byte offset of the first MP3 frame
+  audioEnd: number | null; // byte offset where the audio data ends
+  contentUrl: string | null; // only in --content-mode data
+  contentBytes: number | null;
+}
+
+interface PrefetchManifest {
+  version: number;
+  maxBytes: number;
+  chapters: Record<string, PrefetchChapter>;
+}
+
+interface NetworkInformation {
+  saveData?: boolean;
+  effectiveType?: string;
+}
+
+const manifests = new Map<string, Promise<PrefetchManifest | null>>();
+const warmed = new Set<string>();
+const warmingAudio: HTMLAudioElement[] = []; // keeps metadata-only loads alive
+
+function loadManifest(url: string) {
+  let manifest = manifests.get(url);
+  if (!manifest) {
+    manifest = fetch(url)
+      .then((res) => (res.ok ? res.json() : null))
+      .catch(() => null);
+    manifests.set(url, manifest);
+  }
+  return manifest;
+}
+
+function byteCap(maxBytes: number) {
+  const connection = (navigator as Navigator & { connection?: NetworkInformation }).connection;
+  if (connection?.saveData || connection?.effectiveType === "slow-2g" || connection?.effectiveType === "2g") return 0;
+  return connection?.effectiveType === "3g" ? maxBytes / 4 : maxBytes;
+}
+
+// Fetch what the chapter after `chapter` needs to start instantly; once per chapter.
+export async function warmNextChapter(
+  manifestUrl: string,
+  chapter: number,
+  loadContent: (url: string) => Promise<string>,
+) {
+  const manifest = await loadManifest(manifestUrl);
+  const next = manifest?.chapters[String(chapter)]?.next;
+  const target = next ? manifest!.chapters[String(next)] : undefined;
+  const key = `${manifestUrl}#${next}`;
+  if (!target || warmed.has(key)) return;
+  warmed.add(key);
+
+  let budget = byteCap(manifest!.maxBytes);
+  if (target.contentUrl && target.contentBytes !== null && target.contentBytes <= budget) {
+    budget -= target.contentBytes;
+    loadContent(target.contentUrl).catch(() => undefined);
+  }
+  if (!target.audioUrl || budget <= 0) return;
+  if (target.audioEnd !== null && canStreamMp3()) {
+    prefetchAudio(target.audioUrl, target.audioStart, target.audioEnd, budget); // Mp3Stream's first chunk
+  } else {
+    const audio = new Audio();
+    audio.preload = "metadata";
+    audio.src = target.audioUrl;
+    warmingAudio.push(audio);
+    if (warmingAudio.length > 2) warmingAudio.shift()!.removeAttribute("src");
+  }
+}
@@ -0,0 +1,25 @@
+import { apiRequest } from "./queryClient";
+
+// Static quiz bundles written by the quiz seed scripts (server/quiz-bundles.ts).
+// The manifest is small and revalidated; bundles are immutable per URL.
+let manifest: Promise<Record<string, string>> | null = null;
+
+function loadManifest() {
+  if (!manifest) {
+    manifest = fetch("/quizzes/manifest.json", { cache: "no-cache" })
+      .then((res) => (res.ok ? res.json() : {}))
+      .catch(() => ({}));
+  }
+  return manifest;
+}
+
+// Load a quiz from its static bundle, falling back to /api/quizzes/:quizId
+// for quizzes without one (e.g. created in the admin portal).
+export async function fetchQuiz(quizId: string) {
+  const bundleUrl = (await loadManifest())[quizId];
+  if (bundleUrl) {
+    const res = await fetch(bundleUrl);
+    if (res.ok) return res.json();
+  }
+  return apiRequest("GET", `/api/quizzes/${quizId}`);
+}
@@ -0,0 +1,183 @@
+// Chapter text search over the sharded index auto-create-course.py writes to
+// public/search/. The manifest lists the indexed courses (with chapter lengths)
+// and the shard holding each two-character term prefix, plus the tokenizer
+// tables, so queries are normalized exactly like the indexed text. A query only
+// fetches the shards of its own terms; shards are immutable per URL.
+
+interface Normalization {
+  stopwords: string[];
+  suffixes: string[];
+  books: Record<string, string>; // alias -> canonical book
+  numbered: Record<string, number>; // book -> how many numbered books share its name
+  ordinals: Record<string, number>;
+  maxRange: number;
+}
+
+interface SearchManifest {
+  version: number;
+  courses: Record<string, { name: string; lengths: Record<string, number> }>;
+  shards: Record<string, string>;
+  normalization: Normalization;
+}
+
+type Shard = Record<string, Record<string, number[]>>; // term -> slug -> [chapter, tf, ...]
+
+export interface ChapterHit {
+  slug: string;
+  course: string;
+  chapter: number;
+  url: string;
+  score: number;
+}
+
+const SHARD_PREFIX = 2;
+const K1 = 1.2; // BM25 term frequency saturation
+const B = 0.75; // BM25 length normalization
+
+let manifest: Promise<SearchManifest | null> | null = null;
+const shards = new Map<string, Promise<Shard>>();
+let refPattern: RegExp | null = null;
+
+function loadManifest() {
+  if (!manifest) {
+    manifest = fetch("/search/manifest.json", { cache: "no-cache" })
+      .then((res) => (res.ok ? res.json() : null))
+      .catch(() => null);
+  }
+  return manifest;
+}
+
+function loadShard(url: string) {
+  let shard = shards.get(url);
+  if (!shard) {
+    shard = fetch(url).then((res) => (res.ok ? res.json() : {}));
+    shard.catch(() => shards.delete(url)); // allow a retry
+    shards.set(url, shard);
+  }
+  return shard;
+}
+
+// Mirrors search_stem() in auto-create-course.py
+function stem(word: string, suffixes: string[]) {
+  if (word.length <= 3 || !/^[a-z]+$/.test(word)) return word;
+  for (const suffix of suffixes) {
+    if (word.endsWith(suffix) && word.length - suffix.length >= 3) {
+      if (suffix === "s" && "siu".includes(word[word.length - 2])) break;
+      word = word.slice(0, -suffix.length) + (suffix === "ies" || suffix === "ied" ? "y" : "");
+      break;
+    }
+  }
+  if (word.length > 4 && word.endsWith("e")) word = word.slice(0, -1);
+  const last = word[word.length - 1];
+  if (word.length > 3 && last === word[word.length - 2] && !"lsz".includes(last)) word = word.slice(0, -1);
+  return word;
+}
+
+function scripturePattern(norm: Normalization) {
+  if (!refPattern) {
+    const aliases = Object.keys(norm.books)
+      .sort((a, b) => b.length - a.length)
+      .map((alias) => alias.replace(/ /g, "\\s+"))
+      .join("|");
+    refPattern = new RegExp(
+      String.raw`\b(?:(1st|2nd|3rd|first|second|third|iii|ii|i|[123])\s*)?(${aliases})\.?\s+(\d{1,3})(?:\s*:\s*(\d{1,3})(?:\s*[-–]\s*(\d{1,3}))?)?\b`,
+      "g",
+    );
+  }
+  return refPattern;
+}
+
+// Each group is a set of alternative terms; a chapter must match every group.
+// A scripture reference becomes one group (any verse of "John 3:16-18"), and
+// its text is not also searched as words.
+function queryGroups(query: string, norm: Normalization): string[][] {
+  const groups: string[][] = [];
+  const text = query.toLowerCase().replace(/’/g, "'").replace(scripturePattern(norm), (match, ordinal, alias, chapter, verse, verseEnd) => {
+    let book = norm.books[alias.replace(/\s+/g, " ")];
+    const number = ordinal ? norm.ordinals[ordinal] : undefined;
+    if (book in norm.numbered) {
+      if (number === undefined && book !== "john") return match;
+      if (number !== undefined) {
+        if (number > norm.numbered[book]) return match;
+        book = `${number}${book}`;
+      }
+    }
+    if (verse === undefined && alias.length <= 2) return match;
+    const ref = `${book}.${Number(chapter)}`;
+    if (verse === undefined) {
+      groups.push([ref]);
+    } else {
+      const first = Number(verse);
+      const last = verseEnd && Number(verseEnd) >= first ? Number(verseEnd) : first;
+      const verses: string[] = [];
+      for (let v = first; v <= Math.min(last, first + norm.maxRange); v++) verses.push(`${ref}.${v}`);
+      groups.push(verses);
+    }
+    return " ";
+  });
+  const stopwords = new Set(norm.stopwords);
+  for (let word of text.match(/[a-z0-9]+(?:'[a-z]+)*/g) ?? []) {
+    word = word.split("'")[0];
+    if (!stopwords.has(word) && word.length > 1 && !/^\d+$/.test(word)) groups.push([stem(word, norm.suffixes)]);
+  }
+  return groups;
+}
+
+// Chapters containing every query term (or scripture reference), best BM25 match first
+export async function searchChapters(query: string, limit = 20): Promise<ChapterHit[]> {
+  const index = await loadManifest();
+  if (!index) return [];
+  const groups = queryGroups(query, index.normalization);
+  if (groups.length === 0) return [];
+
+  const terms = Array.from(new Set(groups.flat()));
+  const postings = new Map<string, Record<string, number[]>>();
+  await Promise.all(
+    terms.map(async (term) => {
+      const url = index.shards[term.slice(0, SHARD_PREFIX)];
+      postings.set(term, url ? (await loadShard(url))[term] ?? {} : {});
+    }),
+  );
+
+  const lengths = Object.values(index.courses).flatMap((course) => Object.values(course.lengths));
+  const total = lengths.length;
+  const average = lengths.reduce((sum, n) => sum + n, 0) / Math.max(total, 1);
+  const scores = new Map<string, { score: number; groups: number }>();
+
+  groups.forEach((group) => {
+    const groupScores = new Map<string, number>();
+    for (const term of group) {
+      const courses = postings.get(term)!;
+      const df = Object.values(courses).reduce((n, entries) => n + entries.length / 2, 0);
+      const idf = Math.log(1 + (total - df + 0.5) / (df + 0.5));
+      for (const [slug, entries] of Object.entries(courses)) {
+        for (let i = 0; i < entries.length; i += 2) {
+          const [chapter, tf] = [entries[i], entries[i + 1]];
+          const length = index.courses[slug]?.lengths[chapter] ?? average;
+          const key = `${slug}/${chapter}`;
+          const score = (idf * tf * (K1 + 1)) / (tf + K1 * (1 - B + (B * length) / average));
+          groupScores.set(key, (groupScores.get(key) ?? 0) + score);
+        }
+      }
+    }
+    groupScores.forEach((score, key) => {
+      const entry = scores.get(key) ?? { score: 0, groups: 0 };
+      scores.set(key, { score: entry.score + score, groups: entry.groups + 1 });
+    });
+  });
+
+  return Array.from(scores.entries())
+    .filter(([, entry]) => entry.groups === groups.length)
+    .sort(([, a], [, b]) => b.score - a.score)
+    .slice(0, limit)
+    .map(([key, entry]) => {
+      const [slug, chapter] = key.split("/");
+      return {
+        slug,
+        course: index.courses[slug]?.name ?? slug,
+        chapter: Number(chapter),
+        url: `/${slug}-ch${chapter}`,
+        score: entry.score,
+      };
+    });
+}
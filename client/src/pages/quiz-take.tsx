@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { useParams, useLocation } from 'wouter';
 import { useQuery, useMutation } from '@tanstack/react-query';
 import { apiRequest, queryClient } from '@/lib/queryClient';
+import { fetchQuiz } from '@/lib/quizBundles';
 import { useToast } from '@/hooks/use-toast';
 import { useAuth } from '@/hooks/useAuth';
 import Navigation from '@/components/navigation';
@@ -187,7 +188,9 @@ export default function QuizTake() {
   }, [answers, currentQuestion, timeLeft, isStarted, isSubmitted, sessionKey]);
 
   const { data: quiz, isLoading, error } = useQuery<Quiz>({
-    queryKey: [`/api/quizzes/${id}`],
+    // Taking a quiz only needs the static bundle; review needs the answer key from the API
+    queryKey: [`/api/quizzes/${id}`, isReviewMode ? "review" : "bundle"],
+    queryFn: isReviewMode ? undefined : () => fetchQuiz(id!),
     enabled: !!id,
   });
 
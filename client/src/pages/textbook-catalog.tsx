@@ -10,6 +10,7 @@ import { Tooltip, TooltipContent, TooltipProvider, TooltipTrigger } from "@/comp
 import { useLocation } from "wouter";
 import Navigation from "@/components/navigation";
 import Footer from "@/components/footer";
+import ChapterSearchResults from "@/components/chapter-search-results";
 import { FaBook, FaEye, FaUser, FaCalendar, FaGraduationCap, FaTimes, FaBookmark, FaCheck, FaPlus, FaDownload, FaBookOpen } from "react-icons/fa";
 // import growCover from "@assets/image_1753296696582.png";
 // import studyingForServiceCover from "@assets/Image 2_1753137106145.jpg";
@@ -616,6 +617,7 @@ export default function TextbookCatalog() {
               Ministry Leadership Authors
             </Badge>
           </div>
+          <ChapterSearchResults query={search} />
         </div>
 
         {/* Textbooks Grid */}
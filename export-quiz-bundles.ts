@@ -0,0 +1,12 @@
+import { quizIndex } from "./server/quiz-index.js";
+import { writeQuizBundles } from "./server/quiz-bundles.js";
+
+// Rebuild the static quiz bundles for every quiz in server/quiz-index.json,
+// e.g. after editing questions in the database:
+//   DATABASE_URL="your-db-url" npx tsx export-quiz-bundles.ts
+writeQuizBundles(quizIndex)
+  .then(() => process.exit(0))
+  .catch((error) => {
+    console.error("❌ Error exporting quiz bundles:", error);
+    process.exit(1);
+  });
@@ -0,0 +1,80 @@
+import crypto from "crypto";
+import fs from "fs";
+import path from "path";
+import zlib from "zlib";
+import { storage } from "./storage";
+
+// Static, versioned quiz bundles: the GET /api/quizzes/:quizId payload without
+// the answer key, written to public/quizzes/<id>.<hash>.json so nginx can serve
+// them with immutable caching. public/quizzes/manifest.json maps quiz IDs and
+// slugs to the current bundle and is revalidated on every load.
+export const QUIZ_BUNDLE_DIR = path.join(process.cwd(), "public", "quizzes");
+const MANIFEST_PATH = path.join(QUIZ_BUNDLE_DIR, "manifest.json");
+
+function writeAtomic(file: string, data: string | Buffer) {
+  fs.writeFileSync(`${file}.tmp`, data);
+  fs.renameSync(`${file}.tmp`, file);
+}
+
+// Precompressed siblings for nginx gzip_static/brotli_static, kept only when
+// they save at least 10% (same rule as auto-create-course.py)
+function writeCompressed(file: string, data: string) {
+  const raw = Buffer.from(data);
+  const encodings: [string, Buffer][] = [
+    [".gz", zlib.gzipSync(raw, { level: 9 })],
+    [".br", zlib.brotliCompressSync(raw, { params: { [zlib.constants.BROTLI_PARAM_QUALITY]: 11 } })],
+  ];
+  for (const [ext, packed] of encodings) {
+    if (raw.length >= 1024 && packed.length <= raw.length * 0.9) {
+      writeAtomic(file + ext, packed);
+    } else {
+      fs.rmSync(file + ext, { force: true });
+    }
+  }
+}
+
+function removeBundle(file: string) {
+  for (const ext of ["", ".gz", ".br"]) {
+    fs.rmSync(file + ext, { force: true });
+  }
+}
+
+// Write (or refresh) the bundles for the given slug -> quiz ID entries
+export async function writeQuizBundles(quizIds: Iterable<readonly [string, number]>) {
+  fs.mkdirSync(QUIZ_BUNDLE_DIR, { recursive: true });
+  const manifest: Record<string, string> = fs.existsSync(MANIFEST_PATH)
+    ? JSON.parse(fs.readFileSync(MANIFEST_PATH, "utf-8"))
+    : {};
+  let written = 0;
+
+  for (const [slug, id] of quizIds) {
+    const quiz = (await storage.getQuiz(id)) as any;
+    if (!quiz) {
+      console.warn(`⚠️  Quiz ${slug} (ID: ${id}) not found, no bundle written`);
+      continue;
+    }
+    const bundle = JSON.stringify({
+      ...quiz,
+      questions: quiz.questions.map(({ correctAnswer, ...question }: any) => question),
+    });
+    const hash = crypto.createHash("sha256").update(bundle).digest("hex").slice(0, 12);
+    const url = `/quizzes/${id}.${hash}.json`;
+    const previous = manifest[String(id)];
+
+    if (previous !== url) {
+      const file = path.join(QUIZ_BUNDLE_DIR, path.basename(url));
+      writeAtomic(file, bundle);
+      writeCompressed(file, bundle);
+      if (previous) {
+        removeBundle(path.join(QUIZ_BUNDLE_DIR, path.basename(previous)));
+      }
+      written++;
+    }
+    manifest[String(id)] = url;
+    manifest[slug] = url;
+  }
+
+  const sorted = Object.fromEntries(Object.entries(manifest).sort(([a], [b]) => a.localeCompare(b)));
+  writeAtomic(MANIFEST_PATH, JSON.stringify(sorted, null, 2) + "\n");
+  console.log(`📦 Quiz bundles: ${written} written, manifest at ${MANIFEST_PATH}`);
+}
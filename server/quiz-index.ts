@@ -0,0 +1,25 @@
+import fs from "fs";
+import path from "path";
+
+// Slug -> quiz ID index for string quiz URLs such as /quiz/grow-week-1.
+// The add-<course>-quizzes.ts scripts generated by auto-create-course.py merge
+// the IDs they seed into server/quiz-index.json; it is read once at startup.
+export const QUIZ_INDEX_PATH = path.join(process.cwd(), "server", "quiz-index.json");
+
+function loadQuizIndex(): Map<string, number> {
+  try {
+    const entries = JSON.parse(fs.readFileSync(QUIZ_INDEX_PATH, "utf-8")) as Record<string, number>;
+    return new Map(Object.entries(entries));
+  } catch (error) {
+    console.error(`Failed to load quiz index from ${QUIZ_INDEX_PATH}:`, error);
+    return new Map();
+  }
+}
+
+export const quizIndex: ReadonlyMap<string, number> = loadQuizIndex();
+
+// Numeric IDs pass through; anything else is looked up in the index.
+export function resolveQuizId(param: string): number | undefined {
+  const quizId = parseInt(param);
+  return isNaN(quizId) ? quizIndex.get(param) : quizId;
+}
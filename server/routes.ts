@@ -23,6 +23,7 @@ import { notificationService } from "./notificationService";
 import { emailjsService } from "./emailjsService";
 import { customEmailService } from "./customEmailService";
 import { cleanupQuizOptions } from "./cleanupQuizOptions";
+import { resolveQuizId } from "./quiz-index";
 
 // Helper function to check if student can access reflection essay (no prerequisites required)
 async function checkReflectionEssayAccess(studentId: string, courseId: number): Promise<boolean> {
@@ -1115,86 +1116,10 @@ export function setupRoutes(app: Express): Server {
   // Quiz API
   app.get('/api/quizzes/:quizId', async (req, res) => {
     try {
-      let quizId = parseInt(req.params.quizId);
-      
-      // Handle string-based quiz IDs
-      if (isNaN(quizId)) {
-        const quizIdMap: { [key: string]: number } = {
-          'acts-week-1': 13,
-          'acts-week-2': 14,
-          'acts-week-3': 15,
-          'acts-week-4': 16,
-          'acts-week-5': 17,
-          'acts-week-6': 18,
-          'acts-week-7': 19,
-          'acts-week-8': 20,
-          'acts-week-9': 21,
-          'acts-week-10': 22,
-          'acts-final-exam': 23,
-          'dbaj-week-1': 26,
-          'dbaj-week-2': 46,
-          'dbaj-week-3': 37,
-          'dbaj-week-4': 38,
-          'dbaj-week-5': 39,
-          'dbaj-week-6': 40,
-          'dbaj-week-7': 41,
-          'dbaj-week-8': 42,
-          'dbaj-week-9': 43,
-          'dbaj-week-10': 44,
-          'dbaj-week-11': 45,
-          'dbaj-final-exam': 47,
-          'firestarter-week-1': 48,
-          'firestarter-week-2': 49,
-          'firestarter-week-3': 50,
-          'firestarter-week-4': 51,
-          'firestarter-week-5': 52,
-          'firestarter-week-6': 53,
-          'firestarter-week-7': 54,
-          'firestarter-week-8': 55,
-          'firestarter-week-9': 56,
-          'firestarter-week-10': 57,
-          'firestarter-final-exam': 58,
-          'studying-for-service-week-1': 59,
-          'studying-for-service-week-2': 60,
-          'studying-for-service-week-3': 61,
-          'studying-for-service-week-4': 62,
-          'studying-for-service-week-5': 63,
-          'studying-for-service-week-6': 64,
-          'studying-for-service-week-7': 65,
-          'studying-for-service-week-8': 66,
-          'studying-for-service-week-9': 67,
-          'studying-for-service-week-10': 68,
-          'studying-for-service-week-11': 69,
-          'studying-for-service-final-exam': 70,
-          'grow-week-1': 71,
-          'grow-week-2': 72,
-          'grow-week-3': 73,
-          'grow-week-4': 74,
-          'grow-final-exam': 75,
-          'deacon-course-week-1': 76,
-          'deacon-course-week-2': 77,
-          'deacon-course-week-3': 78,
-          'deacon-course-week-4': 79,
-          'deacon-course-week-5': 80,
-          'deacon-course-final-exam': 82,
-          'level-up-leadership-week-1': 200,
-          'level-up-leadership-week-2': 201,
-          'level-up-leadership-week-3': 202,
-          'level-up-leadership-week-4': 203,
-          'level-up-leadership-week-5': 204,
-          'level-up-leadership-final-exam': 206,
-          'youth-ministry-week-1': 207,
-          'youth-ministry-week-2': 208,
-          'youth-ministry-week-3': 209,
-          'youth-ministry-week-4': 210,
-          'youth-ministry-week-5': 211,
-          'youth-ministry-final-exam': 212,
-        };
-        
-        quizId = quizIdMap[req.params.quizId];
-        if (!quizId) {
-          return res.status(404).json({ message: 'Quiz not found' });
-        }
+      // Numeric IDs or string IDs like 'grow-week-1' (server/quiz-index.json)
+      const quizId = resolveQuizId(req.params.quizId);
+      if (!quizId) {
+        return res.status(404).json({ message: 'Quiz not found' });
       }
       
       const quiz = await storage.getQuiz(quizId);
@@ -1211,86 +1136,10 @@ export function setupRoutes(app: Express): Server {
   // Quiz attempt submission
   app.post('/api/quizzes/:quizId/attempt', async (req, res) => {
     try {
-      let quizId = parseInt(req.params.quizId);
-      
-      // Handle string-based quiz IDs
-      if (isNaN(quizId)) {
-        const quizIdMap: { [key: string]: number } = {
-          'acts-week-1': 13,
-          'acts-week-2': 14,
-          'acts-week-3': 15,
-          'acts-week-4': 16,
-          'acts-week-5': 17,
-          'acts-week-6': 18,
-          'acts-week-7': 19,
-          'acts-week-8': 20,
-          'acts-week-9': 21,
-          'acts-week-10': 22,
-          'acts-final-exam': 23,
-          'dbaj-week-1': 26,
-          'dbaj-week-2': 46,
-          'dbaj-week-3': 37,
-          'dbaj-week-4': 38,
-          'dbaj-week-5': 39,
-          'dbaj-week-6': 40,
-          'dbaj-week-7': 41,
-          'dbaj-week-8': 42,
-          'dbaj-week-9': 43,
-          'dbaj-week-10': 44,
-          'dbaj-week-11': 45,
-          'dbaj-final-exam': 47,
-          'firestarter-week-1': 48,
-          'firestarter-week-2': 49,
-          'firestarter-week-3': 50,
-          'firestarter-week-4': 51,
-          'firestarter-week-5': 52,
-          'firestarter-week-6': 53,
-          'firestarter-week-7': 54,
-          'firestarter-week-8': 55,
-          'firestarter-week-9': 56,
-          'firestarter-week-10': 57,
-          'firestarter-final-exam': 58,
-          'studying-for-service-week-1': 59,
-          'studying-for-service-week-2': 60,
-          'studying-for-service-week-3': 61,
-          'studying-for-service-week-4': 62,
-          'studying-for-service-week-5': 63,
-          'studying-for-service-week-6': 64,
-          'studying-for-service-week-7': 65,
-          'studying-for-service-week-8': 66,
-          'studying-for-service-week-9': 67,
-          'studying-for-service-week-10': 68,
-          'studying-for-service-week-11': 69,
-          'studying-for-service-final-exam': 70,
-          'grow-week-1': 71,
-          'grow-week-2': 72,
-          'grow-week-3': 73,
-          'grow-week-4': 74,
-          'grow-final-exam': 75,
-          'deacon-course-week-1': 76,
-          'deacon-course-week-2': 77,
-          'deacon-course-week-3': 78,
-          'deacon-course-week-4': 79,
-          'deacon-course-week-5': 80,
-          'deacon-course-final-exam': 82,
-          'level-up-leadership-week-1': 200,
-          'level-up-leadership-week-2': 201,
-          'level-up-leadership-week-3': 202,
-          'level-up-leadership-week-4': 203,
-          'level-up-leadership-week-5': 204,
-          'level-up-leadership-final-exam': 206,
-          'youth-ministry-week-1': 207,
-          'youth-ministry-week-2': 208,
-          'youth-ministry-week-3': 209,
-          'youth-ministry-week-4': 210,
-          'youth-ministry-week-5': 211,
-          'youth-ministry-final-exam': 212,
-        };
-        
-        quizId = quizIdMap[req.params.quizId];
-        if (!quizId) {
-          return res.status(404).json({ message: 'Quiz not found' });
-        }
+      // Numeric IDs or string IDs like 'grow-week-1' (server/quiz-index.json)
+      const quizId = resolveQuizId(req.params.quizId);
+      if (!quizId) {
+        return res.status(404).json({ message: 'Quiz not found' });
       }
       const { studentId, answers, timeSpent } = req.body;
       
@@ -0,0 +1,17 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(scope="session")
+def acc():
+    """auto-create-course.py, loaded by path since its file name isn't importable"""
+    spec = importlib.util.spec_from_file_location("auto_create_course", ROOT / "auto-create-course.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
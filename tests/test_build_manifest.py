@@ -0,0 +1,84 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+
+@pytest.fixture
+def manifest(acc, tmp_path):
+    return acc.BuildManifest("course", root=tmp_path / "builds")
+
+
+def test_unchanged_inputs_are_skipped(acc, manifest, tmp_path):
+    output = tmp_path / "page.tsx"
+    assert manifest.emit(output, {"text": "a"}, lambda: "first")
+    mtime = output.stat().st_mtime_ns
+    assert not manifest.emit(output, {"text": "a"}, lambda: "second")
+    assert output.read_text() == "first"
+    assert output.stat().st_mtime_ns == mtime
+    assert manifest.skipped == [str(output)]
+
+
+def test_changed_inputs_rebuild(manifest, tmp_path):
+    output = tmp_path / "page.tsx"
+    manifest.emit(output, {"text": "a"}, lambda: "first")
+    assert manifest.emit(output, {"text": "b"}, lambda: "second")
+    assert output.read_text() == "second"
+
+
+def test_same_content_keeps_the_file(manifest, tmp_path):
+    output = tmp_path / "page.tsx"
+    manifest.emit(output, {"text": "a"}, lambda: "same")
+    mtime = output.stat().st_mtime_ns
+    assert manifest.emit(output, {"text": "b"}, lambda: "same")
+    assert output.stat().st_mtime_ns == mtime
+    assert not (tmp_path / "page.tsx.tmp").exists()
+
+
+def test_edited_or_deleted_outputs_rebuild(manifest, tmp_path):
+    output = tmp_path / "page.tsx"
+    manifest.emit(output, {"text": "a"}, lambda: "generated")
+    output.write_text("edited by hand")
+    assert manifest.emit(output, {"text": "a"}, lambda: "generated")
+    assert output.read_text() == "generated"
+    output.unlink()
+    assert manifest.emit(output, {"text": "a"}, lambda: "generated")
+    assert output.exists()
+
+
+def test_generator_version_invalidates(acc, manifest, tmp_path, monkeypatch):
+    output = tmp_path / "page.tsx"
+    manifest.emit(output, {"text": "a"}, lambda: "v1")
+    monkeypatch.setattr(acc, "GENERATOR_VERSION", acc.GENERATOR_VERSION + "-next")
+    assert manifest.emit(output, {"text": "a"}, lambda: "v2")
+
+
+def test_saved_manifest_is_loaded_by_the_next_build(acc, manifest, tmp_path):
+    output = tmp_path / "page.tsx"
+    manifest.emit(output, {"text": "a"}, lambda: "first")
+    manifest.save()
+    again = acc.BuildManifest("course", root=tmp_path / "builds")
+    assert not again.emit(output, {"text": "a"}, lambda: "second")
+
+
+def test_input_hashes_follow_file_changes(manifest, tmp_path):
+    source = tmp_path / "chapter.txt"
+    source.write_text("one")
+    first = manifest.hash_file(source)
+    assert manifest.hash_file(source) == first
+    source.write_text("two!")
+    assert manifest.hash_file(source) != first
+    assert manifest.hash_file(tmp_path / "missing.txt") is None
+
+
+def test_bundle_weights_match_after_reload(acc, manifest, tmp_path):
+    page = tmp_path / "page.tsx"
+    page.write_text("<div>" + "text " * 400 + "</div>")
+    with ThreadPoolExecutor() as pool:
+        measured, records = acc.bundle_weights([("chapter page", page)], manifest, pool=pool)
+    assert len(records) == 1
+    manifest.save()
+    again = acc.BuildManifest("course", root=tmp_path / "builds")
+    cached, records = acc.bundle_weights([("chapter page", page)], again)
+    assert records == []
+    assert json.dumps(cached) == json.dumps(measured)  # the report is only rewritten when a file changed
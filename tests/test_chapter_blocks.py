@@ -0,0 +1,51 @@
+def test_block_kinds(acc):
+    lines = ["CHAPTER ONE\n", "Key points:\n", '"For God so loved the world."\n', "3:16 is quoted often.\n",
+             "An ordinary sentence.\n"]
+    assert list(acc.chapter_blocks(lines)) == [
+        ("heading", "CHAPTER ONE"),
+        ("heading", "Key points:"),
+        ("scripture", '"For God so loved the world."'),
+        ("scripture", "3:16 is quoted often."),
+        ("paragraph", "An ordinary sentence."),
+    ]
+
+
+def test_wrapped_lines_are_merged(acc):
+    # a trailing space marks a wrapped line, even across the blank lines of a page break
+    lines = ["The church is called to \n", "\n", "\n", "serve the world.\n", "Next paragraph.\n"]
+    assert list(acc.chapter_blocks(lines)) == [
+        ("paragraph", "The church is called to serve the world."),
+        ("paragraph", "Next paragraph."),
+    ]
+
+
+def test_unfinished_sentences_continue(acc):
+    full_width = "x" * acc.WRAPPED_LINE_MIN_LENGTH + " and it stops"
+    lines = ["A short line\n", "continues in lowercase.\n", full_width + "\n", "Mid sentence.\n", "New one.\n"]
+    assert list(acc.chapter_blocks(lines)) == [
+        ("paragraph", "A short line continues in lowercase."),
+        ("paragraph", full_width + " Mid sentence."),
+        ("paragraph", "New one."),
+    ]
+
+
+def test_headings_never_continue(acc):
+    assert list(acc.chapter_blocks(["INTRODUCTION \n", "Body text.\n"])) == [
+        ("heading", "INTRODUCTION"),
+        ("paragraph", "Body text."),
+    ]
+
+
+def test_blocks_are_escaped_for_jsx_and_html(acc):
+    lines = ["Tom & <Jerry> {x}\n"]
+    assert list(acc.format_chapter_blocks(lines)) == ['<p className="mb-4">Tom &amp; &lt;Jerry&gt; &#123;x&#125;</p>']
+    assert list(acc.format_chapter_blocks(lines, html_output=True)) == ['<p class="mb-4">Tom &amp; &lt;Jerry&gt; {x}</p>']
+
+
+def test_lines_are_read_lazily(acc):
+    def lines():
+        yield "First paragraph.\n"
+        yield "Second paragraph.\n"
+        raise AssertionError("read past the block that was asked for")
+    blocks = acc.chapter_blocks(lines())
+    assert next(blocks) == ("paragraph", "First paragraph.")
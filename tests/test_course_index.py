@@ -0,0 +1,80 @@
+import pytest
+
+
+def make_files(root, *names):
+    for name in names:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"")
+
+
+@pytest.fixture
+def scan(acc):
+    def scan(root):
+        index = acc.CourseIndex(root)
+        index.scan()
+        return index
+    return scan
+
+
+def test_chapter_folders(scan, tmp_path):
+    make_files(tmp_path, "Text-Book/1/Chapter 1.pdf", "Text-Book/1/Chapter 1.mp3", "Text-Book/2/Chapter 2.pdf",
+               "Text-Book/Course Textbook.pdf")
+    index = scan(tmp_path)
+    assert index.chapter_layout() == "chapter folders"
+    assert index.single_textbook() is None
+    assert sorted(index.chapters()) == [1, 2]
+    assert sorted(index.chapters()[1]) == ["audio", "pdf"]
+    assert index.chapter_count() == 2
+
+
+def test_flat_chapter_files_win_over_the_textbook(scan, tmp_path):
+    # GROW: the whole textbook sits next to one PDF (and extracted text) per chapter
+    make_files(tmp_path, "Text Book/GROW Text-Book.pdf", "Text Book/Grow Chapter 1.pdf",
+               "Text Book/Grow Chapter 1_extracted.txt", "Text Book/Grow Chapter 2.pdf", "Text Book/1/ch1.mp3")
+    index = scan(tmp_path)
+    assert index.chapter_layout() == "chapter files"
+    assert index.single_textbook() is None
+    assert index.textbook_pdf().name == "GROW Text-Book.pdf"
+    assert sorted(index.chapters()[1]) == ["audio", "pdf", "text"]
+    assert sorted(index.chapters()[2]) == ["pdf"]
+
+
+def test_single_textbook_is_split(scan, tmp_path):
+    make_files(tmp_path, "Textbook/Acts Textbook.pdf")
+    index = scan(tmp_path)
+    assert index.chapter_layout() == "split textbook"
+    assert index.single_textbook().name == "Acts Textbook.pdf"
+    # what an earlier split wrote doesn't stop the textbook from being split again
+    make_files(tmp_path, "Textbook/1/Chapter 1_extracted.txt")
+    index = scan(tmp_path)
+    assert index.chapter_layout() == "split textbook"
+    assert index.chapters()[1] == {"text": str(tmp_path / "Textbook/1/Chapter 1_extracted.txt")}
+
+
+def test_quizzes_and_final_exam(scan, tmp_path):
+    make_files(tmp_path, "Quiz /1/Week 1 Quiz.pdf", "Quiz /Week 2 Quiz.pdf", "Quiz /Final Exam/Final Exam.pdf",
+               "Img/cover.png", "Text-Book/1/Chapter 1.pdf")
+    index = scan(tmp_path)
+    assert index.quiz_count() == 2
+    assert sorted(index.quizzes) == [1, 2]
+    assert "pdf" in index.final_exam
+    assert [path.rsplit("/", 1)[-1] for path in index.images] == ["cover.png"]
+
+
+def test_empty_folder(scan, tmp_path):
+    index = scan(tmp_path)
+    assert index.chapter_layout() is None
+    assert index.chapters() == {}
+    assert index.chapter_count() == 0
+
+
+def test_cached_index_is_reused_until_a_folder_changes(acc, tmp_path):
+    root = tmp_path / "course"
+    make_files(root, "Text-Book/1/Chapter 1.pdf")
+    cache_dir = tmp_path / "cache"
+    first = acc.CourseIndex.load(root, cache_dir=cache_dir)
+    assert sorted(first.chapters()) == [1]
+    assert sorted(acc.CourseIndex.load(root, cache_dir=cache_dir).chapters()) == [1]
+    make_files(root, "Text-Book/2/Chapter 2.pdf")
+    assert sorted(acc.CourseIndex.load(root, cache_dir=cache_dir).chapters()) == [1, 2]
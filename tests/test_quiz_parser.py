@@ -0,0 +1,74 @@
+def test_question_numbering_and_wrapped_text(acc):
+    parsed = acc.parse_quiz_text(
+        "Week 1 Quiz\n"
+        "Question 1: What is the first book\n"
+        "of the Bible?\n"
+        "A) Genesis\n"
+        "B) Exodus\n"
+        "C) Psalms\n"
+        "Correct Answer: A) Genesis\n"
+        "Question 2: Who built the ark?\n"
+        "A) Moses\n"
+        "B) Noah\n"
+        "Correct Answer: B\n"
+    )
+    assert parsed["title"] == "Week 1 Quiz"
+    assert parsed["errors"] == []
+    assert parsed["questions"] == [
+        {"number": 1, "question": "What is the first book of the Bible?",
+         "options": ["Genesis", "Exodus", "Psalms"], "answer": "A"},
+        {"number": 2, "question": "Who built the ark?", "options": ["Moses", "Noah"], "answer": "B"},
+    ]
+
+
+def test_options_on_one_line(acc):
+    parsed = acc.parse_quiz_text("1) Who is called to serve?\nA. Church leaders only B. Kings C. Everyone\nAnswer: C\n")
+    assert parsed["errors"] == []
+    assert parsed["questions"][0]["options"] == ["Church leaders only", "Kings", "Everyone"]
+    assert parsed["questions"][0]["answer"] == "C"
+
+
+def test_unnumbered_questions(acc):
+    parsed = acc.parse_quiz_text(
+        "Who was swallowed by a fish?\nA) Jonah\nB) Peter\nAnswer: A\n"
+        "Where was he sent?\nA) Nineveh\nB) Rome\nAnswer: A\n"
+    )
+    assert parsed["errors"] == []
+    assert [q["question"] for q in parsed["questions"]] == ["Who was swallowed by a fish?", "Where was he sent?"]
+    assert [q["number"] for q in parsed["questions"]] == [1, 2]
+
+
+def test_run_together_text_is_split_again(acc):
+    questions = "".join(
+        f"{n}. According to the text, what does verse {n} teach about serving?"
+        f"A. Option one for {n}B. Option two for {n}C. Option three for {n}D. Option four for {n}Answer: B"
+        for n in range(1, 5)
+    )
+    parsed = acc.parse_quiz_text("GROW Week one quiz " + questions)
+    assert parsed["errors"] == []
+    assert len(parsed["questions"]) == 4
+    assert parsed["questions"][3]["options"] == [f"Option {word} for 4" for word in ("one", "two", "three", "four")]
+
+
+def test_question_without_answer_is_reported(acc):
+    # GROW Week 1: the PDF ends after question 10's options without an answer line
+    text = ("1) Which is the answer?\nA) This\nB) That\nAnswer: A\n"
+            "2) What was Paul always doing?\nA) Building\nB) Helping churches in need\n")
+    parsed = acc.parse_quiz_text(text)
+    assert [q["number"] for q in parsed["questions"]] == [1]
+    assert parsed["errors"] == ["Question 2: has no answer"]
+
+
+def test_question_with_one_option_is_reported(acc):
+    # Studying for Service Week 11: question 1 only lists option A
+    text = ("1) What statement changed his life?\nA) If you're not in the Word\nAnswer: A\n"
+            "2) Which Bible did he buy?\nA) King James\nB) New Living Translation\nAnswer: B\n")
+    parsed = acc.parse_quiz_text(text)
+    assert [q["number"] for q in parsed["questions"]] == [2]
+    assert parsed["errors"] == ["Question 1: has 1 option(s), need at least 2"]
+
+
+def test_answer_text_must_match_the_letter(acc):
+    parsed = acc.parse_quiz_text("1) Is it so?\nA) Yes\nB) No\nCorrect Answer: B) Yes\n")
+    assert parsed["questions"] == []
+    assert parsed["errors"] == ["Question 1: answer text does not match option B"]
@@ -0,0 +1,53 @@
+import pytest
+
+FRAME_HEADER = b"\xff\xfb\x90\x00"  # MPEG-1 layer III, 128 kbit/s, 44.1 kHz, stereo
+FRAME_BYTES = 417
+FRAME_SECONDS = 1152 / 44100
+ID3V2 = b"ID3\x03\x00\x00\x00\x00\x00\x0a" + b"\x00" * 10
+
+
+def frame(payload=b""):
+    return FRAME_HEADER + payload + b"\x00" * (FRAME_BYTES - 4 - len(payload))
+
+
+def xing_frame(frames, toc):
+    # the tag follows the 32 bytes of side information of a stereo MPEG-1 frame
+    fields = b"Xing" + (7).to_bytes(4, 'big') + frames.to_bytes(4, 'big')
+    fields += ((frames + 1) * FRAME_BYTES).to_bytes(4, 'big') + bytes(toc)
+    return frame(b"\x00" * 32 + fields)
+
+
+def test_frames_are_walked_across_read_chunks(acc, tmp_path, monkeypatch):
+    monkeypatch.setattr(acc, "MP3_READ_BYTES", 1000)
+    path = tmp_path / "chapter.mp3"
+    audio = frame() * 600 + b"junk" * 10 + frame() * 400
+    path.write_bytes(ID3V2 + audio + b"TAG" + b"\x00" * 125)
+    meta = acc.scan_mp3(path)
+    assert meta["duration"] == round(1000 * FRAME_SECONDS, 3)
+    assert meta["bytes"] == len(ID3V2) + len(audio)
+    assert meta["seekTable"][0] == len(ID3V2)
+    for k, (offset, time) in enumerate(zip(meta["seekTable"], meta["seekTimes"])):
+        assert k * meta["seekInterval"] - FRAME_SECONDS < time <= k * meta["seekInterval"]
+        assert acc.mp3_frame_header(path.read_bytes(), offset) is not None
+
+
+def test_xing_toc_is_used(acc, tmp_path):
+    path = tmp_path / "chapter.mp3"
+    frames = 2000
+    toc = [i * 256 // 100 for i in range(100)]
+    path.write_bytes(ID3V2 + xing_frame(frames, toc) + frame() * frames)
+    meta = acc.scan_mp3(path)
+    audio_start = len(ID3V2) + FRAME_BYTES
+    assert meta["duration"] == round(frames * FRAME_SECONDS, 3)
+    assert meta["seekTable"][0] == audio_start
+    assert meta["seekTimes"] == [k * meta["seekInterval"] for k in range(len(meta["seekTimes"]))]
+    assert len(meta["seekTable"]) == int(frames * FRAME_SECONDS // meta["seekInterval"]) + 1
+    for offset, time in zip(meta["seekTable"], meta["seekTimes"]):
+        assert (offset - audio_start) % FRAME_BYTES == 0  # snapped to a frame
+        assert (offset - audio_start) / FRAME_BYTES * FRAME_SECONDS == pytest.approx(time, abs=0.5)
+
+
+def test_not_an_mp3(acc, tmp_path):
+    path = tmp_path / "notes.mp3"
+    path.write_bytes(b"no audio in here" * 100)
+    assert acc.scan_mp3(path) is None